@@ -1,6 +1,29 @@
 from django.apps import AppConfig as DjangoAppConfig
+from django.apps import apps as django_apps
 
 
 class AppConfig(DjangoAppConfig):
     name = "intecomm_form_validators"
     verbose_name = "Intecomm Form Validators"
+
+    def ready(self):
+        from .patient_group_cache import connect_patient_log_signals
+        from .screening import PatientGroupFormValidator
+        from .subject.health_economics_form_validator import (
+            HealthEconomicsFormValidator,
+            connect_drug_pay_sources_signals,
+        )
+
+        for model, connect_signals in [
+            (PatientGroupFormValidator.patient_log_model, connect_patient_log_signals),
+            (
+                HealthEconomicsFormValidator.drug_pay_sources_model,
+                connect_drug_pay_sources_signals,
+            ),
+        ]:
+            try:
+                model_cls = django_apps.get_model(model)
+            except LookupError:
+                pass
+            else:
+                connect_signals(model_cls)
@@ -4,6 +4,9 @@ from edc_form_validators import FormValidator
 
 
 class SubjectConsentFormValidator(SubjectConsentFormValidatorMixin, FormValidator):
+    # max queries for `clean()`: the subject screening lookup
+    query_budget = 1
+
     def validate_identity(self) -> None:
         """Override to validate `identity_type` is a hospital
         number and `identity` matches the screening form.
@@ -1,3 +1,7 @@
 RECRUITING = "recruiting"
 IN_FOLLOWUP = "in_followup"
 DISSOLVED = "dissolved"
+
+HIV_ONLY = "hiv_only"
+NCD_ONLY = "ncd_only"
+HIV_NCD = "hiv_ncd"
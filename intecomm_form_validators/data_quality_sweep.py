@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils.module_loading import import_string
+
+from .validation_runner import (
+    discard_inherited_connections,
+    run_validation,
+    write_jsonl,
+)
+
+SHARDS_FILENAME = "shards.json"
+
+# model label: (form validator, lookup to subject_identifier or None)
+#
+# Not swept: PatientGroupFormValidator and PatientGroupRandoFormValidator
+# reject any change to a randomized group and check the randomize
+# action, so every randomized group would be reported. The COMPLETE
+# checks of a group are reported by `utils.get_patient_groups_readiness`.
+SWEEP_MODELS: dict[str, tuple[str, str | None]] = {
+    "intecomm_screening.patientlog": (
+        "intecomm_form_validators.screening.PatientLogFormValidator",
+        "subject_identifier",
+    ),
+    "intecomm_screening.subjectscreening": (
+        "intecomm_form_validators.screening.SubjectScreeningFormValidator",
+        "subject_identifier",
+    ),
+    "intecomm_screening.patientcall": (
+        "intecomm_form_validators.screening.PatientCallFormValidator",
+        "patient_log__subject_identifier",
+    ),
+    "intecomm_screening.healthtalklog": (
+        "intecomm_form_validators.screening.HealthTalkLogFormValidator",
+        None,
+    ),
+    "intecomm_screening.consentrefusal": (
+        "intecomm_form_validators.screening.ConsentRefusalFormValidator",
+        None,
+    ),
+    "intecomm_facility.healthfacility": (
+        "intecomm_form_validators.screening.HealthFacilityFormValidator",
+        None,
+    ),
+    "intecomm_consent.subjectconsent": (
+        "intecomm_form_validators.consent.SubjectConsentFormValidator",
+        "subject_identifier",
+    ),
+    "intecomm_prn.endofstudy": (
+        "intecomm_form_validators.prn.EndOfStudyFormValidator",
+        "subject_identifier",
+    ),
+    **{
+        f"intecomm_subject.{model}": (
+            f"intecomm_form_validators.subject.{validator}",
+            "subject_visit__subject_identifier",
+        )
+        for model, validator in [
+            (
+                "clinicalreview",
+                "clinical_review_form_validator.ClinicalReviewFormValidator",
+            ),
+            ("clinicalreviewbaseline", "ClinicalReviewBaselineFormValidator"),
+            ("complicationsbaseline", "ComplicationsBaselineFormValidator"),
+            ("complicationsfollowup", "ComplicationsFollowupFormValidators"),
+            ("dminitialreview", "DmInitialReviewFormValidator"),
+            ("dmmedicationadherence", "DmMedicationAdherenceFormValidator"),
+            ("dmreview", "DmReviewFormValidator"),
+            ("drugrefilldm", "DrugRefillDmFormValidator"),
+            ("drugrefillhiv", "DrugRefillHivFormValidator"),
+            ("drugrefillhtn", "DrugRefillHtnFormValidator"),
+            (
+                "healtheconomics",
+                "health_economics_form_validator.HealthEconomicsFormValidator",
+            ),
+            ("hivinitialreview", "HivInitialReviewFormValidator"),
+            ("hivmedicationadherence", "HivMedicationAdherenceFormValidator"),
+            ("hivreview", "HivReviewFormValidator"),
+            ("htninitialreview", "HtnInitialReviewFormValidator"),
+            ("htnmedicationadherence", "HtnMedicationAdherenceFormValidator"),
+            ("htnreview", "HtnReviewFormValidator"),
+            ("locationupdate", "LocationUpdateFormValidator"),
+            ("medications", "MedicationsFormValidator"),
+            ("nextappointment", "NextAppointmentFormValidator"),
+            ("otherbaselinedata", "OtherBaselineDataFormValidator"),
+            ("socialharms", "SocialHarmsFormValidator"),
+            ("vitals", "VitalsFormValidator"),
+        ]
+    },
+}
+
+
+class SweepResumeError(Exception):
+    pass
+
+
+class Shard(NamedTuple):
+    """A range of subject identifiers, [lower, upper), for a model.
+
+    A shard with no lower or upper bound is open on that side.
+    A shard with `isnull` selects records without a subject
+    identifier.
+    """
+
+    label: str
+    index: int
+    lower: str | None = None
+    upper: str | None = None
+    isnull: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.label}.{self.index:04d}"
+
+
+def get_sweep_models() -> dict[str, tuple[str, str | None]]:
+    """Returns the models to sweep with their form validator and
+    subject_identifier lookup.
+    """
+    return getattr(settings, "INTECOMM_SWEEP_MODELS", SWEEP_MODELS)
+
+
+def get_installed_labels() -> list[str]:
+    """Returns the labels of the sweep models installed in this
+    project.
+    """
+    labels = []
+    for label in get_sweep_models():
+        try:
+            django_apps.get_model(label)
+        except LookupError:
+            pass
+        else:
+            labels.append(label)
+    return labels
+
+
+def get_shards(label: str, lookup: str | None, shards: int) -> list[Shard]:
+    """Returns shards for a model by splitting its ordered, distinct
+    subject identifiers into contiguous ranges.
+    """
+    if not lookup:
+        return [Shard(label, 0)]
+    identifiers = list(
+        django_apps.get_model(label)
+        .objects.filter(**{f"{lookup}__isnull": False})
+        .order_by(lookup)
+        .values_list(lookup, flat=True)
+        .distinct()
+    )
+    size = max(1, -(-len(identifiers) // shards))
+    bounds = [None, *identifiers[size::size], None]
+    return [
+        Shard(label, index, lower, upper)
+        for index, (lower, upper) in enumerate(zip(bounds, bounds[1:]))
+    ] + [Shard(label, len(bounds) - 1, isnull=True)]
+
+
+def get_or_create_shards(output_dir: str, labels: list[str], shards: int) -> list[Shard]:
+    """Returns the shards for each model.
+
+    Shards are saved to `<output_dir>/shards.json` when first created.
+    On a resume the saved shards are used, so the `.done` files match
+    their ranges even if subject identifiers were added since. Raises
+    SweepResumeError if the number of shards differs from the saved
+    sweep.
+    """
+    path = Path(output_dir) / SHARDS_FILENAME
+    saved = json.loads(path.read_text()) if path.exists() else {}
+    sweep_models = get_sweep_models()
+    pending = []
+    for label in labels:
+        if label in saved:
+            if saved[label]["shards"] != shards:
+                raise SweepResumeError(
+                    f"Invalid number of shards for {label}. Resume with the number of "
+                    f"shards in {path}. Expected {saved[label]['shards']}. Got {shards}."
+                )
+        else:
+            saved[label] = dict(
+                shards=shards,
+                ranges=[
+                    list(shard) for shard in get_shards(label, sweep_models[label][1], shards)
+                ],
+            )
+            path.write_text(json.dumps(saved, indent=2))
+        pending.extend(Shard(*shard) for shard in saved[label]["ranges"])
+    return pending
+
+
+def get_shard_queryset(shard: Shard, lookup: str | None) -> QuerySet:
+    """Returns the shard's records with the foreign keys selected and
+    the m2m fields prefetched, since `get_cleaned_data` reads each of
+    them.
+    """
+    model_cls = django_apps.get_model(shard.label)
+    opts = model_cls._meta
+    queryset = model_cls.objects.select_related(
+        *[f.name for f in opts.concrete_fields if f.is_relation]
+    ).prefetch_related(*[f.name for f in opts.many_to_many])
+    if lookup and lookup.startswith("subject_visit__"):
+        queryset = queryset.select_related("subject_visit__appointment")
+    if lookup:
+        if shard.isnull:
+            queryset = queryset.filter(**{f"{lookup}__isnull": True})
+        else:
+            q = Q()
+            if shard.lower is not None:
+                q &= Q(**{f"{lookup}__gte": shard.lower})
+            if shard.upper is not None:
+                q &= Q(**{f"{lookup}__lt": shard.upper})
+            queryset = queryset.filter(q)
+    return queryset.order_by("pk")
+
+
+def sweep_shard(shard: Shard, output_dir: str, chunk_size: int | None = None) -> Shard:
+    """Validates the records in a shard and writes the results to
+    `<output_dir>/<label>.<index>.jsonl`.
+
+    A `.done` file is written once the shard is complete.
+    """
+    form_validator_path, lookup = get_sweep_models()[shard.label]
+    path = Path(output_dir) / f"{shard.name}.jsonl"
+    with path.open("w") as f:
+        write_jsonl(
+            run_validation(
+                import_string(form_validator_path),
+                get_shard_queryset(shard, lookup),
+                chunk_size=chunk_size,
+            ),
+            f,
+        )
+    path.with_suffix(".done").touch()
+    return shard
+
+
+def is_done(shard: Shard, output_dir: str) -> bool:
+    return (Path(output_dir) / f"{shard.name}.done").exists()
+
+
+def sweep(
+    output_dir: str,
+    labels: list[str] | None = None,
+    shards: int | None = None,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[Shard]:
+    """Sweeps the models across a process pool, yielding each shard
+    as it completes.
+
+    Shards already done in `output_dir` are skipped, so an
+    interrupted sweep resumes with the shards not done. A shard is
+    checkpointed only when it completes, so a shard interrupted part
+    way is validated again from its start; use more shards to repeat
+    less. Resume with the same number of shards; see
+    `get_or_create_shards`.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    pending = [
+        shard
+        for shard in get_or_create_shards(
+            output_dir, labels or get_installed_labels(), shards or 1
+        )
+        if not is_done(shard, output_dir)
+    ]
+    if not workers or workers <= 1:
+        for shard in pending:
+            yield sweep_shard(shard, output_dir, chunk_size)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=discard_inherited_connections
+        ) as executor:
+            futures = [
+                executor.submit(sweep_shard, shard, output_dir, chunk_size)
+                for shard in pending
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def get_sweep_summary(output_dir: str) -> dict[str, dict[str, int]]:
+    """Returns the count of validation failures by site, model and
+    error code from the results in `output_dir`.
+    """
+    counter = Counter()
+    for path in sorted(Path(output_dir).glob("*.jsonl")):
+        label = path.name.rsplit(".", 2)[0]
+        with path.open() as f:
+            for line in f:
+                result = json.loads(line)
+                counter[(str(result["site_id"]), label, str(result["code"]))] += 1
+    summary = {}
+    for (site_id, label, code), count in sorted(counter.items()):
+        summary.setdefault(site_id, {})[f"{label}.{code}"] = count
+    return summary
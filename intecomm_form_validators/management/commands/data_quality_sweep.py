@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from intecomm_form_validators.data_quality_sweep import (
+    SweepResumeError,
+    get_installed_labels,
+    get_sweep_summary,
+    sweep,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the form validators against existing data and report validation "
+        "failures by site. Resumes with the shards not completed in OUTPUT_DIR; "
+        "an interrupted shard is validated again from its start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output_dir", help="Folder for results and checkpoints")
+        parser.add_argument(
+            "--models",
+            nargs="*",
+            default=None,
+            help="Model labels to sweep. Default: all installed",
+        )
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=8,
+            help="Subject identifier ranges per model",
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        installed_labels = get_installed_labels()
+        labels = options["models"] or installed_labels
+        if unknown := [label for label in labels if label not in installed_labels]:
+            raise CommandError(f"Unknown or uninstalled model. Got {', '.join(unknown)}.")
+        output_dir = options["output_dir"]
+        try:
+            for shard in sweep(
+                output_dir,
+                labels=labels,
+                shards=options["shards"],
+                workers=options["workers"],
+                chunk_size=options["chunk_size"],
+            ):
+                self.stdout.write(f"Done {shard.name}")
+        except SweepResumeError as e:
+            raise CommandError(str(e))
+        summary = get_sweep_summary(output_dir)
+        Path(output_dir, "summary.json").write_text(json.dumps(summary, indent=2))
+        for site_id, counts in summary.items():
+            self.stdout.write(f"Site {site_id}")
+            for key, count in counts.items():
+                self.stdout.write(f"  {key}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Results in {output_dir}"))
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from hashlib import md5
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .utils import (
+    PatientGroupSnapshot,
+    get_group_ratio_range,
+    get_group_size_for_ratio,
+    get_min_group_size,
+    get_screening_identifier_regex,
+    get_subject_identifier_regex,
+)
+
+__all__ = [
+    "PatientGroupCache",
+    "clear_patient_group_cache",
+    "connect_patient_log_signals",
+    "get_patient_group_cache",
+    "get_patient_group_cache_key",
+]
+
+GENERATION_KEY = "intecomm_form_validators.patient_group.generation"
+
+
+class PatientGroupCache:
+    """A bounded, thread-safe LRU cache for patient group check
+    results.
+
+    If `cache_alias` is set, results are also stored in that Django
+    cache so they are shared across processes. `invalidate()` then
+    bumps a generation counter in that cache, so that every process
+    stops using its results.
+    """
+
+    def __init__(self, maxsize: int | None = None, cache_alias: str | None = None):
+        self.maxsize = 128 if maxsize is None else maxsize
+        self.cache_alias = cache_alias
+        self._data: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    @property
+    def backend(self):
+        return caches[self.cache_alias] if self.cache_alias else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                pass
+            else:
+                self._data.move_to_end(key)
+                return value
+        if self.backend is None:
+            return default
+        value = self.backend.get(key, default)
+        if value is not default:
+            self._set_local(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._set_local(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def get_or_set(self, key: str | None, func: Callable[[], Any]) -> Any:
+        """Returns the cached value for key or calls func and caches
+        the result. A key of None is never cached.
+        """
+        if key is None:
+            return func()
+        if self.backend is not None:
+            key = f"{key}.{self.backend.get_or_set(GENERATION_KEY, 0, timeout=None)}"
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = func()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def invalidate(self) -> None:
+        """Drops the results in this process and, if `cache_alias`
+        is set, in every process.
+        """
+        self.clear()
+        if self.backend is not None:
+            try:
+                self.backend.incr(GENERATION_KEY)
+            except ValueError:
+                self.backend.add(GENERATION_KEY, 1, timeout=None)
+
+    def _set_local(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_patient_group_cache: PatientGroupCache | None = None
+
+
+def get_patient_group_cache() -> PatientGroupCache:
+    """Returns the process-wide patient group cache.
+
+    Size and optional Django cache alias are set with
+    INTECOMM_PATIENT_GROUP_CACHE_MAXSIZE and
+    INTECOMM_PATIENT_GROUP_CACHE_ALIAS.
+    """
+    global _patient_group_cache
+    if _patient_group_cache is None:
+        _patient_group_cache = PatientGroupCache(
+            maxsize=getattr(settings, "INTECOMM_PATIENT_GROUP_CACHE_MAXSIZE", 128),
+            cache_alias=getattr(settings, "INTECOMM_PATIENT_GROUP_CACHE_ALIAS", None),
+        )
+    return _patient_group_cache
+
+
+def clear_patient_group_cache(sender, action: str | None = None, **kwargs) -> None:
+    if action is None or action.startswith("post_"):
+        get_patient_group_cache().invalidate()
+
+
+def connect_patient_log_signals(model_cls) -> None:
+    """Invalidates the patient group cache when a patient log is
+    saved or deleted or its conditions change.
+
+    Changes made with `QuerySet.update()` send no signal; call
+    `get_patient_group_cache().invalidate()` after them.
+
+    Called from AppConfig.ready().
+    """
+    label = model_cls._meta.label_lower
+    uid = f"intecomm_form_validators.patient_group_cache.{label}"
+    post_save.connect(clear_patient_group_cache, sender=model_cls, dispatch_uid=f"{uid}.save")
+    post_delete.connect(
+        clear_patient_group_cache, sender=model_cls, dispatch_uid=f"{uid}.delete"
+    )
+    m2m_changed.connect(
+        clear_patient_group_cache,
+        sender=model_cls.conditions.through,
+        dispatch_uid=f"{uid}.conditions",
+    )
+
+
+def get_patient_group_cache_key(
+    group_id: Any, patients: QuerySet | PatientGroupSnapshot, *args: Any
+) -> str | None:
+    """Returns a cache key from the group id, the sorted patient ids,
+    the most recent patient modified timestamp and the group settings,
+    or None if the group or any patient is unsaved.
+
+    The group settings are the group size and ratio settings and the
+    identifier patterns. Any `args` (e.g. bypass flags) are added to
+    the key.
+
+    Costs one query for a queryset, none for a snapshot.
+    """
+    if group_id is None:
+        return None
+    if isinstance(patients, PatientGroupSnapshot):
+        rows = [(p.patient_log.pk, p.patient_log.modified) for p in patients]
+    else:
+        rows = list(patients.values_list("pk", "modified"))
+    if not rows or any(pk is None or modified is None for pk, modified in rows):
+        return None
+    patient_ids = ",".join(sorted(str(pk) for pk, _ in rows))
+    last_modified = max(modified for _, modified in rows).isoformat()
+    group_settings = (
+        get_min_group_size(),
+        get_group_size_for_ratio(),
+        get_group_ratio_range(),
+        get_screening_identifier_regex().pattern,
+        get_subject_identifier_regex().pattern,
+    )
+    digest = md5(
+        f"{group_id}|{patient_ids}|{last_modified}|{group_settings}|{args}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f"intecomm_form_validators.patient_group.{digest}"
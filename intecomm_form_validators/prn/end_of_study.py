@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from django import forms
 from django.apps import apps as django_apps
 from django.core.exceptions import ObjectDoesNotExist
@@ -25,9 +27,22 @@ class EndOfStudyFormValidator(
     PrnFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: 6 for the on and off schedule lookups, each in a
+    # savepoint, 1 for the death report and 1 for the 12 month visit or the transfer,
+    # depending on the offstudy reason
+    query_budget = 8
+
     death_report_model = "intecomm_ae.deathreport"
     ltfu_model = None
 
+    @cached_property
+    def death_report(self):
+        return super().death_report
+
+    @property
+    def death_report_or_raises(self):
+        return self.death_report or super().death_report_or_raises
+
     def clean(self):
         self.confirm_off_all_schedules()
         self.validate_offstudy_datetime_against_last_seen_date()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple
+
+from edc_constants.constants import NOT_APPLICABLE
+
+__all__ = [
+    "APPLICABLE_IF",
+    "INERT_IF",
+    "M2M_OTHER_SPECIFY",
+    "M2M_REQUIRED_IF",
+    "M2M_SINGLE_SELECTION_IF",
+    "REQUIRED_IF",
+    "RULE_KEYWORDS",
+    "CompiledRule",
+    "Rule",
+    "RuleNode",
+    "RulesFormValidatorMixin",
+    "compile_rules",
+    "is_applicable_if_inert",
+    "is_m2m_other_specify_inert",
+]
+
+APPLICABLE_IF = "applicable_if"
+REQUIRED_IF = "required_if"
+M2M_REQUIRED_IF = "m2m_required_if"
+M2M_SINGLE_SELECTION_IF = "m2m_single_selection_if"
+M2M_OTHER_SPECIFY = "m2m_other_specify"
+
+# rule kind: (keyword for the trigger field, keyword for the dependent field)
+RULE_KEYWORDS: dict[str, tuple[str, str | None]] = {
+    APPLICABLE_IF: ("field", "field_applicable"),
+    REQUIRED_IF: ("field", "field_required"),
+    M2M_REQUIRED_IF: ("field", "m2m_field"),
+    M2M_SINGLE_SELECTION_IF: ("m2m_field", None),
+    M2M_OTHER_SPECIFY: ("m2m_field", "field_other"),
+}
+
+
+class Rule(NamedTuple):
+    """A declarative form validator rule.
+
+    For example, `Rule(APPLICABLE_IF, (YES,), "partner", "partner_disclosure")`
+    is `applicable_if(YES, field="partner", field_applicable="partner_disclosure")`.
+
+    `options` are passed as keyword arguments to the rule method.
+    """
+
+    kind: str
+    responses: tuple
+    field: str
+    dependent: str | None = None
+    options: tuple[tuple[str, Any], ...] = ()
+
+
+class CompiledRule(NamedTuple):
+    rule: Rule
+    func: Callable
+    responses: tuple
+    kwargs: dict
+
+
+class RuleNode(NamedTuple):
+    """Consecutive rules on the same trigger field.
+
+    The rules are skipped together if each is inert for the cleaned
+    data; see `INERT_IF`. `inert` is None if any rule must always
+    run.
+    """
+
+    field: str
+    rules: tuple[CompiledRule, ...]
+    inert: tuple[tuple[Callable[[dict, Rule], bool], Rule], ...] | None
+
+
+def get_value(cleaned_data: dict, field: str) -> Any:
+    """Returns the field value as FormValidator.get() does."""
+    value = cleaned_data.get(field)
+    try:
+        return value.name
+    except AttributeError:
+        return value
+
+
+def is_applicable_if_inert(cleaned_data: dict, rule: Rule) -> bool:
+    if rule.field not in cleaned_data or rule.dependent not in cleaned_data:
+        return True
+    return (
+        get_value(cleaned_data, rule.field) not in rule.responses
+        and get_value(cleaned_data, rule.dependent) == NOT_APPLICABLE
+    )
+
+
+def is_required_if_inert(cleaned_data: dict, rule: Rule) -> bool:
+    if rule.field not in cleaned_data:
+        return True
+    if get_value(cleaned_data, rule.field) in rule.responses:
+        return False
+    value = get_value(cleaned_data, rule.dependent)
+    if dict(rule.options).get("field_required_evaluate_as_int"):
+        return value is None or value == NOT_APPLICABLE
+    return not value or value == NOT_APPLICABLE
+
+
+def is_m2m_required_if_inert(cleaned_data: dict, rule: Rule) -> bool:
+    return cleaned_data.get(rule.field) != rule.responses[0] and not cleaned_data.get(
+        rule.dependent
+    )
+
+
+def is_m2m_single_selection_if_inert(cleaned_data: dict, rule: Rule) -> bool:
+    return not cleaned_data.get(rule.field)
+
+
+def is_m2m_other_specify_inert(cleaned_data: dict, rule: Rule) -> bool:
+    if cleaned_data.get(rule.field):
+        return False
+    if dict(rule.options).get("field_other_evaluate_as_int"):
+        return cleaned_data.get(rule.dependent) is None
+    return not cleaned_data.get(rule.dependent)
+
+
+# rule kind: (test that the rule cannot raise, options the test allows)
+INERT_IF: dict[str, tuple[Callable[[dict, Rule], bool], frozenset[str]]] = {
+    APPLICABLE_IF: (is_applicable_if_inert, frozenset()),
+    REQUIRED_IF: (is_required_if_inert, frozenset(["field_required_evaluate_as_int"])),
+    M2M_REQUIRED_IF: (is_m2m_required_if_inert, frozenset()),
+    M2M_SINGLE_SELECTION_IF: (is_m2m_single_selection_if_inert, frozenset()),
+    M2M_OTHER_SPECIFY: (
+        is_m2m_other_specify_inert,
+        frozenset(["field_other_evaluate_as_int"]),
+    ),
+}
+
+
+def compile_rules(
+    form_validator_cls: type,
+    rules: tuple[Rule, ...],
+    rule_keywords: dict[str, tuple[str, str | None]] | None = None,
+    inert_if: dict[str, tuple[Callable[[dict, Rule], bool], frozenset[str]]] | None = None,
+) -> tuple[RuleNode, ...]:
+    """Returns the rules in declared order, with consecutive rules on
+    the same trigger field grouped, and the form validator method and
+    its arguments resolved.
+
+    The declared order is kept so that the first error raised is the
+    same as calling the rule methods in that order.
+    """
+    rule_keywords = RULE_KEYWORDS if rule_keywords is None else rule_keywords
+    inert_if = INERT_IF if inert_if is None else inert_if
+    groups: list[list[Rule]] = []
+    for rule in rules:
+        if rule.kind not in rule_keywords:
+            raise ValueError(f"Invalid rule kind. Got {rule.kind!r} in {rule}.")
+        if groups and groups[-1][0].field == rule.field:
+            groups[-1].append(rule)
+        else:
+            groups.append([rule])
+    nodes = []
+    for group in groups:
+        compiled = []
+        inert = []
+        for rule in group:
+            field_kw, dependent_kw = rule_keywords[rule.kind]
+            kwargs = {field_kw: rule.field, **dict(rule.options)}
+            if dependent_kw:
+                kwargs[dependent_kw] = rule.dependent
+            compiled.append(
+                CompiledRule(
+                    rule, getattr(form_validator_cls, rule.kind), rule.responses, kwargs
+                )
+            )
+            func, options = inert_if.get(rule.kind, (None, frozenset()))
+            if inert is not None and func and options.issuperset(dict(rule.options)):
+                inert.append((func, rule))
+            else:
+                inert = None
+        nodes.append(
+            RuleNode(group[0].field, tuple(compiled), None if inert is None else tuple(inert))
+        )
+    return tuple(nodes)
+
+
+class RulesFormValidatorMixin:
+    """Runs tables of declarative rules.
+
+    `rules` and each table in `rule_tables` are compiled once, when
+    the class is created. Call `apply_rules()` from `clean()` to run
+    `rules` or `apply_rules(name)` to run a table in `rule_tables`.
+
+    The rules on a trigger field are skipped together if none of
+    them can raise, e.g. the field is not on the form, or is not a
+    response and the dependent field is empty or NOT_APPLICABLE.
+
+    To add a rule kind, add a method to the form validator and its
+    keywords to `rule_keywords`. If the rule may be skipped, add its
+    test to `rule_inert_if`.
+    """
+
+    rules: tuple[Rule, ...] = ()
+    rule_tables: dict[str, tuple[Rule, ...]] = {}
+    rule_keywords: dict[str, tuple[str, str | None]] = RULE_KEYWORDS
+    rule_inert_if: dict[str, tuple[Callable[[dict, Rule], bool], frozenset[str]]] = INERT_IF
+    compiled_rules: tuple[RuleNode, ...] = ()
+    compiled_rule_tables: dict[str, tuple[RuleNode, ...]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compiled_rules = compile_rules(
+            cls, cls.rules, cls.rule_keywords, cls.rule_inert_if
+        )
+        cls.compiled_rule_tables = {
+            name: compile_rules(cls, rules, cls.rule_keywords, cls.rule_inert_if)
+            for name, rules in cls.rule_tables.items()
+        }
+
+    def apply_rules(self, name: str | None = None) -> int:
+        """Runs the rules and returns the number evaluated."""
+        cleaned_data = self.cleaned_data
+        evaluated = 0
+        for _, rules, inert in (
+            self.compiled_rules if name is None else self.compiled_rule_tables[name]
+        ):
+            if inert is not None and all(func(cleaned_data, rule) for func, rule in inert):
+                continue
+            for _, func, responses, kwargs in rules:
+                func(self, *responses, **kwargs)
+                evaluated += 1
+        return evaluated
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from typing import Type
+
+from edc_constants.constants import NOT_APPLICABLE
+
+from .rules import APPLICABLE_IF, REQUIRED_IF, Rule, RulesFormValidatorMixin
+
+__all__ = ["get_client_rules", "export_rules", "export_rules_json"]
+
+# rule kind: (error if the dependent field is missing, error if not expected)
+CLIENT_RULE_MESSAGES: dict[str, tuple[str, str]] = {
+    APPLICABLE_IF: ("This field is applicable.", "This field is not applicable."),
+    REQUIRED_IF: ("This field is required.", "This field is not required."),
+}
+
+CLIENT_RULE_OPTIONS = frozenset(["field_required_evaluate_as_int"])
+
+
+def is_client_rule(rule: Rule) -> bool:
+    """Returns True if the rule can be checked in the browser.
+
+    Only applicable_if and required_if rules without options that
+    change how values are read (e.g. `is_instance_field`) are
+    exported.
+    """
+    return rule.kind in CLIENT_RULE_MESSAGES and CLIENT_RULE_OPTIONS.issuperset(
+        dict(rule.options)
+    )
+
+
+def get_client_rules(form_validator_cls: Type[RulesFormValidatorMixin]) -> list[dict]:
+    """Returns the form validator's rules that can be checked in the
+    browser, in the order they are applied.
+
+    Validation on the server is unchanged; these only allow the form
+    to show field errors before it is submitted.
+    """
+    client_rules = []
+    for nodes in [
+        form_validator_cls.compiled_rules,
+        *form_validator_cls.compiled_rule_tables.values(),
+    ]:
+        for node in nodes:
+            for compiled_rule in node.rules:
+                rule = compiled_rule.rule
+                if is_client_rule(rule):
+                    missing_msg, unexpected_msg = CLIENT_RULE_MESSAGES[rule.kind]
+                    client_rules.append(
+                        dict(
+                            kind=rule.kind,
+                            field=rule.field,
+                            dependent=rule.dependent,
+                            responses=list(rule.responses),
+                            evaluate_as_int=bool(
+                                dict(rule.options).get("field_required_evaluate_as_int")
+                            ),
+                            missing_msg=missing_msg,
+                            unexpected_msg=unexpected_msg,
+                        )
+                    )
+    return client_rules
+
+
+def export_rules(*form_validator_classes: Type[RulesFormValidatorMixin]) -> dict:
+    """Returns a rule set for the browser runtime, keyed by form
+    validator class name.
+
+    For example:
+        export_rules(PatientCallFormValidator, VitalsFormValidator)
+
+    Render it in the template with
+    `{{ rules|json_script:"form-validator-rules" }}`. See
+    `static/intecomm_form_validators/js/form_validator_rules.js`.
+    """
+    return dict(
+        not_applicable=NOT_APPLICABLE,
+        validators={
+            form_validator_cls.__name__: get_client_rules(form_validator_cls)
+            for form_validator_cls in form_validator_classes
+        },
+    )
+
+
+def export_rules_json(*form_validator_classes: Type[RulesFormValidatorMixin]) -> str:
+    return json.dumps(export_rules(*form_validator_classes), sort_keys=True)
@@ -4,10 +4,12 @@ from .health_talk_log_form_validator import HealthTalkLogFormValidator
 from .patient_call_form_validator import PatientCallFormValidator
 from .patient_group_form_validator import PatientGroupFormValidator
 from .patient_group_rando_form_validator import PatientGroupRandoFormValidator
+from .patient_log_batch_validator import PatientLogBatchValidator
 from .patient_log_form_validator import (
     INVALID_APPOINTMENT_DATE,
     INVALID_CHANGE_ALREADY_SCREENED,
     INVALID_GROUP,
+    NOT_SCREENED,
     PatientLogFormValidator,
 )
 from .subject_screening_form_validator import SubjectScreeningFormValidator
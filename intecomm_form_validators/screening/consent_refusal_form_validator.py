@@ -3,5 +3,8 @@ from edc_form_validators import FormValidator
 
 
 class ConsentRefusalFormValidator(FormValidator):
+    # max queries for `clean()`: none
+    query_budget = 0
+
     def clean(self):
         self.required_if(OTHER, field="reason", field_required="other_reason")
@@ -2,4 +2,5 @@ from edc_form_validators import FormValidator
 
 
 class HealthTalkLogFormValidator(FormValidator):
-    pass
+    # max queries for `clean()`: none
+    query_budget = 0
@@ -1,11 +1,22 @@
 from edc_constants.constants import NO, PATIENT, YES
 from edc_form_validators import INVALID_ERROR, FormValidator
 
+from ..rules import APPLICABLE_IF, Rule, RulesFormValidatorMixin
+
+
+class PatientCallFormValidator(RulesFormValidatorMixin, FormValidator):
+    # max queries for `clean()`: none
+    query_budget = 0
+
+    rule_tables = {
+        "answered": (
+            Rule(APPLICABLE_IF, (YES,), "answered", "respondent"),
+            Rule(APPLICABLE_IF, (YES,), "answered", "survival_status"),
+        ),
+    }
 
-class PatientCallFormValidator(FormValidator):
     def clean(self):
-        self.applicable_if(YES, field="answered", field_applicable="respondent")
-        self.applicable_if(YES, field="answered", field_applicable="survival_status")
+        self.apply_rules("answered")
         if (
             self.cleaned_data.get("respondent") == PATIENT
             and self.cleaned_data.get("survival_status") != YES
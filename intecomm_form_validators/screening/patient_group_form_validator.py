@@ -1,21 +1,23 @@
+from __future__ import annotations
+
+from django import forms
 from django.utils.html import format_html
 from edc_constants.constants import COMPLETE, NEW
 from edc_form_validators import FormValidator
 
 from ..constants import RECRUITING
+from ..patient_group_cache import get_patient_group_cache, get_patient_group_cache_key
 from ..utils import (
     PatientGroupMakeupError,
     PatientGroupRatioError,
     PatientGroupSizeError,
+    PatientGroupSnapshot,
     PatientNotConsentedError,
     PatientNotScreenedError,
     PatientNotStableError,
     PatientUnwillingToScreenError,
-    confirm_patient_group_minimum_of_each_condition_or_raise,
-    confirm_patient_group_size_or_raise,
-    confirm_patients_stable_and_screened_and_consented_or_raise,
-    get_group_size_for_ratio,
-    verify_patient_group_ratio_raise,
+    get_patient_group_errors,
+    get_report_all_group_errors,
 )
 from .patient_group_rando_form_validator import INVALID_RANDOMIZE
 
@@ -27,6 +29,30 @@ INVALID_PATIENT_MAKEUP = "INVALID_PATIENT_MAKEUP"
 
 
 class PatientGroupFormValidator(FormValidator):
+    # max queries for `clean()` on COMPLETE, independent of group size: the
+    # patients, their ids and modified timestamps for the cache key and, if not
+    # cached, the patients and their conditions for the group checks
+    query_budget = 4
+
+    error_codes = {
+        PatientGroupSizeError: INVALID_PATIENT_COUNT,
+        PatientNotStableError: INVALID_PATIENT,
+        PatientNotScreenedError: INVALID_PATIENT,
+        PatientNotConsentedError: INVALID_PATIENT,
+        PatientUnwillingToScreenError: INVALID_PATIENT,
+        PatientGroupRatioError: INVALID_CONDITION_RATIO,
+        PatientGroupMakeupError: INVALID_PATIENT_MAKEUP,
+    }
+
+    patient_log_model = "intecomm_screening.patientlog"
+
+    def __init__(self, *, report_all_errors: bool | None = None, **kwargs) -> None:
+        self._patient_group_snapshot = None
+        self.report_all_errors = (
+            get_report_all_group_errors() if report_all_errors is None else report_all_errors
+        )
+        super().__init__(**kwargs)
+
     def clean(self):
         self.block_changes_if_already_randomized()
         if self.cleaned_data.get("status") and self.cleaned_data.get("status") not in [
@@ -37,60 +63,76 @@ class PatientGroupFormValidator(FormValidator):
             self.raise_validation_error({"status": "Invalid selection"}, INVALID_STATUS)
 
         if self.cleaned_data.get("status") == COMPLETE:
-            self.confirm_patients_stable_and_screened_and_consented_or_raise()
-            self.confirm_patient_group_size_or_raise()
-            self.verify_patient_group_ratio_raise()
-            self.confirm_patient_group_minimum_of_each_condition_or_raise()
+            self.raise_on_patient_group_errors()
 
-    def block_changes_if_already_randomized(self):
-        if self.instance.randomized:
-            self.raise_validation_error(
-                "A randomized group may not be changed", INVALID_RANDOMIZE
+    @property
+    def patient_group_snapshot(self) -> PatientGroupSnapshot:
+        """Returns the group's patients and their conditions, queried
+        once and shared by the COMPLETE checks.
+        """
+        if self._patient_group_snapshot is None:
+            self._patient_group_snapshot = PatientGroupSnapshot(
+                self.cleaned_data.get("patients") or self.instance.patients
             )
+        return self._patient_group_snapshot
 
-    def confirm_patient_group_size_or_raise(self):
-        try:
-            confirm_patient_group_size_or_raise(
-                bypass_group_size_min=self.cleaned_data.get("bypass_group_size_min"),
-                patients=self.cleaned_data.get("patients") or self.instance.patients,
-            )
-        except PatientGroupSizeError as e:
-            self.raise_validation_error({"__all__": str(e)}, INVALID_PATIENT_COUNT)
+    def get_patient_group_errors(self) -> list[tuple[str, str]]:
+        """Returns a list of (error code, message) for every failed
+        COMPLETE check or, unless `report_all_errors`, for the first.
 
-    def confirm_patients_stable_and_screened_and_consented_or_raise(self):
-        try:
-            confirm_patients_stable_and_screened_and_consented_or_raise(
-                patients=self.cleaned_data.get("patients") or self.instance.patients
-            )
-        except (
-            PatientNotStableError,
-            PatientNotScreenedError,
-            PatientNotConsentedError,
-            PatientUnwillingToScreenError,
-        ) as e:
-            self.raise_validation_error({"__all__": str(e)}, INVALID_PATIENT)
-
-    def verify_patient_group_ratio_raise(self):
+        Results are cached by group, patients, patient modified
+        timestamp and group settings, and invalidated when a patient
+        log changes; see `patient_group_cache`.
+        """
         patients = self.cleaned_data.get("patients") or self.instance.patients
-        if (
-            not self.cleaned_data.get("bypass_group_ratio")
-            and patients.all().count() >= get_group_size_for_ratio()
-        ):
-            try:
-                verify_patient_group_ratio_raise(patients=patients.all())
-            except PatientGroupRatioError as e:
-                group_name = self.cleaned_data.get("name")
-                errmsg = (
-                    f'See group <a href="{self.instance.get_changelist_url(group_name)}">'
-                    f"{group_name}</a>"
-                )
+        opts = dict(
+            bypass_group_size_min=bool(self.cleaned_data.get("bypass_group_size_min")),
+            bypass_group_ratio=bool(self.cleaned_data.get("bypass_group_ratio")),
+            first_only=not self.report_all_errors,
+        )
+        errors = get_patient_group_cache().get_or_set(
+            get_patient_group_cache_key(self.instance.id, patients, *opts.values()),
+            lambda: get_patient_group_errors(self.patient_group_snapshot, **opts),
+        )
+        return [
+            (
+                self.error_codes[type(e)],
+                (
+                    self.get_ratio_error_message(e)
+                    if isinstance(e, PatientGroupRatioError)
+                    else str(e)
+                ),
+            )
+            for e in errors
+        ]
+
+    def raise_on_patient_group_errors(self) -> None:
+        """Raises the first failed COMPLETE check or, if
+        `report_all_errors`, all of them.
+        """
+        if errors := self.get_patient_group_errors():
+            if self.report_all_errors:
                 self.raise_validation_error(
-                    {"__all__": format_html(f"{e} {errmsg}")}, INVALID_CONDITION_RATIO
+                    {
+                        "__all__": [
+                            forms.ValidationError(msg, code=code) for code, msg in errors
+                        ]
+                    },
+                    errors[0][0],
                 )
+            code, msg = errors[0]
+            self.raise_validation_error({"__all__": msg}, code)
 
-    def confirm_patient_group_minimum_of_each_condition_or_raise(self):
-        patients = self.cleaned_data.get("patients") or self.instance.patients
-        try:
-            confirm_patient_group_minimum_of_each_condition_or_raise(patients)
-        except PatientGroupMakeupError as e:
-            self.raise_validation_error({"__all__": str(e)}, INVALID_PATIENT_MAKEUP)
+    def get_ratio_error_message(self, e: PatientGroupRatioError) -> str:
+        group_name = self.cleaned_data.get("name")
+        errmsg = (
+            f'See group <a href="{self.instance.get_changelist_url(group_name)}">'
+            f"{group_name}</a>"
+        )
+        return format_html(f"{e} {errmsg}")
+
+    def block_changes_if_already_randomized(self):
+        if self.instance.randomized:
+            self.raise_validation_error(
+                "A randomized group may not be changed", INVALID_RANDOMIZE
+            )
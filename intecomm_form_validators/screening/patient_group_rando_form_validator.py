@@ -9,6 +9,9 @@ INVALID_STATUS_NOT_COMPLETE = "INVALID_STATUS_NOT_COMPLETE"
 
 
 class PatientGroupRandoFormValidator(FormValidator):
+    # max queries for `clean()`: none
+    query_budget = 0
+
     def clean(self):
         self.block_changes_if_already_randomized()
         if not self.cleaned_data.get("name"):
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Iterable, Iterator, Type
+
+from django.apps import apps as django_apps
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+
+from .patient_log_form_validator import (
+    NOT_SCREENED,
+    PatientLogFormValidator,
+    get_subject_screening_snapshots,
+)
+
+
+class PatientLogBatchValidator:
+    """Validates many patient logs, e.g. rows of a CSV import, with
+    `PatientLogFormValidator`.
+
+    Rows are cleaned_data dicts. A row with an `id` is validated
+    against the existing patient log. Subject screening and randomized
+    group membership are prefetched for each chunk of rows so that a
+    chunk costs three queries.
+
+    Yields a dict of errors for each row, in order; empty if the row
+    is valid. For example:
+
+        batch_validator = PatientLogBatchValidator()
+        for row, errors in zip(rows, batch_validator.validate(rows)):
+            ...
+    """
+
+    form_validator_cls = PatientLogFormValidator
+    patient_log_model = "intecomm_screening.patientlog"
+
+    def __init__(self, model_cls: Type | None = None, chunk_size: int | None = None):
+        self.model_cls = model_cls or django_apps.get_model(self.patient_log_model)
+        self.chunk_size = chunk_size or 1000
+
+    def validate(self, rows: Iterable[dict]) -> Iterator[dict[str, list[str]]]:
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.chunk_size)):
+            yield from self.validate_chunk(chunk)
+
+    def validate_chunk(self, rows: list[dict]) -> Iterator[dict[str, list[str]]]:
+        ids = [row["id"] for row in rows if row.get("id")]
+        instances = {}
+        randomized = set()
+        if ids:
+            instances = {
+                str(pk): obj for pk, obj in self.model_cls.objects.in_bulk(ids).items()
+            }
+            randomized = {
+                str(pk)
+                for pk in self.model_cls.objects.filter(
+                    id__in=ids, patientgroup__randomized=True
+                ).values_list("id", flat=True)
+            }
+        subject_screenings = get_subject_screening_snapshots(
+            [obj.screening_identifier for obj in instances.values()]
+        )
+        for row in rows:
+            instance = instances.get(str(row.get("id"))) or self.model_cls()
+            form_validator = self.form_validator_cls(
+                cleaned_data=row,
+                instance=instance,
+                model=self.model_cls,
+                subject_screening_snapshot=subject_screenings.get(
+                    instance.screening_identifier, NOT_SCREENED
+                ),
+                in_randomized_group=str(instance.id) in randomized,
+            )
+            try:
+                form_validator.validate()
+            except ValidationError as e:
+                yield (
+                    e.message_dict
+                    if hasattr(e, "error_dict")
+                    else {NON_FIELD_ERRORS: e.messages}
+                )
+            else:
+                yield {}
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any, Iterable, NamedTuple
+
 from django.core.exceptions import ObjectDoesNotExist
 from edc_constants.constants import NO, YES
 from edc_form_validators import FormValidator
@@ -12,10 +14,69 @@ INVALID_APPOINTMENT_DATE = "INVALID_APPOINTMENT_DATE"
 INVALID_GROUP = "INVALID_GROUP"
 INVALID_CHANGE_ALREADY_SCREENED = "INVALID_CHANGE_ALREADY_SCREENED"
 
+# passed as `subject_screening` or `subject_screening_snapshot` if the
+# patient is known not to have screened
+NOT_SCREENED = object()
+
+
+class SubjectScreeningSnapshot(NamedTuple):
+    """The subject screening fields checked against the patient log."""
+
+    screening_identifier: str
+    gender: str
+    initials: str
+    hospital_identifier: str
+    site_id: int
+
+
+def get_subject_screening_snapshots(
+    screening_identifiers: Iterable[str | None],
+) -> dict[str, SubjectScreeningSnapshot]:
+    """Returns a dict of SubjectScreeningSnapshot keyed by screening
+    identifier using a single query.
+
+    Use to pre-seed validators for a list of patient logs. For example:
+        snapshots = get_subject_screening_snapshots(
+            [obj.screening_identifier for obj in patient_logs]
+        )
+        PatientLogFormValidator(
+            subject_screening_snapshot=snapshots.get(
+                patient_log.screening_identifier, NOT_SCREENED
+            ),
+            ...
+        )
+    """
+    screening_identifiers = [obj for obj in screening_identifiers if obj]
+    if not screening_identifiers:
+        return {}
+    return {
+        values[0]: SubjectScreeningSnapshot(*values)
+        for values in get_subject_screening_model_cls()
+        .objects.filter(screening_identifier__in=screening_identifiers)
+        .values_list(*SubjectScreeningSnapshot._fields)
+    }
+
 
 class PatientLogFormValidator(FormValidator):
-    def __init__(self, subject_screening=None, **kwargs) -> None:
+    # max queries for `clean()`: whether the patient is in a randomized group and
+    # the subject screening
+    query_budget = 2
+
+    def __init__(
+        self,
+        subject_screening: Any = None,
+        in_randomized_group: bool | None = None,
+        subject_screening_snapshot: SubjectScreeningSnapshot | object | None = None,
+        **kwargs,
+    ) -> None:
+        """If `subject_screening` or `subject_screening_snapshot` is
+        provided, or NOT_SCREENED if not screened, the subject
+        screening is not queried. The same applies to
+        `in_randomized_group`.
+        """
         self._subject_screening = subject_screening
+        self._subject_screening_snapshot = subject_screening_snapshot
+        self._in_randomized_group = in_randomized_group
         super().__init__(**kwargs)
 
     @property
@@ -23,32 +84,27 @@ class PatientLogFormValidator(FormValidator):
         return self.cleaned_data.get("age_in_years")
 
     def clean(self):
-        if (
-            self.instance.id
-            and self.instance.patientgroup_set.filter(randomized=True).exists()
-        ):
+        if self.in_randomized_group:
             self.raise_validation_error(
                 "A patient in a randomized group may not be changed", INVALID_RANDOMIZE
             )
 
-        if self.subject_screening and self.subject_screening.gender != self.cleaned_data.get(
-            "gender"
-        ):
+        subject_screening = self.subject_screening_snapshot
+        if subject_screening and subject_screening.gender != self.cleaned_data.get("gender"):
             self.raise_validation_error(
                 "Patient has already screened. Gender may not change",
                 INVALID_CHANGE_ALREADY_SCREENED,
             )
-        if (
-            self.subject_screening
-            and self.subject_screening.initials != self.cleaned_data.get("initials")
+        if subject_screening and subject_screening.initials != self.cleaned_data.get(
+            "initials"
         ):
             self.raise_validation_error(
                 "Patient has already screened. Initials may not change",
                 INVALID_CHANGE_ALREADY_SCREENED,
             )
         if (
-            self.subject_screening
-            and self.subject_screening.hospital_identifier
+            subject_screening
+            and subject_screening.hospital_identifier
             != self.cleaned_data.get("hospital_identifier")
         ):
             self.raise_validation_error(
@@ -59,9 +115,9 @@ class PatientLogFormValidator(FormValidator):
         self.validate_age()
 
         if (
-            self.subject_screening
+            subject_screening
             and self.cleaned_data.get("site")
-            and self.subject_screening.site.id != self.cleaned_data.get("site").id
+            and subject_screening.site_id != self.cleaned_data.get("site").id
         ):
             self.raise_validation_error(
                 "Patient has already screened. Site / Health Facility may not change",
@@ -94,7 +150,7 @@ class PatientLogFormValidator(FormValidator):
             YES, field="second_health_talk", field_required="second_health_talk_date"
         )
 
-        if self.subject_screening and self.cleaned_data.get("willing_to_screen") != YES:
+        if subject_screening and self.cleaned_data.get("willing_to_screen") != YES:
             self.raise_validation_error(
                 {"willing_to_screen": "Patient has already screened. Expected YES."},
                 INVALID_ERROR,
@@ -110,14 +166,47 @@ class PatientLogFormValidator(FormValidator):
 
     @property
     def subject_screening(self):
-        if not self._subject_screening:
+        """Returns the subject screening model instance for this
+        patient or None if not screened.
+        """
+        if self._subject_screening is None:
             try:
                 self._subject_screening = get_subject_screening_model_cls().objects.get(
                     screening_identifier=self.instance.screening_identifier
                 )
             except ObjectDoesNotExist:
-                self._subject_screening = None
-        return self._subject_screening
+                self._subject_screening = NOT_SCREENED
+        return None if self._subject_screening is NOT_SCREENED else self._subject_screening
+
+    @property
+    def subject_screening_snapshot(self) -> SubjectScreeningSnapshot | None:
+        """Returns the subject screening fields checked against the
+        patient log or None if not screened.
+
+        Taken from `subject_screening` unless provided.
+        """
+        if self._subject_screening_snapshot is None:
+            if subject_screening := self.subject_screening:
+                self._subject_screening_snapshot = SubjectScreeningSnapshot(
+                    *[
+                        getattr(subject_screening, field, None)
+                        for field in SubjectScreeningSnapshot._fields
+                    ]
+                )
+            else:
+                self._subject_screening_snapshot = NOT_SCREENED
+        if self._subject_screening_snapshot is NOT_SCREENED:
+            return None
+        return self._subject_screening_snapshot
+
+    @property
+    def in_randomized_group(self) -> bool:
+        if self._in_randomized_group is None:
+            self._in_randomized_group = bool(
+                self.instance.id
+                and self.instance.patientgroup_set.filter(randomized=True).exists()
+            )
+        return self._in_randomized_group
 
     def validate_age(self) -> None:
         if self.age_in_years is not None and not (18 <= self.age_in_years < 110):
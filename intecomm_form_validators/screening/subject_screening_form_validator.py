@@ -12,6 +12,9 @@ INVALID_DURATION_IN_CARE = "invalid_duration_in_care"
 
 
 class SubjectScreeningFormValidator(FormValidator):
+    # max queries for `clean()`: none
+    query_budget = 0
+
     def clean(self):
         if not self.patient_log_identifier:
             self.raise_validation_error("Select a Patient log", error_code=INVALID_ERROR)
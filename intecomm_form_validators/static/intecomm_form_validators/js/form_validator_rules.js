@@ -0,0 +1,137 @@
+/*
+ * Checks applicable_if / required_if rules exported by
+ * intecomm_form_validators.rules_export in the browser and shows
+ * field errors before the form is submitted.
+ *
+ * The server still validates the form. Add the rule set returned by
+ * `export_rules(VitalsFormValidator)` to the admin change form context
+ * as `rules` and render it with `json_script`, for example:
+ *
+ *   {{ rules|json_script:"form-validator-rules" }}
+ *   <script src="{% static 'intecomm_form_validators/js/form_validator_rules.js' %}"></script>
+ *
+ * The rules of every validator in the rule set are checked on the form.
+ */
+(function () {
+  "use strict";
+
+  function getValue(form, name) {
+    var inputs = form.querySelectorAll('[name="' + name + '"]');
+    if (!inputs.length) {
+      return undefined;
+    }
+    for (var i = 0; i < inputs.length; i++) {
+      var input = inputs[i];
+      if (input.type === "radio" || input.type === "checkbox") {
+        if (input.checked) {
+          return input.value;
+        }
+      } else {
+        return input.value.trim();
+      }
+    }
+    return "";
+  }
+
+  // As the server, where an empty value is None or "" and, unless
+  // evaluated as an int, also a number equal to 0. A "0" typed in a
+  // text input is a value.
+  function hasValue(form, name, value, evaluateAsInt) {
+    if (value === "") {
+      return false;
+    }
+    if (evaluateAsInt) {
+      return true;
+    }
+    var input = form.querySelector('[name="' + name + '"]');
+    return !(input && input.type === "number" && Number(value) === 0);
+  }
+
+  function check(rule, form, notApplicable) {
+    var value = getValue(form, rule.field);
+    var dependent = getValue(form, rule.dependent);
+    if (value === undefined || dependent === undefined) {
+      return null;
+    }
+    var isResponse = rule.responses.indexOf(value) !== -1;
+    if (rule.kind === "applicable_if") {
+      if (isResponse && (dependent === "" || dependent === notApplicable)) {
+        return rule.missing_msg;
+      }
+      if (!isResponse && dependent !== notApplicable) {
+        return rule.unexpected_msg;
+      }
+    } else if (rule.kind === "required_if") {
+      var dependentHasValue = hasValue(form, rule.dependent, dependent, rule.evaluate_as_int);
+      if (isResponse && (!dependentHasValue || dependent === notApplicable)) {
+        return rule.missing_msg;
+      }
+      if (!isResponse && dependentHasValue && dependent !== notApplicable) {
+        return rule.unexpected_msg;
+      }
+    }
+    return null;
+  }
+
+  function showError(form, name, message) {
+    var row = form.querySelector(".field-" + name);
+    if (!row) {
+      var input = form.querySelector('[name="' + name + '"]');
+      if (!input) {
+        return;
+      }
+      row = input.parentNode;
+    }
+    var errorlist = row.querySelector("ul.errorlist.form-validator-rule");
+    if (!message) {
+      if (errorlist) {
+        errorlist.parentNode.removeChild(errorlist);
+      }
+      return;
+    }
+    if (!errorlist) {
+      errorlist = document.createElement("ul");
+      errorlist.className = "errorlist form-validator-rule";
+      row.insertBefore(errorlist, row.firstChild);
+    }
+    errorlist.innerHTML = "";
+    var item = document.createElement("li");
+    item.textContent = message;
+    errorlist.appendChild(item);
+  }
+
+  function attach(form, rules, notApplicable) {
+    function validate(event) {
+      var name = event.target.name;
+      var errors = {};
+      rules.forEach(function (rule) {
+        if (rule.field === name || rule.dependent === name) {
+          if (!(rule.dependent in errors) || !errors[rule.dependent]) {
+            errors[rule.dependent] = check(rule, form, notApplicable);
+          }
+        }
+      });
+      Object.keys(errors).forEach(function (dependent) {
+        showError(form, dependent, errors[dependent]);
+      });
+    }
+    form.addEventListener("change", validate);
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    var script = document.getElementById("form-validator-rules");
+    var form = script && (script.closest("form") || document.querySelector("form"));
+    if (!form) {
+      return;
+    }
+    var ruleSet = JSON.parse(script.textContent);
+    Object.keys(ruleSet.validators).forEach(function (name) {
+      var rules = ruleSet.validators[name];
+      if (rules.length) {
+        attach(form, rules, ruleSet.not_applicable);
+      }
+    });
+  });
+
+  window.intecommFormValidatorRules = { attach: attach, check: check };
+})();
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from functools import cached_property
+
 from edc_constants.constants import NO, YES
 from edc_crf.crf_form_validator import CrfFormValidator
 from edc_dx import get_diagnosis_labels
@@ -11,6 +15,10 @@ PROTOCOL_INCIDENT = "PROTOCOL_INCIDENT"
 class ClinicalReviewBaselineFormValidator(
     ClinicalReviewBaselineFormValidatorMixin, CrfFormValidator
 ):
+    # max queries for `clean()`: the appointment, to confirm this is the baseline
+    # visit, and the screening diagnoses
+    query_budget = 2
+
     def clean(self) -> None:
         protocol_incident = NO
         for cond, label in get_diagnosis_labels().items():
@@ -32,14 +40,24 @@ class ClinicalReviewBaselineFormValidator(
                 {"protocol_incident": f"Expected {protocol_incident}"}, PROTOCOL_INCIDENT
             )
 
-    @property
-    def subject_screening(self):
-        return get_subject_screening_model_cls().objects.get(
-            subject_identifier=self.subject_identifier
+    @cached_property
+    def subject_screening_dxs(self) -> dict[str, str]:
+        """Returns the `<cond>_dx` values from subject screening
+        using a single query.
+        """
+        model_cls = get_subject_screening_model_cls()
+        field_names = [f.name for f in model_cls._meta.get_fields()]
+        fields = [
+            f"{cond}_dx" for cond in get_diagnosis_labels() if f"{cond}_dx" in field_names
+        ]
+        return (
+            model_cls.objects.filter(subject_identifier=self.subject_identifier)
+            .values("pk", *fields)
+            .get()
         )
 
     def subject_screening_dx(self, cond: str):
-        return getattr(self.subject_screening, f"{cond}_dx", "")
+        return self.subject_screening_dxs.get(f"{cond}_dx", "")
 
     def dx(self, cond: str):
         return self.cleaned_data.get(f"{cond}_dx")
@@ -4,12 +4,19 @@ from edc_dx_review.form_validator_mixins import ClinicalReviewFollowupFormValida
 from edc_form_validators import FormValidator
 from edc_visit_schedule.utils import raise_if_baseline
 
+from .mixins import DiagnosesFormValidatorMixin
+
 
 class ClinicalReviewFormValidator(
+    DiagnosesFormValidatorMixin,
     ClinicalReviewFollowupFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: 1 for the appointment, to confirm this is not the
+    # baseline visit, and 5 for the diagnoses (see DiagnosesFormValidatorMixin)
+    query_budget = 6
+
     def clean(self):
         raise_if_baseline(self.cleaned_data.get("subject_visit"))
         self.required_if(
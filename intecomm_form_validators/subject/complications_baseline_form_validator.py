@@ -3,20 +3,36 @@ from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 
+from ..rules import REQUIRED_IF, Rule, RulesFormValidatorMixin
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
+
+class ComplicationsBaselineFormValidator(
+    RulesFormValidatorMixin,
+    VisitContextFormValidatorMixin,
+    CrfFormValidatorMixin,
+    FormValidator,
+):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up,
+    # and the clinical review baseline this form requires
+    query_budget = 2
+
+    rules = (
+        *(
+            Rule(REQUIRED_IF, (YES,), field, f"{field}_ago")
+            for field in [
+                "stroke",
+                "heart_attack",
+                "renal_disease",
+                "vision",
+                "numbness",
+                "foot_ulcers",
+            ]
+        ),
+        Rule(REQUIRED_IF, (YES,), "complications", "complications_other"),
+    )
 
-class ComplicationsBaselineFormValidator(CrfFormValidatorMixin, FormValidator):
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
-        self.required_if(YES, field="stroke", field_required="stroke_ago")
-        # self.estimated_date_from_ago("stroke_ago")
-        self.required_if(YES, field="heart_attack", field_required="heart_attack_ago")
-        # self.estimated_date_from_ago("heart_attack_ago")
-        self.required_if(YES, field="renal_disease", field_required="renal_disease_ago")
-        # self.estimated_date_from_ago("renal_disease_ago")
-        self.required_if(YES, field="vision", field_required="vision_ago")
-        # self.estimated_date_from_ago("vision_ago")
-        self.required_if(YES, field="numbness", field_required="numbness_ago")
-        # self.estimated_date_from_ago("numbness_ago")
-        self.required_if(YES, field="foot_ulcers", field_required="foot_ulcers_ago")
-        # self.estimated_date_from_ago("foot_ulcers_ago")
-        self.required_if(YES, field="complications", field_required="complications_other")
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
+        self.apply_rules()
@@ -6,14 +6,22 @@ from edc_form_validators import INVALID_ERROR
 from edc_form_validators.form_validator import FormValidator
 from edc_glucose.form_validators import GlucoseFormValidatorMixin
 
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
 
 class DmInitialReviewFormValidator(
+    VisitContextFormValidatorMixin,
     GlucoseFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up, and the
+    # clinical review baseline or clinical review this form requires
+    query_budget = 2
+
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
 
         try:
             dx_date = DxDate(self.cleaned_data)
@@ -8,4 +8,5 @@ class DmMedicationAdherenceFormValidator(
     CrfFormValidatorMixin,
     FormValidator,
 ):
-    pass
+    # max queries for `clean()`: none
+    query_budget = 0
@@ -3,14 +3,22 @@ from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 from edc_glucose.form_validators import GlucoseFormValidatorMixin
 
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
 
 class DmReviewFormValidator(
+    VisitContextFormValidatorMixin,
     GlucoseFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up,
+    # and the clinical review this form requires
+    query_budget = 2
+
     prefix = "glucose"
 
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
         self.validate_glucose_test()
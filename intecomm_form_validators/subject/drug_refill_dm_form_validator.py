@@ -8,6 +8,10 @@ from .mixins import DrugRefillFormValidatorMixin
 class DrugRefillDmFormValidator(
     DrugRefillFormValidatorMixin, CrfFormValidatorMixin, FormValidator
 ):
+    # max queries for `clean()`: the medications this form requires and the
+    # appointment, as `rx_modified` must be NO at baseline
+    query_budget = 2
+
     def clean(self):
         medications_exists_or_raise(self.cleaned_data.get("subject_visit"))
         self.validate_rx_as_m2m()
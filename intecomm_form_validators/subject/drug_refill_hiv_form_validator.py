@@ -11,6 +11,10 @@ TOTAL_DAYS_MISMATCH_ERROR = "TOTAL_DAYS_MISMATCH"
 class DrugRefillHivFormValidator(
     DrugRefillFormValidatorMixin, CrfFormValidatorMixin, FormValidator
 ):
+    # max queries for `clean()`: the medications this form requires and the
+    # appointment, as `rx_modified` must be NO at baseline
+    query_budget = 2
+
     def clean(self):
         medications_exists_or_raise(self.cleaned_data.get("subject_visit"))
         self.validate_rx_as_fk()
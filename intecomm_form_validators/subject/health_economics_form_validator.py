@@ -1,5 +1,10 @@
+from __future__ import annotations
+
 from django import forms
 from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
 from django.utils.translation import gettext_lazy as _
 from edc_constants.constants import (
     FREE_OF_CHARGE,
@@ -11,20 +16,184 @@ from edc_constants.constants import (
     YES,
 )
 from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
-from edc_dx.form_validators import DiagnosisFormValidatorMixin
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 
+from ..rules import (
+    APPLICABLE_IF,
+    INERT_IF,
+    M2M_OTHER_SPECIFY,
+    M2M_REQUIRED_IF,
+    M2M_SINGLE_SELECTION_IF,
+    RULE_KEYWORDS,
+    Rule,
+    RulesFormValidatorMixin,
+    is_applicable_if_inert,
+    is_m2m_other_specify_inert,
+)
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import DiagnosesFormValidatorMixin, VisitContextFormValidatorMixin
+
+APPLICABLE_IF_RECEIVED_AND_DIAGNOSED = "applicable_if_received_and_diagnosed"
+M2M_COST_SPECIFY = "m2m_cost_specify"
+
+# NOTE: Must align with choices in intecomm_lists.models.DrugPaySources.
+# Used if the list model is not installed or is empty.
+DRUG_PAY_SOURCES_WITH_COST = frozenset([OWN_CASH, INSURANCE, PATIENT_CLUB, RELATIVE, OTHER])
+
+GENERATION_KEY = "intecomm_form_validators.drug_pay_sources.generation"
+
+# list model label: (generation, names)
+_drug_pay_sources_with_cost: dict[str, tuple[int | None, frozenset[str]]] = {}
+
+
+def get_drug_pay_sources_cache():
+    alias = getattr(settings, "INTECOMM_DRUG_PAY_SOURCES_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def get_drug_pay_sources_generation(label: str) -> int | None:
+    backend = get_drug_pay_sources_cache()
+    if backend is None:
+        return None
+    return backend.get_or_set(f"{GENERATION_KEY}.{label}", 0, timeout=None)
+
+
+def get_drug_pay_sources_with_cost(model_cls) -> frozenset[str]:
+    """Returns the names of the drug pay sources other than
+    FREE_OF_CHARGE.
+
+    Queried once per list model and cached until an instance of the
+    list model is saved or deleted; see
+    `connect_drug_pay_sources_signals`.
+
+    The names are cached in each process. If
+    INTECOMM_DRUG_PAY_SOURCES_CACHE_ALIAS is set, a generation counter
+    in that Django cache is bumped on save or delete, so that every
+    process queries the names again. If not set, only the process that
+    saved or deleted the instance does.
+    """
+    label = model_cls._meta.label_lower
+    generation = get_drug_pay_sources_generation(label)
+    try:
+        cached_generation, names = _drug_pay_sources_with_cost[label]
+    except KeyError:
+        pass
+    else:
+        if cached_generation == generation:
+            return names
+    names = frozenset(
+        model_cls.objects.exclude(name=FREE_OF_CHARGE).values_list("name", flat=True)
+    )
+    names = names or DRUG_PAY_SOURCES_WITH_COST
+    _drug_pay_sources_with_cost[label] = (generation, names)
+    return names
+
+
+def clear_drug_pay_sources_cache(sender, **kwargs) -> None:
+    label = sender._meta.label_lower
+    _drug_pay_sources_with_cost.pop(label, None)
+    if (backend := get_drug_pay_sources_cache()) is not None:
+        try:
+            backend.incr(f"{GENERATION_KEY}.{label}")
+        except ValueError:
+            backend.add(f"{GENERATION_KEY}.{label}", 1, timeout=None)
+
+
+def connect_drug_pay_sources_signals(model_cls) -> None:
+    """Clears the cached drug pay sources when an instance of the
+    list model is saved or deleted.
+
+    Changes made with `QuerySet.update()` send no signal; call
+    `clear_drug_pay_sources_cache(model_cls)` after them.
+
+    Called from AppConfig.ready().
+    """
+    label = model_cls._meta.label_lower
+    post_save.connect(
+        clear_drug_pay_sources_cache,
+        sender=model_cls,
+        dispatch_uid=f"intecomm_form_validators.drug_pay_sources_on_save.{label}",
+    )
+    post_delete.connect(
+        clear_drug_pay_sources_cache,
+        sender=model_cls,
+        dispatch_uid=f"intecomm_form_validators.drug_pay_sources_on_delete.{label}",
+    )
+
+
+def get_recv_drugs_rules(duration: str) -> tuple[Rule, ...]:
+    received = f"received_rx_{duration}"
+    rules = []
+    for cond, label in [("dm", "diabetes"), ("htn", "hypertension"), ("hiv", "HIV")]:
+        rules.append(
+            Rule(
+                APPLICABLE_IF_RECEIVED_AND_DIAGNOSED,
+                (YES,),
+                received,
+                f"rx_{cond}_{duration}",
+                (("prefix", f"{cond}_dx"), ("label", label)),
+            )
+        )
+        rules.extend(get_drug_pay_source_rules(cond, duration))
+    rules.append(Rule(APPLICABLE_IF, (YES,), received, f"rx_other_{duration}"))
+    rules.extend(get_drug_pay_source_rules("other", duration))
+    return tuple(rules)
+
+
+def get_drug_pay_source_rules(cond: str, duration: str) -> tuple[Rule, ...]:
+    paid = f"rx_{cond}_paid_{duration}"
+    return (
+        Rule(M2M_REQUIRED_IF, (YES,), f"rx_{cond}_{duration}", paid),
+        Rule(M2M_SINGLE_SELECTION_IF, (FREE_OF_CHARGE,), paid),
+        Rule(M2M_OTHER_SPECIFY, (OTHER,), paid, f"{paid}_other"),
+        Rule(
+            M2M_COST_SPECIFY,
+            (),
+            paid,
+            f"rx_{cond}_cost_{duration}",
+            (("field_other_evaluate_as_int", True),),
+        ),
+    )
+
 
 class HealthEconomicsFormValidator(
-    DiagnosisFormValidatorMixin,
+    RulesFormValidatorMixin,
+    VisitContextFormValidatorMixin,
+    DiagnosesFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: 2 for the appointment and the clinical review this
+    # form requires, 5 for the diagnoses (see DiagnosesFormValidatorMixin), 1 for
+    # the selected drug pay sources and 1 for the drug pay sources with a cost
+    query_budget = 9
+
     drug_pay_sources_model = "intecomm_lists.DrugPaySources"
 
+    rule_keywords = {
+        **RULE_KEYWORDS,
+        APPLICABLE_IF_RECEIVED_AND_DIAGNOSED: ("field", "field_applicable"),
+        M2M_COST_SPECIFY: ("m2m_field", "field_other"),
+    }
+    rule_inert_if = {
+        **INERT_IF,
+        APPLICABLE_IF_RECEIVED_AND_DIAGNOSED: (
+            is_applicable_if_inert,
+            frozenset(["prefix", "label"]),
+        ),
+        M2M_COST_SPECIFY: (
+            is_m2m_other_specify_inert,
+            frozenset(["field_other_evaluate_as_int"]),
+        ),
+    }
+    rule_tables = {
+        "month": get_recv_drugs_rules("month"),
+        "today": get_recv_drugs_rules("today"),
+    }
+
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
 
         self.clean_education()
 
@@ -40,6 +209,14 @@ class HealthEconomicsFormValidator(
     def drug_pay_sources_model_cls(self):
         return django_apps.get_model(self.drug_pay_sources_model)
 
+    @property
+    def drug_pay_sources_with_cost(self) -> frozenset[str]:
+        try:
+            model_cls = self.drug_pay_sources_model_cls
+        except LookupError:
+            return DRUG_PAY_SOURCES_WITH_COST
+        return get_drug_pay_sources_with_cost(model_cls)
+
     def clean_education(self):
         cond = (
             self.cleaned_data.get("education_in_years") is not None
@@ -77,58 +254,32 @@ class HealthEconomicsFormValidator(
         )
 
     def clean_recv_drugs_by_duration(self, duration):
-        conditions = [
-            ("dm", "diabetes"),
-            ("htn", "hypertension"),
-            ("hiv", "HIV"),
-            ("other", None),
-        ]
-        diagnoses = self.get_diagnoses()
-        for cond, label in conditions:
-            if cond == "other":
-                self.applicable_if(
-                    YES,
-                    field=f"received_rx_{duration}",
-                    field_applicable=f"rx_{cond}_{duration}",
-                )
-            else:
-                if self.cleaned_data.get(f"received_rx_{duration}") == YES:
-                    self.applicable_if_diagnosed(
-                        diagnoses=diagnoses,
-                        prefix=f"{cond}_dx",
-                        field_applicable=f"rx_{cond}_{duration}",
-                        label=label,
-                    )
-                else:
-                    self.applicable_if(
-                        YES,
-                        field=f"received_rx_{duration}",
-                        field_applicable=f"rx_{cond}_{duration}",
-                    )
-
-            self.m2m_required_if(
-                response=YES,
-                field=f"rx_{cond}_{duration}",
-                m2m_field=f"rx_{cond}_paid_{duration}",
-            )
-            self.m2m_single_selection_if(
-                FREE_OF_CHARGE, m2m_field=f"rx_{cond}_paid_{duration}"
-            )
-            self.m2m_other_specify(
-                OTHER,
-                m2m_field=f"rx_{cond}_paid_{duration}",
-                field_other=f"rx_{cond}_paid_{duration}_other",
-            )
-            self.m2m_other_specify(
-                *[
-                    obj.name
-                    for obj in (
-                        # NOTE: Must align with choices in intecomm_lists.models.DrugPaySources
-                        (OWN_CASH, INSURANCE, PATIENT_CLUB, RELATIVE, FREE_OF_CHARGE, OTHER)
-                    )
-                    if obj.name != FREE_OF_CHARGE
-                ],
-                m2m_field=f"rx_{cond}_paid_{duration}",
-                field_other=f"rx_{cond}_cost_{duration}",
-                field_other_evaluate_as_int=True,
+        self.apply_rules(duration)
+
+    def applicable_if_received_and_diagnosed(
+        self, *responses, field=None, field_applicable=None, prefix=None, label=None
+    ):
+        """If drugs were received, `field_applicable` is applicable if
+        diagnosed, otherwise applicable_if(*responses, field=field).
+        """
+        if self.cleaned_data.get(field) in responses:
+            return self.applicable_if_diagnosed(
+                diagnoses=self.get_diagnoses(),
+                prefix=prefix,
+                field_applicable=field_applicable,
+                label=label,
             )
+        return self.applicable_if(*responses, field=field, field_applicable=field_applicable)
+
+    def m2m_cost_specify(
+        self, *responses, m2m_field=None, field_other=None, field_other_evaluate_as_int=None
+    ):
+        """Same as m2m_other_specify() where `responses` default to
+        the drug pay sources with a cost.
+        """
+        return self.m2m_other_specify(
+            *(responses or self.drug_pay_sources_with_cost),
+            m2m_field=m2m_field,
+            field_other=field_other,
+            field_other_evaluate_as_int=field_other_evaluate_as_int,
+        )
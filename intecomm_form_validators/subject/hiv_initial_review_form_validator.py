@@ -5,18 +5,26 @@ from edc_dx_review.medical_date import DxDate, MedicalDateError, RxDate
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
 
 class HivInitialReviewFormValidator(
+    VisitContextFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up, and the
+    # clinical review baseline or clinical review this form requires
+    query_budget = 2
+
     def __init__(self, **kwargs):
         self.dx_date = None
         self.rx_init_date = None
         super().__init__(**kwargs)
 
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
 
         try:
             self.dx_date = DxDate(self.cleaned_data)
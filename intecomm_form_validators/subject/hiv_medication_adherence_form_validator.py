@@ -8,4 +8,5 @@ class HivMedicationAdherenceFormValidator(
     CrfFormValidatorMixin,
     FormValidator,
 ):
-    pass
+    # max queries for `clean()`: none
+    query_budget = 0
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import TYPE_CHECKING
+from datetime import date, datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Type
 
-from django.core.exceptions import ObjectDoesNotExist
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext as _
@@ -12,11 +12,84 @@ from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
 from edc_form_validators import INVALID_ERROR, FormValidator
 from edc_visit_schedule.constants import MONTH0
 
+from ..visit_context import BASELINE_DATETIME, get_or_set_scoped
+
 if TYPE_CHECKING:
-    from intecomm_subject.models import HivReview
+    from intecomm_subject.models import HivReview, SubjectVisit
+
+
+def get_baseline_datetime(
+    related_visit_model_cls: Type[SubjectVisit], subject_identifier: str
+) -> datetime:
+    """Returns the report datetime of the subject's baseline visit.
+
+    Within a request, or a `visit_context_scope`, queried once per
+    subject. The baseline visit may be edited, so it is not cached
+    beyond that.
+    """
+    return get_or_set_scoped(
+        (BASELINE_DATETIME, related_visit_model_cls, subject_identifier),
+        lambda: related_visit_model_cls.objects.get(
+            subject_identifier=subject_identifier,
+            visit_code=MONTH0,
+            visit_code_sequence=0,
+        ).report_datetime,
+    )
+
+
+class ViralLoadDrawnDate(NamedTuple):
+    """An existing HIV review with a VL drawn date."""
+
+    id: str
+    subject_identifier: str
+    appointment_id: str
+    visit_code: str
+    visit_code_sequence: int
+    has_vl: str
+
+
+def get_viral_load_drawn_dates(
+    model_cls: Type[HivReview],
+    subject_identifiers: Iterable[str],
+    exclude_ids: Iterable[str] | None = None,
+) -> dict[tuple[str, date], ViralLoadDrawnDate]:
+    """Returns a dict of existing HIV reviews keyed by
+    (subject_identifier, drawn_date) using a single query.
+
+    Reviews in `exclude_ids`, e.g. the instance being validated,
+    are left out.
+
+    For example, to check a batch of VL results for duplicates:
+        drawn_dates = get_viral_load_drawn_dates(HivReview, {r[0] for r in rows})
+        duplicates = [r for r in rows if (r[0], r[1]) in drawn_dates]
+    """
+    drawn_dates = {}
+    for drawn_date, *values in (
+        model_cls.objects.filter(
+            subject_visit__subject_identifier__in=list(subject_identifiers),
+            drawn_date__isnull=False,
+        )
+        .exclude(id__in=[obj for obj in exclude_ids or [] if obj])
+        .values_list(
+            "drawn_date",
+            "id",
+            "subject_visit__subject_identifier",
+            "subject_visit__appointment_id",
+            "subject_visit__appointment__visit_code",
+            "subject_visit__appointment__visit_code_sequence",
+            "has_vl",
+        )
+    ):
+        obj = ViralLoadDrawnDate(*values)
+        drawn_dates.setdefault((obj.subject_identifier, drawn_date), obj)
+    return drawn_dates
 
 
 class HivReviewFormValidator(CrfFormValidatorMixin, FormValidator):
+    # max queries for `clean()`: the baseline visit, for its report datetime, and
+    # any other HIV review with the same VL drawn date
+    query_budget = 2
+
     def clean(self):
         self.validate_rx_init_dates()
         self.validate_viral_load()
@@ -61,24 +134,22 @@ class HivReviewFormValidator(CrfFormValidatorMixin, FormValidator):
                     },
                     INVALID_ERROR,
                 )
-            elif self.hiv_review_for_drawn_date:
-                appointment = self.hiv_review_for_drawn_date.related_visit.appointment
-                has_vl = self.hiv_review_for_drawn_date.has_vl
+            elif hiv_review := self.hiv_review_for_drawn_date:
                 pending_comment = ""
-                if has_vl == PENDING:
+                if hiv_review.has_vl == PENDING:
                     pending_comment = _(
                         "Please update the PENDING viral result on the existing HIV Review . "
                     )
                 url = reverse(
                     "intecomm_dashboard:subject_dashboard_url",
                     kwargs=dict(
-                        subject_identifier=appointment.subject_identifier,
-                        appointment=appointment.id,
+                        subject_identifier=hiv_review.subject_identifier,
+                        appointment=hiv_review.appointment_id,
                     ),
                 )
                 visit = (
-                    f'<A href="{url}">{appointment.visit_code}."'
-                    f'"{appointment.visit_code_sequence}</A>'
+                    f'<A href="{url}">{hiv_review.visit_code}."'
+                    f'"{hiv_review.visit_code_sequence}</A>'
                 )
                 self.raise_validation_error(
                     {
@@ -98,27 +169,21 @@ class HivReviewFormValidator(CrfFormValidatorMixin, FormValidator):
         self.required_if(YES, field="has_vl", field_required="vl")
         self.required_if(YES, field="has_vl", field_required="vl_quantifier")
 
-    @property
+    @cached_property
     def baseline_datetime(self) -> datetime:
-        return self.related_visit_model_cls.objects.get(
-            subject_identifier=self.subject_identifier,
-            visit_code=MONTH0,
-            visit_code_sequence=0,
-        ).report_datetime
+        return get_baseline_datetime(self.related_visit_model_cls, self.subject_identifier)
+
+    @cached_property
+    def viral_load_drawn_dates(self) -> dict[tuple[str, date], ViralLoadDrawnDate]:
+        return get_viral_load_drawn_dates(
+            self.model, [self.subject_identifier], exclude_ids=[self.instance.id]
+        )
 
     @property
-    def hiv_review_for_drawn_date(self) -> HivReview | None:
-        """Return an HIVReview instance for this drawn date."""
-        hiv_review = None
+    def hiv_review_for_drawn_date(self) -> ViralLoadDrawnDate | None:
+        """Return an existing HIV review for this drawn date."""
         if self.cleaned_data.get("drawn_date"):
-            try:
-                hiv_review = self.model.objects.get(
-                    subject_visit__subject_identifier=self.subject_identifier,
-                    drawn_date=self.cleaned_data.get("drawn_date"),
-                )
-            except ObjectDoesNotExist:
-                hiv_review = None
-            else:
-                if self.instance.id and hiv_review.id == self.instance.id:
-                    hiv_review = None
-        return hiv_review
+            return self.viral_load_drawn_dates.get(
+                (self.subject_identifier, self.cleaned_data.get("drawn_date"))
+            )
+        return None
@@ -6,11 +6,20 @@ from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import INVALID_ERROR
 from edc_form_validators.form_validator import FormValidator
 
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
 
 class HtnInitialReviewFormValidator(
+    VisitContextFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up,
+    # and the clinical review baseline or clinical review, which must report an
+    # HTN diagnosis
+    query_budget = 2
+
     def clean(self):
         self.raise_if_clinical_review_does_not_exist()
         try:
@@ -36,8 +45,8 @@ class HtnInitialReviewFormValidator(
         self.m2m_other_specify(m2m_field="managed_by", field_other="managed_by_other")
 
     def raise_if_clinical_review_does_not_exist(self):
-        if clinical_review := raise_if_clinical_review_does_not_exist(
-            self.cleaned_data.get("subject_visit")
+        if clinical_review := self.visit_context.get_or_set(
+            CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist
         ):
             if clinical_review.htn_dx != YES:
                 self.raise_validation_error(
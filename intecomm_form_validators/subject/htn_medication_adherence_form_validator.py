@@ -10,6 +10,9 @@ class HtnMedicationAdherenceFormValidator(
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: none
+    query_budget = 0
+
     def clean(self):
         self.confirm_visual_scores_match()
 
@@ -2,8 +2,17 @@ from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
+
+class HtnReviewFormValidator(
+    VisitContextFormValidatorMixin, CrfFormValidatorMixin, FormValidator
+):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up,
+    # and the clinical review this form requires
+    query_budget = 2
 
-class HtnReviewFormValidator(CrfFormValidatorMixin, FormValidator):
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
         self.m2m_other_specify(m2m_field="managed_by", field_other="managed_by_other")
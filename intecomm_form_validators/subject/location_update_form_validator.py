@@ -4,22 +4,30 @@ from edc_dx_review.form_validator_mixins import ClinicalReviewFollowupFormValida
 from edc_form_validators import INVALID_ERROR, FormValidator
 from edc_visit_schedule.utils import raise_if_baseline
 
+from ..visit_context import APPT_TYPE, get_appt_type
+from .mixins import DiagnosesFormValidatorMixin, VisitContextFormValidatorMixin
+
 
 class LocationUpdateFormValidator(
+    VisitContextFormValidatorMixin,
+    DiagnosesFormValidatorMixin,
     ClinicalReviewFollowupFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: 1 for the appointment, to confirm this is not the
+    # baseline visit, 5 for the diagnoses (see DiagnosesFormValidatorMixin) and 1
+    # for the appointment type
+    query_budget = 7
+
     def clean(self):
         raise_if_baseline(self.cleaned_data.get("subject_visit"))
-        if self.related_visit.appointment.appt_type.name == COMMUNITY:
+        appt_type = self.visit_context.get_or_set(APPT_TYPE, get_appt_type)
+        if appt_type == COMMUNITY:
             self.raise_validation_error(
                 {"__all__": "This form is not required"}, error_code=INVALID_ERROR
             )
-        elif (
-            self.related_visit.appointment.appt_type.name == CLINIC
-            and self.cleaned_data.get("location", "") == COMMUNITY
-        ):
+        elif appt_type == CLINIC and self.cleaned_data.get("location", "") == COMMUNITY:
             self.raise_validation_error(
                 {"location": "Invalid. Appointment is not in the community"},
                 error_code=INVALID_ERROR,
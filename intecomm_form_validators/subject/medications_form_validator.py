@@ -1,16 +1,24 @@
 from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
 from edc_dx import get_diagnosis_labels
-from edc_dx.form_validators import DiagnosisFormValidatorMixin
 from edc_form_validators import FormValidator
 
+from .mixins import DiagnosesFormValidatorMixin, VisitContextFormValidatorMixin
+
 
 class MedicationsFormValidator(
-    DiagnosisFormValidatorMixin, CrfFormValidatorMixin, FormValidator
+    VisitContextFormValidatorMixin,
+    DiagnosesFormValidatorMixin,
+    CrfFormValidatorMixin,
+    FormValidator,
 ):
+    # max queries for `clean()`: the diagnoses (see DiagnosesFormValidatorMixin)
+    query_budget = 5
+
     def clean(self) -> None:
+        diagnoses = self.get_diagnoses()
         for dx, label in get_diagnosis_labels().items():
             self.applicable_if_diagnosed(
-                diagnoses=self.get_diagnoses(),
+                diagnoses=diagnoses,
                 prefix=dx,
                 field_applicable=f"refill_{dx}",
                 label=label,
@@ -1,10 +1,107 @@
+from __future__ import annotations
+
+from functools import cached_property
+
 from django import forms
 from edc_constants.constants import OTHER, YES
+from edc_dx import Diagnoses
+from edc_dx.diagnoses import (
+    ClinicalReviewBaselineRequired,
+    InitialReviewRequired,
+    MultipleInitialReviewsExist,
+)
+from edc_dx.form_validators import DiagnosisFormValidatorMixin
 from edc_form_validators import FormValidator
 from edc_visit_schedule.utils import is_baseline
 
+from ..visit_context import (
+    BASELINE,
+    DIAGNOSES,
+    VisitContext,
+    get_or_set_scoped,
+    get_visit_context,
+)
+
+
+class VisitContextFormValidatorMixin:
+    """Shares lookups on the subject visit with other validators
+    for the same visit. See `visit_context`.
+    """
+
+    _visit_context: VisitContext | None = None
+
+    @property
+    def visit_context(self) -> VisitContext:
+        if self._visit_context is None:
+            self._visit_context = get_visit_context(self.cleaned_data.get("subject_visit"))
+        return self._visit_context
+
+
+class CachedDiagnoses(Diagnoses):
+    """Diagnoses that looks up the clinical review baseline, the
+    clinical reviews and the initial reviews once.
+
+    edc_dx looks up the clinical review baseline and the clinical
+    reviews again for each condition in `get_dx()`.
+    """
+
+    @cached_property
+    def clinical_review_baseline(self):
+        return super().clinical_review_baseline
+
+    @cached_property
+    def clinical_reviews(self):
+        return list(super().clinical_reviews)
+
+    @cached_property
+    def initial_reviews(self):
+        return super().initial_reviews
+
+
+class DiagnosesFormValidatorMixin(DiagnosisFormValidatorMixin):
+    """Resolves diagnoses once per subject and report datetime.
+
+    Within a request, or a `visit_context_scope`, diagnoses are
+    shared by every validator for the subject and report datetime.
+    Otherwise, once per validator.
+
+    Costs at most 5 queries: the clinical review baseline, the
+    clinical reviews and an initial review for each diagnosed
+    condition.
+
+    Put before edc mixins that call `get_diagnoses()`, e.g.
+    `ClinicalReviewFollowupFormValidatorMixin`, so they use it.
+    """
+
+    _diagnoses = None
+
+    def get_diagnoses(self) -> CachedDiagnoses:
+        if self._diagnoses is None:
+            self._diagnoses = get_or_set_scoped(
+                (DIAGNOSES, self.subject_identifier, self.report_datetime),
+                self.make_diagnoses,
+            )
+        return self._diagnoses
+
+    def make_diagnoses(self) -> CachedDiagnoses:
+        """Returns diagnoses as edc_dx `get_diagnoses()` but with
+        CachedDiagnoses.
+        """
+        try:
+            diagnoses = CachedDiagnoses(
+                subject_identifier=self.subject_identifier,
+                report_datetime=self.report_datetime,
+            )
+        except ClinicalReviewBaselineRequired as e:
+            raise forms.ValidationError(e)
+        try:
+            diagnoses.get_initial_reviews()
+        except (InitialReviewRequired, MultipleInitialReviewsExist) as e:
+            raise forms.ValidationError(e)
+        return diagnoses
+
 
-class DrugRefillFormValidatorMixin(FormValidator):
+class DrugRefillFormValidatorMixin(VisitContextFormValidatorMixin, FormValidator):
     """For example:
     def clean(self):
         medications_exists_or_raise(self.cleaned_data.get("subject_visit"))
@@ -28,7 +125,7 @@ class DrugRefillFormValidatorMixin(FormValidator):
     def validate_modifications(self):
         if (
             self.cleaned_data.get("subject_visit")
-            and is_baseline(self.cleaned_data.get("subject_visit"))
+            and self.visit_context.get_or_set(BASELINE, is_baseline)
             and self.cleaned_data.get("rx_modified") == YES
         ):
             raise forms.ValidationError({"rx_modified": "Expected `No` at baseline."})
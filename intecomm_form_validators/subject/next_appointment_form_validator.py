@@ -2,9 +2,19 @@ from edc_appointment.form_validator_mixins import NextAppointmentCrfFormValidato
 from edc_crf.crf_form_validator import CrfFormValidator
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
+
+class NextAppointmentFormValidator(
+    VisitContextFormValidatorMixin, NextAppointmentCrfFormValidatorMixin, CrfFormValidator
+):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up, and the
+    # clinical review baseline or clinical review this form requires.
+    # The clinic day is checked against the health facility in `cleaned_data`
+    query_budget = 2
 
-class NextAppointmentFormValidator(NextAppointmentCrfFormValidatorMixin, CrfFormValidator):
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
         self.validate_date_is_on_clinic_day()
         super().clean()
@@ -3,18 +3,31 @@ from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 
+from ..rules import APPLICABLE_IF, REQUIRED_IF, Rule, RulesFormValidatorMixin
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
+
+class OtherBaselineDataFormValidator(
+    RulesFormValidatorMixin,
+    VisitContextFormValidatorMixin,
+    CrfFormValidatorMixin,
+    FormValidator,
+):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up,
+    # and the clinical review baseline this form requires
+    query_budget = 2
+
+    rules = (
+        Rule(REQUIRED_IF, (SMOKER,), "smoking_status", "smoker_duration"),
+        Rule(REQUIRED_IF, (FORMER_SMOKER,), "smoking_status", "smoker_quit_ago"),
+        Rule(APPLICABLE_IF, (YES,), "alcohol", "alcohol_consumption"),
+        Rule(REQUIRED_IF, (YES,), "activity_work", "activity_work_days_per_wk"),
+    )
 
-class OtherBaselineDataFormValidator(CrfFormValidatorMixin, FormValidator):
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
-        self.required_if(SMOKER, field="smoking_status", field_required="smoker_duration")
-        self.required_if(
-            FORMER_SMOKER, field="smoking_status", field_required="smoker_quit_ago"
-        )
-        self.applicable_if(YES, field="alcohol", field_applicable="alcohol_consumption")
-        self.required_if(
-            YES, field="activity_work", field_required="activity_work_days_per_wk"
-        )
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
+        self.apply_rules()
         self.validate_other_specify(
             field="employment_status", other_specify_field="employment_status_other"
         )
@@ -3,43 +3,46 @@ from edc_crf.crf_form_validator_mixins import CrfFormValidatorMixin
 from edc_dx_review.utils import raise_if_clinical_review_does_not_exist
 from edc_form_validators import FormValidator
 
+from ..rules import APPLICABLE_IF, REQUIRED_IF, Rule, RulesFormValidatorMixin
+from ..visit_context import CLINICAL_REVIEW
+from .mixins import VisitContextFormValidatorMixin
+
+RELATIONSHIPS = ("partner", "family", "friend", "coworker")
+IMPACT_FIELDS = ("severity", "status", "help", "referral")
+
+
+def get_impact_rules(prefix: str) -> tuple[Rule, ...]:
+    return tuple(
+        Rule(APPLICABLE_IF, (YES,), f"{prefix}_impact", f"{prefix}_impact_{name}")
+        for name in IMPACT_FIELDS
+    )
+
+
+class SocialHarmsFormValidator(
+    RulesFormValidatorMixin,
+    VisitContextFormValidatorMixin,
+    CrfFormValidatorMixin,
+    FormValidator,
+):
+    # max queries for `clean()`: the appointment, to tell baseline from follow-up,
+    # and the clinical review this form requires
+    query_budget = 2
+
+    rules = (
+        *(
+            Rule(APPLICABLE_IF, (YES,), prefix, f"{prefix}_disclosure")
+            for prefix in RELATIONSHIPS
+        ),
+        *(rule for prefix in RELATIONSHIPS for rule in get_impact_rules(prefix)),
+        *get_impact_rules("healthcare"),
+        Rule(REQUIRED_IF, (YES,), "other_service_impact", "other_service_impact_description"),
+        *get_impact_rules("other_service"),
+        *get_impact_rules("employment"),
+        *get_impact_rules("insurance"),
+        Rule(REQUIRED_IF, (YES,), "other_impact", "other_impact_description"),
+        *get_impact_rules("other"),
+    )
 
-class SocialHarmsFormValidator(CrfFormValidatorMixin, FormValidator):
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
-        for prefix in ["partner", "family", "friend", "coworker"]:
-            self.applicable_if(YES, field=f"{prefix}", field_applicable=f"{prefix}_disclosure")
-
-        for prefix in ["partner", "family", "friend", "coworker"]:
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_severity"
-            )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_status"
-            )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_help"
-            )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_referral"
-            )
-
-        for prefix in ["healthcare", "other_service", "employment", "insurance", "other"]:
-            if prefix in ["other_service", "other"]:
-                self.required_if(
-                    YES,
-                    field=f"{prefix}_impact",
-                    field_required=f"{prefix}_impact_description",
-                )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_severity"
-            )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_status"
-            )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_help"
-            )
-            self.applicable_if(
-                YES, field=f"{prefix}_impact", field_applicable=f"{prefix}_impact_referral"
-            )
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
+        self.apply_rules()
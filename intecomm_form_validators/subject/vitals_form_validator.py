@@ -7,14 +7,39 @@ from edc_vitals.form_validators import BloodPressureFormValidatorMixin
 
 from intecomm_form_validators.utils import is_end_of_study
 
+from ..rules import APPLICABLE_IF, REQUIRED_IF, Rule, RulesFormValidatorMixin
+from ..visit_context import BASELINE, CLINICAL_REVIEW, END_OF_STUDY
+from .mixins import VisitContextFormValidatorMixin
+
 
 class VitalsFormValidator(
+    RulesFormValidatorMixin,
+    VisitContextFormValidatorMixin,
     BloodPressureFormValidatorMixin,
     CrfFormValidatorMixin,
     FormValidator,
 ):
+    # max queries for `clean()`: the appointment, also used for the baseline and
+    # end of study weight and height checks, and the clinical review baseline or
+    # clinical review this form requires
+    query_budget = 2
+
+    rule_tables = {
+        "bp_one": (
+            Rule(REQUIRED_IF, (YES,), "bp_one_taken", "sys_blood_pressure_one"),
+            Rule(REQUIRED_IF, (YES,), "bp_one_taken", "dia_blood_pressure_one"),
+            Rule(REQUIRED_IF, (NO,), "bp_one_taken", "bp_one_not_taken_reason"),
+        ),
+        "bp_two": (
+            Rule(REQUIRED_IF, (YES,), "bp_two_taken", "sys_blood_pressure_two"),
+            Rule(REQUIRED_IF, (YES,), "bp_two_taken", "dia_blood_pressure_two"),
+            Rule(REQUIRED_IF, (NO,), "bp_two_taken", "bp_two_not_taken_reason"),
+            Rule(APPLICABLE_IF, (YES,), "bp_one_taken", "bp_two_taken"),
+        ),
+    }
+
     def clean(self):
-        raise_if_clinical_review_does_not_exist(self.cleaned_data.get("subject_visit"))
+        self.visit_context.get_or_set(CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist)
 
         self.weight_required_at_baseline_and_eos()
 
@@ -23,25 +48,20 @@ class VitalsFormValidator(
         )
 
         self.required_if_true(
-            is_baseline(self.cleaned_data.get("subject_visit")),
+            self.visit_context.get_or_set(BASELINE, is_baseline),
             field_required="height",
             inverse=False,
             required_msg="(at this timepoint)",
         )
 
-        self.required_if(YES, field="bp_one_taken", field_required="sys_blood_pressure_one")
-        self.required_if(YES, field="bp_one_taken", field_required="dia_blood_pressure_one")
-        self.required_if(NO, field="bp_one_taken", field_required="bp_one_not_taken_reason")
+        self.apply_rules("bp_one")
         self.raise_on_systolic_lt_diastolic_bp(
             sys_field="sys_blood_pressure_one",
             dia_field="dia_blood_pressure_one",
             **self.cleaned_data,
         )
 
-        self.required_if(YES, field="bp_two_taken", field_required="sys_blood_pressure_two")
-        self.required_if(YES, field="bp_two_taken", field_required="dia_blood_pressure_two")
-        self.required_if(NO, field="bp_two_taken", field_required="bp_two_not_taken_reason")
-        self.applicable_if(YES, field="bp_one_taken", field_applicable="bp_two_taken")
+        self.apply_rules("bp_two")
         self.raise_on_systolic_lt_diastolic_bp(
             sys_field="sys_blood_pressure_two",
             dia_field="dia_blood_pressure_two",
@@ -71,8 +91,8 @@ class VitalsFormValidator(
             self.cleaned_data.get("weight_determination")
             and self.cleaned_data.get("weight_determination") != MEASURED
             and (
-                is_baseline(self.cleaned_data.get("subject_visit"))
-                or is_end_of_study(self.cleaned_data.get("subject_visit"))
+                self.visit_context.get_or_set(BASELINE, is_baseline)
+                or self.visit_context.get_or_set(END_OF_STUDY, is_end_of_study)
             )
         ):
             self.raise_validation_error(
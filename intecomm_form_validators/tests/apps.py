@@ -0,0 +1,29 @@
+from django.apps import AppConfig as DjangoAppConfig
+
+
+class AppConfig(DjangoAppConfig):
+    """App for the test models, so that the test runner creates
+    their tables.
+    """
+
+    name = "intecomm_form_validators.tests"
+    label = "intecomm_form_validators_app"
+    verbose_name = "Intecomm Form Validators (tests)"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from edc_visit_schedule.exceptions import AlreadyRegisteredVisitSchedule
+        from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+        from ..patient_group_cache import connect_patient_log_signals
+        from ..subject.health_economics_form_validator import (
+            connect_drug_pay_sources_signals,
+        )
+        from .visit_schedule import visit_schedule
+
+        try:
+            site_visit_schedules.register(visit_schedule)
+        except AlreadyRegisteredVisitSchedule:
+            pass
+        connect_patient_log_signals(self.get_model("patientlog"))
+        connect_drug_pay_sources_signals(self.get_model("drugpaysources"))
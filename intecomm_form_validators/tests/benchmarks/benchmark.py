@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import os
+import statistics
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, NamedTuple
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# INTECOMM_BENCHMARK=1 also compares timings to the baseline and prints a report.
+# INTECOMM_BENCHMARK_UPDATE=1 rewrites the baseline from this run.
+BENCHMARK = bool(os.environ.get("INTECOMM_BENCHMARK"))
+BENCHMARK_UPDATE = bool(os.environ.get("INTECOMM_BENCHMARK_UPDATE"))
+BENCHMARK_TOLERANCE = float(os.environ.get("INTECOMM_BENCHMARK_TOLERANCE", 2.0))
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    queries: int
+
+    def as_baseline(self) -> dict:
+        return dict(median=round(self.median, 6), queries=self.queries)
+
+
+def run_benchmark(
+    name: str,
+    func: Callable[..., None],
+    rounds: int,
+    setup: Callable[[], Any] | None = None,
+) -> BenchmarkResult:
+    """Calls `func` once to count queries then `rounds` times to
+    time it, in seconds.
+
+    If `setup` is given it is called before each call to `func`, not
+    timed and not counted, and its return value passed to `func`.
+    """
+
+    def get_args() -> tuple:
+        return () if setup is None else (setup(),)
+
+    args = get_args()
+    with CaptureQueriesContext(connection) as context:
+        func(*args)
+    timings = []
+    for _ in range(rounds):
+        args = get_args()
+        start = perf_counter()
+        func(*args)
+        timings.append(perf_counter() - start)
+    return BenchmarkResult(
+        name,
+        rounds,
+        min(timings),
+        statistics.median(timings),
+        statistics.mean(timings),
+        len(context.captured_queries),
+    )
+
+
+def load_baseline() -> dict[str, dict]:
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text())
+    return {}
+
+
+def write_baseline(results: list[BenchmarkResult]) -> None:
+    baseline = load_baseline()
+    baseline.update({r.name: r.as_baseline() for r in results})
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def format_report(results: list[BenchmarkResult]) -> str:
+    lines = [
+        f"{'name':<50} {'min (us)':>10} {'median (us)':>12} "
+        f"{'mean (us)':>10} {'rounds':>7} {'queries':>8}"
+    ]
+    for r in sorted(results, key=lambda r: r.median):
+        lines.append(
+            f"{r.name:<50} {r.min * 1e6:>10.1f} {r.median * 1e6:>12.1f} "
+            f"{r.mean * 1e6:>10.1f} {r.rounds:>7} {r.queries:>8}"
+        )
+    return "\n".join(lines)
+
+
+class BenchmarkTestMixin:
+    """A TestCase mixin to benchmark a callable against the baseline.
+
+    The query count must not exceed the baseline. The median time is
+    compared only if INTECOMM_BENCHMARK is set since timings are only
+    comparable on the same machine.
+    """
+
+    rounds = 50
+    results: list[BenchmarkResult]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+        cls.baseline = load_baseline()
+
+    @classmethod
+    def tearDownClass(cls):
+        if BENCHMARK:
+            print(f"\n{format_report(cls.results)}")
+        if BENCHMARK_UPDATE:
+            write_baseline(cls.results)
+        super().tearDownClass()
+
+    def assert_benchmark(
+        self, name: str, func: Callable[..., None], setup: Callable[[], Any] | None = None
+    ) -> BenchmarkResult:
+        result = run_benchmark(name, func, self.rounds, setup=setup)
+        self.results.append(result)
+        if not BENCHMARK_UPDATE and (baseline := self.baseline.get(name)):
+            self.assertLessEqual(
+                result.queries,
+                baseline["queries"],
+                f"{name}: query count regressed. Baseline is {baseline['queries']}.",
+            )
+            if BENCHMARK:
+                self.assertLessEqual(
+                    result.median,
+                    baseline["median"] * BENCHMARK_TOLERANCE,
+                    f"{name}: median time regressed. Got {result.median * 1e6:.1f}us, "
+                    f"baseline is {baseline['median'] * 1e6:.1f}us.",
+                )
+        return result
@@ -0,0 +1,567 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Type
+
+from dateutil.relativedelta import relativedelta
+from django.contrib.sites.models import Site
+from edc_constants.constants import (
+    CLINIC,
+    COMPLETE,
+    DEAD,
+    DM,
+    FEMALE,
+    HIV,
+    MEASURED,
+    NO,
+    NOT_APPLICABLE,
+    SMOKER,
+    YES,
+)
+from edc_form_validators import FormValidator
+from edc_form_validators.tests.mixins import FormValidatorTestMixin
+from edc_utils import get_utcnow
+from edc_visit_schedule.constants import MONTH0, MONTH3
+
+from intecomm_form_validators.consent import SubjectConsentFormValidator
+from intecomm_form_validators.patient_group_cache import get_patient_group_cache
+from intecomm_form_validators.prn import EndOfStudyFormValidator
+from intecomm_form_validators.screening import (
+    ConsentRefusalFormValidator,
+    HealthFacilityFormValidator,
+    HealthTalkLogFormValidator,
+    PatientCallFormValidator,
+    PatientGroupFormValidator,
+    PatientGroupRandoFormValidator,
+    PatientLogFormValidator,
+    SubjectScreeningFormValidator,
+)
+from intecomm_form_validators.subject import (
+    ClinicalReviewBaselineFormValidator,
+    ComplicationsBaselineFormValidator,
+    ComplicationsFollowupFormValidators,
+    DmInitialReviewFormValidator,
+    DmMedicationAdherenceFormValidator,
+    DmReviewFormValidator,
+    DrugRefillDmFormValidator,
+    DrugRefillHivFormValidator,
+    DrugRefillHtnFormValidator,
+    HivInitialReviewFormValidator,
+    HivMedicationAdherenceFormValidator,
+    HivReviewFormValidator,
+    HtnInitialReviewFormValidator,
+    HtnMedicationAdherenceFormValidator,
+    HtnReviewFormValidator,
+    LocationUpdateFormValidator,
+    MedicationsFormValidator,
+    NextAppointmentFormValidator,
+    OtherBaselineDataFormValidator,
+    SocialHarmsFormValidator,
+    VitalsFormValidator,
+)
+from intecomm_form_validators.subject.clinical_review_form_validator import (
+    ClinicalReviewFormValidator,
+)
+from intecomm_form_validators.subject.health_economics_form_validator import (
+    HealthEconomicsFormValidator,
+    clear_drug_pay_sources_cache,
+)
+
+from ..models import (
+    Appointment,
+    AppointmentType,
+    ClinicalReview,
+    ClinicalReviewBaseline,
+    Conditions,
+    Crf,
+    DeathReport,
+    DrugPaySources,
+    HealthFacility,
+    HivInitialReview,
+    HivReview,
+    Medications,
+    OffSchedule,
+    OffstudyReasons,
+    OnSchedule,
+    PatientGroup,
+    PatientLog,
+    SubjectScreening,
+    SubjectVisit,
+)
+
+SUBJECT_IDENTIFIER = "101-101-9999-2"
+SCREENING_IDENTIFIER = "XYZ99999"
+
+
+class TestClinicalReviewBaselineFormValidator(
+    FormValidatorTestMixin, ClinicalReviewBaselineFormValidator
+):
+    pass
+
+
+class TestNextAppointmentFormValidator(FormValidatorTestMixin, NextAppointmentFormValidator):
+    pass
+
+
+class TestHealthEconomicsFormValidator(HealthEconomicsFormValidator):
+    drug_pay_sources_model = "intecomm_form_validators_app.drugpaysources"
+
+
+class TestEndOfStudyFormValidator(EndOfStudyFormValidator):
+    death_report_model = "intecomm_form_validators_app.deathreport"
+
+
+# form validator classes with the package the benchmark name is
+# prefixed with. Test subclasses only skip edc checks for models
+# that are not installed, e.g. the consent or the window period.
+FORM_VALIDATORS: tuple[tuple[str, Type[FormValidator]], ...] = (
+    ("consent", SubjectConsentFormValidator),
+    ("prn", TestEndOfStudyFormValidator),
+    ("screening", ConsentRefusalFormValidator),
+    ("screening", HealthFacilityFormValidator),
+    ("screening", HealthTalkLogFormValidator),
+    ("screening", PatientCallFormValidator),
+    ("screening", PatientGroupFormValidator),
+    ("screening", PatientGroupRandoFormValidator),
+    ("screening", PatientLogFormValidator),
+    ("screening", SubjectScreeningFormValidator),
+    ("subject", TestClinicalReviewBaselineFormValidator),
+    ("subject", ClinicalReviewFormValidator),
+    ("subject", ComplicationsBaselineFormValidator),
+    ("subject", ComplicationsFollowupFormValidators),
+    ("subject", DmInitialReviewFormValidator),
+    ("subject", DmMedicationAdherenceFormValidator),
+    ("subject", DmReviewFormValidator),
+    ("subject", DrugRefillDmFormValidator),
+    ("subject", DrugRefillHivFormValidator),
+    ("subject", DrugRefillHtnFormValidator),
+    ("subject", TestHealthEconomicsFormValidator),
+    ("subject", HivInitialReviewFormValidator),
+    ("subject", HivMedicationAdherenceFormValidator),
+    ("subject", HivReviewFormValidator),
+    ("subject", HtnInitialReviewFormValidator),
+    ("subject", HtnMedicationAdherenceFormValidator),
+    ("subject", HtnReviewFormValidator),
+    ("subject", LocationUpdateFormValidator),
+    ("subject", MedicationsFormValidator),
+    ("subject", TestNextAppointmentFormValidator),
+    ("subject", OtherBaselineDataFormValidator),
+    ("subject", SocialHarmsFormValidator),
+    ("subject", VitalsFormValidator),
+)
+
+
+def get_benchmark_name(package: str, form_validator_cls: Type[FormValidator]) -> str:
+    """Returns the name of the form validator's benchmark, e.g.
+    "subject.VitalsFormValidator". Test subclasses take the name of
+    the form validator they test.
+    """
+    form_validator_cls = next(
+        cls
+        for cls in form_validator_cls.__mro__
+        if cls.__module__.startswith("intecomm_form_validators.")
+        and not cls.__module__.startswith("intecomm_form_validators.tests.")
+    )
+    return f"{package}.{form_validator_cls.__name__}"
+
+
+def make_patient_group(size: int) -> PatientGroup:
+    """Returns a group of `size` stable, screened and consented
+    patients with a DM to HIV ratio within range.
+    """
+    dm = Conditions.objects.get_or_create(name=DM)[0]
+    hiv = Conditions.objects.get_or_create(name=HIV)[0]
+    hiv_count = round(size / 3.4)
+    patients = PatientLog.objects.bulk_create(
+        [
+            PatientLog(
+                name=f"PATIENT{i}",
+                stable=YES,
+                willing_to_screen=YES,
+                screening_identifier=f"XYZ{i:05d}",
+                subject_identifier=f"101-101-{i:04d}-2",
+            )
+            for i in range(size)
+        ]
+    )
+    PatientLog.conditions.through.objects.bulk_create(
+        [
+            PatientLog.conditions.through(
+                patientlog_id=patient.id, conditions_id=(hiv if i < hiv_count else dm).id
+            )
+            for i, patient in enumerate(patients)
+        ]
+    )
+    group = PatientGroup.objects.create(name="GROUP", status=COMPLETE)
+    group.patients.set(patients)
+    return group
+
+
+class FormValidatorFixturesMixin:
+    """A TestCase mixin that creates a screened and consented subject
+    with a baseline and a 3 month visit, the clinical reviews, an HIV
+    and a hypertension diagnosis and a death report, and returns a
+    form validator for each class in FORM_VALIDATORS with valid
+    cleaned data.
+
+    Each form validator gets its own subject visit instance, as on a
+    real request, so that lookups on the visit are not already cached.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = get_utcnow()
+        cls.baseline_datetime = now - relativedelta(months=3)
+        cls.followup_datetime = now
+        cls.site = Site.objects.get_or_create(id=110, defaults=dict(name="site110"))[0]
+        hiv = Conditions.objects.get_or_create(name=HIV)[0]
+        cls.subject_screening = SubjectScreening.objects.create(
+            screening_identifier=SCREENING_IDENTIFIER,
+            subject_identifier=SUBJECT_IDENTIFIER,
+            report_datetime=cls.baseline_datetime,
+            eligibility_datetime=cls.baseline_datetime,
+            age_in_years=25,
+            gender=FEMALE,
+            initials="EW",
+            hospital_identifier="12345",
+            site=cls.site,
+            hiv_dx=YES,
+            dm_dx=NO,
+            htn_dx=NO,
+        )
+        cls.patient_log = PatientLog.objects.create(
+            name="ERIK",
+            stable=YES,
+            willing_to_screen=YES,
+            screening_identifier=SCREENING_IDENTIFIER,
+            subject_identifier=SUBJECT_IDENTIFIER,
+        )
+        cls.patient_log.conditions.add(hiv)
+        cls.patient_group = make_patient_group(14)
+        appt_type = AppointmentType.objects.create(name=CLINIC)
+        cls.baseline_visit = cls.make_subject_visit(
+            MONTH0, Decimal("0.0"), cls.baseline_datetime, appt_type
+        )
+        cls.followup_visit = cls.make_subject_visit(
+            MONTH3, Decimal("1.0"), cls.followup_datetime, appt_type
+        )
+        ClinicalReviewBaseline.objects.create(
+            subject_visit=cls.baseline_visit,
+            report_datetime=cls.baseline_datetime,
+            hiv_dx=YES,
+            dm_dx=NO,
+            htn_dx=NO,
+        )
+        ClinicalReview.objects.create(
+            subject_visit=cls.followup_visit,
+            report_datetime=cls.followup_datetime,
+            htn_dx=YES,
+        )
+        HivInitialReview.objects.create(
+            subject_visit=cls.baseline_visit,
+            report_datetime=cls.baseline_datetime,
+            dx_date=cls.baseline_datetime.date() - relativedelta(years=1),
+        )
+        for subject_visit in [cls.baseline_visit, cls.followup_visit]:
+            Medications.objects.create(
+                subject_visit=subject_visit, report_datetime=subject_visit.report_datetime
+            )
+        DrugPaySources.objects.create(name="own_cash", display_name="Own cash")
+        OnSchedule.objects.create(subject_identifier=SUBJECT_IDENTIFIER)
+        OffSchedule.objects.create(subject_identifier=SUBJECT_IDENTIFIER)
+        DeathReport.objects.create(
+            subject_identifier=SUBJECT_IDENTIFIER, death_date=cls.followup_datetime.date()
+        )
+        cls.dead = OffstudyReasons.objects.create(name=DEAD)
+        cls.health_facility = HealthFacility.objects.create(
+            name="clinic", clinic_days=[0, 1, 2, 3, 4]
+        )
+
+    @staticmethod
+    def make_subject_visit(visit_code, timepoint, report_datetime, appt_type) -> SubjectVisit:
+        appointment = Appointment.objects.create(
+            subject_identifier=SUBJECT_IDENTIFIER,
+            visit_schedule_name="visit_schedule",
+            schedule_name="schedule",
+            visit_code=visit_code,
+            visit_code_sequence=0,
+            timepoint=timepoint,
+            appt_datetime=report_datetime,
+            appt_type=appt_type,
+        )
+        return SubjectVisit.objects.create(
+            appointment=appointment,
+            subject_identifier=SUBJECT_IDENTIFIER,
+            visit_schedule_name="visit_schedule",
+            schedule_name="schedule",
+            visit_code=visit_code,
+            visit_code_sequence=0,
+            report_datetime=report_datetime,
+        )
+
+    def setUp(self):
+        super().setUp()
+        get_patient_group_cache().clear()
+        self.addCleanup(get_patient_group_cache().clear)
+        clear_drug_pay_sources_cache(sender=DrugPaySources)
+        self.addCleanup(clear_drug_pay_sources_cache, sender=DrugPaySources)
+
+    def get_form_validator(self, form_validator_cls: Type[FormValidator]) -> FormValidator:
+        """Returns a form validator with valid cleaned data."""
+        name = get_benchmark_name("", form_validator_cls)[1:]
+        return form_validator_cls(**getattr(self, f"get_{name}_kwargs")())
+
+    def get_crf_kwargs(
+        self, subject_visit: SubjectVisit, model: Type = Crf, **cleaned_data
+    ) -> dict[str, Any]:
+        subject_visit = SubjectVisit.objects.get(id=subject_visit.id)
+        return dict(
+            cleaned_data=dict(
+                subject_visit=subject_visit,
+                report_datetime=subject_visit.report_datetime,
+                crf_status=COMPLETE,
+                **cleaned_data,
+            ),
+            instance=model(),
+            model=model,
+        )
+
+    def get_baseline_kwargs(self, model: Type = Crf, **cleaned_data) -> dict[str, Any]:
+        return self.get_crf_kwargs(self.baseline_visit, model=model, **cleaned_data)
+
+    def get_followup_kwargs(self, model: Type = Crf, **cleaned_data) -> dict[str, Any]:
+        return self.get_crf_kwargs(self.followup_visit, model=model, **cleaned_data)
+
+    # consent and prn
+
+    def get_SubjectConsentFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(
+            cleaned_data=dict(
+                screening_identifier=SCREENING_IDENTIFIER,
+                consent_datetime=self.baseline_datetime,
+                report_datetime=self.baseline_datetime,
+                dob=self.baseline_datetime.date() - relativedelta(years=25),
+                gender=FEMALE,
+                identity_type="hospital_no",
+            ),
+            instance=SubjectScreening(),
+            model=SubjectScreening,
+        )
+
+    def get_EndOfStudyFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(
+            cleaned_data=dict(
+                subject_identifier=SUBJECT_IDENTIFIER,
+                offstudy_datetime=self.followup_datetime,
+                last_seen_date=self.followup_datetime.date(),
+                offstudy_reason=self.dead,
+                termination_reason=self.dead,
+                death_date=self.followup_datetime.date(),
+            ),
+            instance=Crf(),
+            model=Crf,
+        )
+
+    # screening
+
+    def get_ConsentRefusalFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(cleaned_data=dict(reason="unwilling"))
+
+    def get_HealthFacilityFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(cleaned_data=dict(name="clinic"))
+
+    def get_HealthTalkLogFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(cleaned_data=dict(report_date=self.followup_datetime.date()))
+
+    def get_PatientCallFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(
+            cleaned_data=dict(
+                answered=YES, respondent="patient", survival_status=YES, catchment_area=YES
+            )
+        )
+
+    def get_PatientGroupFormValidator_kwargs(self) -> dict[str, Any]:
+        patient_group = PatientGroup.objects.get(id=self.patient_group.id)
+        return dict(
+            cleaned_data=dict(
+                name=patient_group.name,
+                status=patient_group.status,
+                randomize_now=NO,
+                patients=patient_group.patients.all(),
+            ),
+            instance=patient_group,
+            model=PatientGroup,
+        )
+
+    def get_PatientGroupRandoFormValidator_kwargs(self) -> dict[str, Any]:
+        patient_group = PatientGroup.objects.get(id=self.patient_group.id)
+        return dict(
+            cleaned_data=dict(name=patient_group.name, randomize_now=NO),
+            instance=patient_group,
+            model=PatientGroup,
+        )
+
+    def get_PatientLogFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(
+            cleaned_data=dict(
+                name="ERIK",
+                gender=FEMALE,
+                initials="EW",
+                hospital_identifier="12345",
+                site=self.site,
+                report_datetime=self.followup_datetime,
+                willing_to_screen=YES,
+                first_health_talk=NO,
+                second_health_talk=NO,
+            ),
+            instance=PatientLog.objects.get(id=self.patient_log.id),
+            model=PatientLog,
+        )
+
+    def get_SubjectScreeningFormValidator_kwargs(self) -> dict[str, Any]:
+        return dict(
+            cleaned_data=dict(
+                patient_log_identifier="PXYZ00001",
+                report_datetime=self.baseline_datetime,
+                consent_ability=YES,
+                gender=FEMALE,
+                in_care_6m=YES,
+                in_care_duration="5y",
+                hiv_dx=YES,
+                hiv_dx_6m=YES,
+                hiv_dx_ago="5y",
+                art_unchanged_3m=YES,
+                art_stable=YES,
+                art_adherent=YES,
+                dm_dx=NO,
+                htn_dx=NO,
+                pregnant=NO,
+                unsuitable_for_study=NO,
+                unsuitable_agreed=NOT_APPLICABLE,
+            ),
+            instance=SubjectScreening(),
+            model=SubjectScreening,
+        )
+
+    # subject
+
+    def get_ClinicalReviewBaselineFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_baseline_kwargs(
+            model=ClinicalReviewBaseline,
+            hiv_dx=YES,
+            hiv_dx_at_screening=YES,
+            dm_dx=NO,
+            dm_dx_at_screening=NO,
+            htn_dx=NO,
+            htn_dx_at_screening=NO,
+            protocol_incident=NO,
+        )
+
+    def get_ClinicalReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(
+            model=ClinicalReview, health_insurance=NO, patient_club=NO
+        )
+
+    def get_ComplicationsBaselineFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_baseline_kwargs()
+
+    def get_ComplicationsFollowupFormValidators_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(stroke=NO, heart_attack=NO, complications=NO)
+
+    def get_DmInitialReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_baseline_kwargs(dx_date=date(2020, 1, 1))
+
+    def get_DmMedicationAdherenceFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs()
+
+    def get_DmReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs()
+
+    def get_DrugRefillDmFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(rx_modified=NO)
+
+    def get_DrugRefillHivFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(rx_modified=NO)
+
+    def get_DrugRefillHtnFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(rx_modified=NO)
+
+    def get_HealthEconomicsFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(
+            education_in_years=0,
+            received_rx_month=YES,
+            rx_dm_month=NOT_APPLICABLE,
+            rx_htn_month=NOT_APPLICABLE,
+            rx_hiv_month=NOT_APPLICABLE,
+            rx_other_month=YES,
+            rx_other_paid_month=DrugPaySources.objects.filter(name="own_cash"),
+            rx_other_cost_month=100,
+            received_rx_today=NO,
+            health_insurance=NO,
+            patient_club=NO,
+        )
+
+    def get_HivInitialReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_baseline_kwargs(
+            dx_date=date(2020, 1, 1), receives_care=NO, rx_init=NOT_APPLICABLE
+        )
+
+    def get_HivMedicationAdherenceFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs()
+
+    def get_HivReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(
+            model=HivReview,
+            has_vl=YES,
+            drawn_date=self.followup_datetime.date(),
+            vl=50,
+            vl_quantifier="=",
+        )
+
+    def get_HtnInitialReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(dx_date=date(2020, 1, 1))
+
+    def get_HtnMedicationAdherenceFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs()
+
+    def get_HtnReviewFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs()
+
+    def get_LocationUpdateFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(location=CLINIC)
+
+    def get_MedicationsFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(
+            refill_hiv=YES, refill_dm=NOT_APPLICABLE, refill_htn=NOT_APPLICABLE
+        )
+
+    def get_NextAppointmentFormValidator_kwargs(self) -> dict[str, Any]:
+        appt_date = self.followup_datetime.date() + relativedelta(months=1)
+        appt_date -= relativedelta(days=appt_date.weekday())
+        return self.get_followup_kwargs(
+            health_facility=self.health_facility, appt_date=appt_date
+        )
+
+    def get_OtherBaselineDataFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_baseline_kwargs(
+            smoking_status=SMOKER, smoker_duration="5y", alcohol=NO, activity_work=NO
+        )
+
+    def get_SocialHarmsFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_followup_kwargs(partner=NO, family=NO)
+
+    def get_VitalsFormValidator_kwargs(self) -> dict[str, Any]:
+        return self.get_baseline_kwargs(
+            weight_determination=MEASURED,
+            weight=60.0,
+            height=182.88,
+            bp_one_taken=YES,
+            sys_blood_pressure_one=120,
+            dia_blood_pressure_one=80,
+            bp_two_taken=YES,
+            sys_blood_pressure_two=119,
+            dia_blood_pressure_two=79,
+            severe_htn=NO,
+        )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import Callable
+
+from django import forms
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edc_form_validators import FormValidator
+
+GROUP_SIZES = (10, 50, 200)
+
+
+def for_group_sizes(*sizes: int) -> Callable:
+    """Decorates a test method to run once per group size, as a
+    subTest, with the size as its only argument.
+
+    Defaults to GROUP_SIZES.
+    """
+    sizes = sizes or GROUP_SIZES
+
+    def decorator(test_method: Callable) -> Callable:
+        @wraps(test_method)
+        def wrapper(self):
+            for size in sizes:
+                with self.subTest(size=size):
+                    test_method(self, size)
+
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetTestMixin:
+    """A TestCase mixin to assert a form validator's `clean()` stays
+    within the `query_budget` declared on its class.
+    """
+
+    def assert_query_budget(
+        self, form_validator: FormValidator, budget: int | None = None
+    ) -> int:
+        """Validates and returns the number of queries.
+
+        A ValidationError is not an error here; only queries are
+        counted.
+        """
+        budget = type(form_validator).query_budget if budget is None else budget
+        with CaptureQueriesContext(connection) as context:
+            try:
+                form_validator.validate()
+            except forms.ValidationError:
+                pass
+        queries = len(context.captured_queries)
+        self.assertLessEqual(
+            queries,
+            budget,
+            f"{type(form_validator).__name__}: {queries} queries exceeds the budget of "
+            f"{budget}.\n" + "\n".join(q["sql"] for q in context.captured_queries),
+        )
+        return queries
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from django import forms
+from django.test import TestCase
+from edc_constants.constants import NO
+from edc_form_validators import FormValidator
+
+from intecomm_form_validators.patient_group_cache import get_patient_group_cache
+from intecomm_form_validators.screening import PatientGroupFormValidator
+from intecomm_form_validators.subject.health_economics_form_validator import (
+    clear_drug_pay_sources_cache,
+)
+
+from ..models import DrugPaySources, PatientGroup
+from .benchmark import BenchmarkTestMixin
+from .fixtures import (
+    FORM_VALIDATORS,
+    FormValidatorFixturesMixin,
+    get_benchmark_name,
+    make_patient_group,
+)
+
+
+def validate(form_validator: FormValidator) -> None:
+    try:
+        form_validator.validate()
+    except forms.ValidationError:
+        pass
+
+
+class FormValidatorBenchmarks(FormValidatorFixturesMixin, BenchmarkTestMixin, TestCase):
+    """Benchmarks `clean()` of each form validator against the test
+    models' tables.
+
+    The caches are cleared before each round, so every round times
+    a cold `clean()`.
+    """
+
+    rounds = 20
+
+    @staticmethod
+    def clear_caches() -> None:
+        get_patient_group_cache().clear()
+        clear_drug_pay_sources_cache(sender=DrugPaySources)
+
+    def get_cold_form_validator(self, form_validator_cls) -> FormValidator:
+        self.clear_caches()
+        return self.get_form_validator(form_validator_cls)
+
+    def test_form_validators(self):
+        for package, form_validator_cls in FORM_VALIDATORS:
+            name = get_benchmark_name(package, form_validator_cls)
+            with self.subTest(name):
+                self.assert_benchmark(
+                    name,
+                    validate,
+                    setup=lambda cls=form_validator_cls: self.get_cold_form_validator(cls),
+                )
+
+    def test_patient_group_complete(self):
+        for size in [14, 50, 100]:
+            with self.subTest(size=size):
+                group_id = make_patient_group(size).id
+
+                def get_form_validator() -> PatientGroupFormValidator:
+                    self.clear_caches()
+                    group = PatientGroup.objects.get(id=group_id)
+                    return PatientGroupFormValidator(
+                        cleaned_data=dict(
+                            name=group.name,
+                            status=group.status,
+                            randomize_now=NO,
+                            patients=group.patients.all(),
+                        ),
+                        instance=group,
+                        model=PatientGroup,
+                    )
+
+                self.assert_benchmark(
+                    f"screening.PatientGroupFormValidator.complete.{size}",
+                    validate,
+                    setup=get_form_validator,
+                )
+
+    def test_baseline_has_every_form_validator(self):
+        for package, form_validator_cls in FORM_VALIDATORS:
+            name = get_benchmark_name(package, form_validator_cls)
+            with self.subTest(name):
+                self.assertIn(name, self.baseline)
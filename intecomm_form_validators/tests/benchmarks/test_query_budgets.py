@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import inspect
+import pkgutil
+from importlib import import_module
+
+from django import forms
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from edc_constants.constants import COMPLETE, FEMALE, NO, YES
+from edc_form_validators import FormValidator
+
+import intecomm_form_validators
+from intecomm_form_validators.patient_group_cache import get_patient_group_cache
+from intecomm_form_validators.screening import (
+    PatientGroupFormValidator,
+    PatientLogBatchValidator,
+)
+
+from ..models import PatientGroup, PatientLog
+from .fixtures import (
+    FORM_VALIDATORS,
+    FormValidatorFixturesMixin,
+    get_benchmark_name,
+    make_patient_group,
+)
+from .query_budget import GROUP_SIZES, QueryBudgetTestMixin, for_group_sizes
+
+
+class PatientGroupQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        get_patient_group_cache().clear()
+        self.addCleanup(get_patient_group_cache().clear)
+
+    def get_form_validator(self, group: PatientGroup) -> PatientGroupFormValidator:
+        return PatientGroupFormValidator(
+            cleaned_data=dict(
+                name=group.name,
+                status=COMPLETE,
+                randomize_now=NO,
+                patients=group.patients.all(),
+            ),
+            instance=group,
+            model=PatientGroup,
+        )
+
+    @for_group_sizes(*GROUP_SIZES)
+    def test_complete(self, size):
+        self.assert_query_budget(self.get_form_validator(make_patient_group(size)))
+
+    @for_group_sizes(*GROUP_SIZES)
+    def test_complete_independent_of_group_size(self, size):
+        self.assertEqual(
+            self.assert_query_budget(self.get_form_validator(make_patient_group(size))),
+            PatientGroupFormValidator.query_budget,
+        )
+
+
+class FormValidatorQueryBudgetTests(
+    FormValidatorFixturesMixin, QueryBudgetTestMixin, TestCase
+):
+    def test_form_validators(self):
+        for package, form_validator_cls in FORM_VALIDATORS:
+            name = get_benchmark_name(package, form_validator_cls)
+            with self.subTest(name):
+                try:
+                    self.get_form_validator(form_validator_cls).validate()
+                except forms.ValidationError as e:
+                    self.fail(f"{name}: ValidationError unexpectedly raised. Got {e}")
+                self.assert_query_budget(self.get_form_validator(form_validator_cls))
+
+    def test_every_form_validator_has_a_budget(self):
+        tested = [
+            cls
+            for _, form_validator_cls in FORM_VALIDATORS
+            for cls in form_validator_cls.__mro__
+        ]
+        for package in ["consent", "prn", "screening", "subject"]:
+            path = import_module(f"{intecomm_form_validators.__name__}.{package}").__path__
+            for module_info in pkgutil.iter_modules(path):
+                module = import_module(
+                    f"{intecomm_form_validators.__name__}.{package}.{module_info.name}"
+                )
+                for _, cls in inspect.getmembers(module, inspect.isclass):
+                    if (
+                        cls.__module__ == module.__name__
+                        and issubclass(cls, FormValidator)
+                        and not cls.__name__.endswith("Mixin")
+                    ):
+                        with self.subTest(cls.__name__):
+                            self.assertTrue(
+                                "query_budget" in vars(cls), f"{cls.__name__} has no budget"
+                            )
+                            self.assertIn(cls, tested)
+
+
+class PatientLogBatchValidatorQueryBudgetTests(TestCase):
+    # queries per chunk: the patient logs, the randomized groups and
+    # the subject screenings
+    query_budget = 3
+
+    def test_validate(self):
+        patient_logs = make_patient_group(14).patients.all()
+        rows = [
+            dict(
+                id=obj.id,
+                name=obj.name,
+                gender=FEMALE,
+                initials="EW",
+                hospital_identifier=f"{obj.id:05d}",
+                willing_to_screen=YES,
+            )
+            for obj in patient_logs
+        ]
+        batch_validator = PatientLogBatchValidator(model_cls=PatientLog, chunk_size=5)
+        with CaptureQueriesContext(connection) as context:
+            errors = list(batch_validator.validate(rows))
+        self.assertEqual(errors, [{}] * len(rows))
+        self.assertLessEqual(len(context.captured_queries), self.query_budget * 3)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from django.test import TestCase, override_settings
+from django_mock_queries.query import MockSet
+from edc_constants.constants import DM
+
+from intecomm_form_validators.patient_group_cache import (
+    PatientGroupCache,
+    get_patient_group_cache,
+    get_patient_group_cache_key,
+)
+from intecomm_form_validators.utils import PatientGroupSnapshot
+
+from ..models import Conditions, PatientLog
+from ..test_case_mixin import TestCaseMixin
+
+
+class PatientGroupCacheTests(TestCaseMixin):
+    def get_patients(self) -> list:
+        patients = self.get_mock_patients(dm=2, hiv=1)
+        now = datetime(2023, 1, 1)
+        for index, patient in enumerate(patients):
+            patient.pk = index + 1
+            patient.modified = now + timedelta(minutes=index)
+        return patients
+
+    def test_lru_eviction(self):
+        cache = PatientGroupCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_get_or_set(self):
+        cache = PatientGroupCache()
+        calls = []
+        for _ in range(2):
+            value = cache.get_or_set("key", lambda: calls.append(1) or [])
+            self.assertEqual(value, [])
+        self.assertEqual(len(calls), 1)
+        cache.get_or_set(None, lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_django_cache_backend(self):
+        PatientGroupCache(cache_alias="default").set("key", [1, 2])
+        self.assertEqual(PatientGroupCache(cache_alias="default").get("key"), [1, 2])
+
+    def test_thread_safe_under_eviction(self):
+        cache = PatientGroupCache(maxsize=2)
+
+        def get_or_set(index: int) -> int:
+            key = str(index % 5)
+            return cache.get_or_set(key, lambda: key)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(get_or_set, range(5000)))
+        self.assertEqual(results, [str(index % 5) for index in range(5000)])
+        self.assertEqual(len(cache), 2)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_invalidate_django_cache_backend(self):
+        cache = PatientGroupCache(cache_alias="default")
+        other_process_cache = PatientGroupCache(cache_alias="default")
+        cache.get_or_set("key", lambda: [1])
+        self.assertEqual(other_process_cache.get_or_set("key", lambda: [2]), [1])
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(other_process_cache.get_or_set("key", lambda: [2]), [2])
+
+    def test_cache_key(self):
+        patients = self.get_patients()
+        key = get_patient_group_cache_key(1, MockSet(*patients), False)
+        self.assertIsNotNone(key)
+        self.assertEqual(
+            key,
+            get_patient_group_cache_key(1, PatientGroupSnapshot(MockSet(*patients)), False),
+        )
+        self.assertEqual(
+            key, get_patient_group_cache_key(1, MockSet(*reversed(patients)), False)
+        )
+        self.assertNotEqual(key, get_patient_group_cache_key(2, MockSet(*patients), False))
+        self.assertNotEqual(key, get_patient_group_cache_key(1, MockSet(*patients), True))
+        patients[0].modified = patients[-1].modified + timedelta(minutes=1)
+        self.assertNotEqual(key, get_patient_group_cache_key(1, MockSet(*patients), False))
+
+    def test_cache_key_includes_group_settings(self):
+        patients = self.get_patients()
+        key = get_patient_group_cache_key(1, MockSet(*patients), False)
+        for setting, value in [
+            ("INTECOMM_MIN_GROUP_SIZE", 10),
+            ("INTECOMM_MIN_GROUP_SIZE_FOR_RATIO", 5),
+            ("INTECOMM_GROUP_RATIO_RANGE", ("1.0", "2.0")),
+            ("EDC_PROTOCOL_NUMBER", "999"),
+        ]:
+            with self.subTest(setting=setting):
+                with override_settings(**{setting: value}):
+                    self.assertNotEqual(
+                        key, get_patient_group_cache_key(1, MockSet(*patients), False)
+                    )
+                self.assertEqual(
+                    key, get_patient_group_cache_key(1, MockSet(*patients), False)
+                )
+
+    def test_cache_key_none_if_unsaved(self):
+        patients = self.get_patients()
+        self.assertIsNone(get_patient_group_cache_key(None, MockSet(*patients)))
+        patients[0].pk = None
+        self.assertIsNone(get_patient_group_cache_key(1, MockSet(*patients)))
+
+
+class PatientGroupCacheInvalidationTests(TestCase):
+    def setUp(self):
+        self.cache = get_patient_group_cache()
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+        self.patient_log = PatientLog.objects.create(name="ERIK")
+
+    def test_invalidated_on_patient_log_save(self):
+        self.cache.set("key", [])
+        self.patient_log.save()
+        self.assertNotIn("key", self.cache)
+
+    def test_invalidated_on_patient_log_conditions_change(self):
+        dm = Conditions.objects.create(name=DM)
+        self.cache.set("key", [])
+        self.patient_log.conditions.add(dm)
+        self.assertNotIn("key", self.cache)
+        self.cache.set("key", [])
+        self.patient_log.conditions.clear()
+        self.assertNotIn("key", self.cache)
+
+    def test_not_invalidated_on_other_model_save(self):
+        self.cache.set("key", [])
+        Conditions.objects.create(name=DM)
+        self.assertIn("key", self.cache)
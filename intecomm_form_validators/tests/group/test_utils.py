@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from fractions import Fraction
+from unittest.mock import patch
+
+from django_mock_queries.query import MockSet
+from edc_constants.constants import DM, HIV, HTN, YES
+
+from intecomm_form_validators.constants import HIV_NCD, HIV_ONLY, NCD_ONLY
+from intecomm_form_validators.utils import (
+    GroupCompositionTracker,
+    PatientGroupMakeupError,
+    PatientGroupRatioError,
+    PatientGroupSnapshot,
+    PatientNotStableError,
+    confirm_patient_group_minimum_of_each_condition_or_raise,
+    confirm_patients_stable_and_screened_and_consented_or_raise,
+    get_condition_profile,
+    get_condition_profile_counts,
+    get_group_ratio_range,
+    get_patient_group_snapshot,
+    get_patient_groups_readiness,
+    get_patients_with_conditions,
+    get_ratio,
+    get_screening_identifier_regex,
+    get_subject_identifier_regex,
+    is_ratio_outofrange,
+    match_identifiers,
+    verify_patient_group_ratio_raise,
+)
+
+from ..mock_models import PatientGroupMockModel, PatientLogMockModel
+from ..test_case_mixin import TestCaseMixin
+
+
+class PatientGroupUtilsTests(TestCaseMixin):
+    def test_condition_profile(self):
+        self.assertEqual(get_condition_profile([HIV]), HIV_ONLY)
+        self.assertEqual(get_condition_profile([DM]), NCD_ONLY)
+        self.assertEqual(get_condition_profile([DM, HTN]), NCD_ONLY)
+        self.assertEqual(get_condition_profile([HIV, HTN]), HIV_NCD)
+        self.assertIsNone(get_condition_profile([]))
+
+    def test_patients_with_conditions(self):
+        patients = self.get_mock_patients(dm=2, htn=1, hiv=1, hiv_ncd=1)
+        conditions = [c for _, c in get_patients_with_conditions(MockSet(*patients))]
+        self.assertEqual(
+            conditions,
+            [
+                frozenset([DM]),
+                frozenset([DM]),
+                frozenset([HTN]),
+                frozenset([HIV]),
+                frozenset([HIV, DM, HTN]),
+            ],
+        )
+
+    def test_ratio_counts_single_condition_patients_only(self):
+        patients = self.get_mock_patients(dm=5, htn=5, hiv=4, ncd=2, hiv_ncd=2)
+        self.assertEqual(
+            verify_patient_group_ratio_raise(MockSet(*patients)),
+            (10, 4, Decimal("2.50"), False),
+        )
+
+    def test_ratio_out_of_range(self):
+        patients = self.get_mock_patients(dm=10, hiv=6)
+        self.assertRaises(
+            PatientGroupRatioError, verify_patient_group_ratio_raise, MockSet(*patients)
+        )
+        ncd, hiv, ratio, outofrange = verify_patient_group_ratio_raise(
+            MockSet(*patients), raise_on_outofrange=False
+        )
+        self.assertEqual((ncd, hiv), (10, 6))
+        self.assertTrue(outofrange)
+
+    def test_patient_group_snapshot(self):
+        patients = self.get_mock_patients(dm=2, hiv=1, stable=YES, screen=True, consent=True)
+        snapshot = PatientGroupSnapshot(MockSet(*patients))
+        self.assertEqual(snapshot.count(), 3)
+        self.assertEqual(
+            [p.conditions for p in snapshot],
+            [frozenset([DM]), frozenset([DM]), frozenset([HIV])],
+        )
+        self.assertEqual(
+            [p.screening_identifier for p in snapshot],
+            [p.screening_identifier for p in patients],
+        )
+        self.assertIs(get_patient_group_snapshot(snapshot), snapshot)
+
+    def test_match_identifiers(self):
+        self.assertEqual(
+            match_identifiers(
+                get_screening_identifier_regex(), ["XYZ00100", "xyz00100", "XYZ001", None]
+            ),
+            [True, False, False, False],
+        )
+
+    def test_subject_identifier_regex_recompiled_on_settings_change(self):
+        regex = get_subject_identifier_regex()
+        self.assertIs(get_subject_identifier_regex(), regex)
+        with self.settings(EDC_PROTOCOL_SUBJECT_IDENTIFIER_PATTERN=r"^999\-\d+$"):
+            self.assertEqual(
+                match_identifiers(get_subject_identifier_regex(), ["999-1234", "101-1234"]),
+                [True, False],
+            )
+        self.assertEqual(get_subject_identifier_regex().pattern, regex.pattern)
+
+    def test_patient_log_link_only_built_on_failure(self):
+        patients = self.get_mock_patients(dm=2, hiv=1, stable=YES, screen=True, consent=True)
+        with patch.object(PatientLogMockModel, "get_changelist_url") as mock_url:
+            confirm_patients_stable_and_screened_and_consented_or_raise(MockSet(*patients))
+            mock_url.assert_not_called()
+            patients[1].stable = None
+            with self.assertRaises(PatientNotStableError):
+                confirm_patients_stable_and_screened_and_consented_or_raise(MockSet(*patients))
+            mock_url.assert_called_once()
+
+    def test_condition_profile_counts(self):
+        patients = self.get_mock_patients(dm=2, htn=1, hiv=3, ncd=1, hiv_ncd=2)
+        expected = {HIV_ONLY: 3, NCD_ONLY: 4, HIV_NCD: 2}
+        self.assertEqual(get_condition_profile_counts(MockSet(*patients)), expected)
+        self.assertEqual(
+            get_condition_profile_counts(PatientGroupSnapshot(MockSet(*patients))), expected
+        )
+
+    def test_makeup_does_not_count_hiv_ncd_patients(self):
+        patients = self.get_mock_patients(dm=4, hiv=1, hiv_ncd=3)
+        with self.assertRaises(PatientGroupMakeupError) as cm:
+            confirm_patient_group_minimum_of_each_condition_or_raise(MockSet(*patients))
+        self.assertIn("at least 2 HIV only patients. Got 1", str(cm.exception))
+        patients = self.get_mock_patients(dm=2, hiv=2, hiv_ncd=3)
+        with self.assertRaises(PatientGroupMakeupError) as cm:
+            confirm_patient_group_minimum_of_each_condition_or_raise(MockSet(*patients))
+        self.assertIn("at least 4 NCD only patients. Got 2", str(cm.exception))
+
+    def test_patient_groups_readiness(self):
+        opts = dict(stable=YES, screen=True, consent=True)
+        groups = MockSet(
+            PatientGroupMockModel(
+                name="READY", patients=MockSet(*self.get_mock_patients(dm=10, hiv=4, **opts))
+            ),
+            PatientGroupMockModel(
+                name="RATIO", patients=MockSet(*self.get_mock_patients(dm=10, hiv=6, **opts))
+            ),
+            PatientGroupMockModel(
+                name="SMALL", patients=MockSet(*self.get_mock_patients(dm=4, hiv=2, **opts))
+            ),
+        )
+        reports = {str(r.group): r for r in get_patient_groups_readiness(groups)}
+        self.assertTrue(reports["READY"].ready)
+        self.assertEqual(
+            (reports["READY"].size, reports["READY"].ncd, reports["READY"].hiv), (14, 10, 4)
+        )
+        self.assertFalse(reports["RATIO"].ready)
+        self.assertIsInstance(reports["RATIO"].errors[0], PatientGroupRatioError)
+        self.assertFalse(reports["SMALL"].ready)
+        self.assertIn("at least 14 patients", str(reports["SMALL"].errors[0]))
+
+    def test_group_composition_tracker(self):
+        patients = self.get_mock_patients(dm=9, hiv=4, hiv_ncd=1)
+        tracker = GroupCompositionTracker(MockSet(*patients))
+        self.assertEqual(tracker.size, 14)
+        self.assertEqual(tracker.counts, {HIV_ONLY: 4, NCD_ONLY: 9, HIV_NCD: 1})
+        self.assertEqual(
+            tracker.ratio_result, verify_patient_group_ratio_raise(MockSet(*patients))
+        )
+        tracker.add([DM])
+        tracker.add([DM, HTN])
+        self.assertEqual(tracker.ratio_result, (10, 4, Decimal("2.50"), False))
+        tracker.remove([HIV])
+        tracker.remove([HIV])
+        self.assertEqual(tracker.ratio_result, (10, 2, Decimal("5.00"), True))
+        self.assertEqual(tracker.counts, {HIV_ONLY: 2, NCD_ONLY: 11, HIV_NCD: 1})
+        self.assertEqual(tracker.size, 14)
+
+    def test_ratio_range_is_exact(self):
+        self.assertEqual(get_group_ratio_range(), (Fraction(2), Fraction(14, 5)))
+        self.assertFalse(is_ratio_outofrange(10, 5))
+        self.assertFalse(is_ratio_outofrange(14, 5))
+        self.assertTrue(is_ratio_outofrange(141, 50))
+        self.assertTrue(is_ratio_outofrange(199, 100))
+        self.assertTrue(is_ratio_outofrange(10, 0))
+        self.assertTrue(is_ratio_outofrange(0, 10))
+        self.assertEqual(get_ratio(10, 3), Decimal("3.33"))
+        self.assertEqual(get_ratio(5, 2), Decimal("2.50"))
+        self.assertEqual(get_ratio(0, 2), Decimal("0.00"))
+
+    def test_ratio_range_from_settings(self):
+        with self.settings(INTECOMM_GROUP_RATIO_RANGE=("1.5", "3.0")):
+            self.assertFalse(is_ratio_outofrange(3, 1))
+            self.assertFalse(is_ratio_outofrange(3, 2))
+            patients = self.get_mock_patients(dm=9, hiv=3)
+            self.assertEqual(
+                verify_patient_group_ratio_raise(MockSet(*patients)),
+                (9, 3, Decimal("3.00"), False),
+            )
+        self.assertTrue(is_ratio_outofrange(3, 1))
@@ -0,0 +1,174 @@
+from django.contrib.sites.models import Site
+from django.db import models
+from edc_constants.choices import GENDER
+
+# Minimal concrete models for tests that count queries against a real
+# database. Tables are created by the test runner for the tests app;
+# see `tests/apps.py` and `test_settings.py`.
+
+
+class Conditions(models.Model):
+    name = models.CharField(max_length=25, unique=True)
+
+
+class PatientLog(models.Model):
+    name = models.CharField(max_length=25)
+    stable = models.CharField(max_length=15, null=True)
+    willing_to_screen = models.CharField(max_length=15, null=True)
+    screening_identifier = models.CharField(max_length=50, null=True)
+    subject_identifier = models.CharField(max_length=50, null=True)
+    conditions = models.ManyToManyField(Conditions)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    def get_changelist_url(self, search_term=None) -> str:
+        return "changelist_url"
+
+
+class PatientGroup(models.Model):
+    name = models.CharField(max_length=25)
+    status = models.CharField(max_length=25, null=True)
+    randomized = models.BooleanField(default=False)
+    patients = models.ManyToManyField(PatientLog)
+    bypass_group_size_min = models.BooleanField(default=False)
+    bypass_group_ratio = models.BooleanField(default=False)
+    modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
+
+    def get_changelist_url(self, search_term=None) -> str:
+        return "changelist_url"
+
+
+class DrugPaySources(models.Model):
+    name = models.CharField(max_length=25, unique=True)
+    display_name = models.CharField(max_length=25)
+
+
+class SubjectScreening(models.Model):
+    screening_identifier = models.CharField(max_length=50, unique=True)
+    subject_identifier = models.CharField(max_length=50, null=True)
+    report_datetime = models.DateTimeField(null=True)
+    eligibility_datetime = models.DateTimeField(null=True)
+    age_in_years = models.IntegerField(null=True)
+    gender = models.CharField(max_length=10, choices=GENDER)
+    initials = models.CharField(max_length=3)
+    hospital_identifier = models.CharField(max_length=25)
+    site = models.ForeignKey(Site, on_delete=models.PROTECT)
+    hiv_dx = models.CharField(max_length=15, null=True)
+    dm_dx = models.CharField(max_length=15, null=True)
+    htn_dx = models.CharField(max_length=15, null=True)
+
+
+class AppointmentType(models.Model):
+    name = models.CharField(max_length=25, unique=True)
+
+
+class Appointment(models.Model):
+    subject_identifier = models.CharField(max_length=50)
+    visit_schedule_name = models.CharField(max_length=25)
+    schedule_name = models.CharField(max_length=25)
+    visit_code = models.CharField(max_length=25)
+    visit_code_sequence = models.IntegerField(default=0)
+    timepoint = models.DecimalField(max_digits=6, decimal_places=1)
+    appt_datetime = models.DateTimeField()
+    appt_type = models.ForeignKey(AppointmentType, on_delete=models.PROTECT, null=True)
+
+
+class SubjectVisit(models.Model):
+    appointment = models.OneToOneField(Appointment, on_delete=models.PROTECT)
+    subject_identifier = models.CharField(max_length=50)
+    visit_schedule_name = models.CharField(max_length=25)
+    schedule_name = models.CharField(max_length=25)
+    visit_code = models.CharField(max_length=25)
+    visit_code_sequence = models.IntegerField(default=0)
+    report_datetime = models.DateTimeField()
+
+
+class CrfModel(models.Model):
+    subject_visit = models.ForeignKey(SubjectVisit, on_delete=models.PROTECT)
+    report_datetime = models.DateTimeField()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def related_visit_model_attr(cls) -> str:
+        return "subject_visit"
+
+    @property
+    def related_visit(self) -> SubjectVisit:
+        return self.subject_visit
+
+
+class Crf(CrfModel):
+    """A CRF for validators that only need the subject visit."""
+
+
+class ClinicalReviewBaseline(CrfModel):
+    hiv_dx = models.CharField(max_length=15, null=True)
+    dm_dx = models.CharField(max_length=15, null=True)
+    htn_dx = models.CharField(max_length=15, null=True)
+
+
+class ClinicalReview(CrfModel):
+    hiv_dx = models.CharField(max_length=15, null=True)
+    dm_dx = models.CharField(max_length=15, null=True)
+    htn_dx = models.CharField(max_length=15, null=True)
+
+
+class InitialReviewModel(CrfModel):
+    dx_date = models.DateField(null=True)
+
+    class Meta:
+        abstract = True
+
+    def get_best_dx_date(self):
+        return self.dx_date
+
+
+class HivInitialReview(InitialReviewModel):
+    pass
+
+
+class DmInitialReview(InitialReviewModel):
+    pass
+
+
+class HtnInitialReview(InitialReviewModel):
+    pass
+
+
+class Medications(CrfModel):
+    pass
+
+
+class HivReview(CrfModel):
+    drawn_date = models.DateField(null=True)
+    has_vl = models.CharField(max_length=15, null=True)
+
+
+class OnSchedule(models.Model):
+    subject_identifier = models.CharField(max_length=50)
+
+
+class OffSchedule(models.Model):
+    subject_identifier = models.CharField(max_length=50)
+
+
+class OffstudyReasons(models.Model):
+    name = models.CharField(max_length=25, unique=True)
+
+
+class DeathReport(models.Model):
+    subject_identifier = models.CharField(max_length=50)
+    death_date = models.DateField()
+    death_date_field = "death_date"
+
+
+class HealthFacility(models.Model):
+    name = models.CharField(max_length=25)
+    clinic_days = models.JSONField(default=list)
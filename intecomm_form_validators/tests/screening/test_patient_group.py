@@ -5,6 +5,10 @@ from django_mock_queries.query import MockSet
 from edc_constants.constants import COMPLETE, NO, YES
 
 from intecomm_form_validators.screening import PatientGroupFormValidator as Base
+from intecomm_form_validators.screening.patient_group_form_validator import (
+    INVALID_CONDITION_RATIO,
+    INVALID_PATIENT,
+)
 
 from ..mock_models import PatientGroupMockModel, ScreeningRefusalReasonsMockModel
 from ..test_case_mixin import TestCaseMixin
@@ -355,3 +359,70 @@ class PatientGroupTests(TestCaseMixin):
             "Patient reported as unwilling to screen. ",
             "|".join(cm.exception.messages),
         )
+
+    def test_report_all_errors(self):
+        patients = self.get_mock_patients(
+            dm=10, htn=0, hiv=6, stable=YES, screen=True, consent=True
+        )
+        patients[1].stable = NO
+        patients[5].stable = NO
+        patients[7].willing_to_screen = NO
+        patient_group = PatientGroupMockModel(randomized=False, patients=MockSet(*patients))
+        form_validator = self.get_form_validator_cls()(
+            cleaned_data={
+                "status": COMPLETE,
+                "randomize_now": NO,
+                "patients": MockSet(*patients),
+            },
+            instance=patient_group,
+            model=PatientGroupMockModel,
+            report_all_errors=True,
+        )
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.validate()
+        messages = cm.exception.messages
+        self.assertEqual(len(messages), 4)
+        self.assertEqual(
+            len([m for m in messages if "Patient is not known to be stable" in m]), 2
+        )
+        self.assertIn("Patient reported as unwilling to screen", "|".join(messages))
+        self.assertIn("Ratio NDC:HIV not met", "|".join(messages))
+        self.assertEqual(
+            [code for code, _ in form_validator.get_patient_group_errors()],
+            [INVALID_PATIENT, INVALID_PATIENT, INVALID_PATIENT, INVALID_CONDITION_RATIO],
+        )
+
+    def test_first_error_only_unless_report_all_errors(self):
+        patients = self.get_mock_patients(
+            dm=10, htn=0, hiv=6, stable=YES, screen=True, consent=True
+        )
+        patients[1].stable = NO
+        patients[7].willing_to_screen = NO
+        patient_group = PatientGroupMockModel(randomized=False, patients=MockSet(*patients))
+        form_validator = self.get_form_validator_cls()(
+            cleaned_data={
+                "status": COMPLETE,
+                "randomize_now": NO,
+                "patients": MockSet(*patients),
+            },
+            instance=patient_group,
+            model=PatientGroupMockModel,
+            report_all_errors=False,
+        )
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.validate()
+        self.assertEqual(len(cm.exception.messages), 1)
+        self.assertIn("Patient is not known to be stable", cm.exception.messages[0])
+        self.assertEqual(
+            [code for code, _ in form_validator.get_patient_group_errors()], [INVALID_PATIENT]
+        )
+
+    def test_report_all_errors_is_keyword_only(self):
+        self.assertRaises(
+            TypeError,
+            self.get_form_validator_cls(),
+            True,
+            cleaned_data={},
+            instance=PatientGroupMockModel(randomized=False),
+            model=PatientGroupMockModel,
+        )
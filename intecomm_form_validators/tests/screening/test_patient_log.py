@@ -2,11 +2,17 @@ from unittest.mock import patch
 
 from dateutil.relativedelta import relativedelta
 from django import forms
+from django.core.exceptions import ObjectDoesNotExist
 from django_mock_queries.query import MockModel, MockSet
 from edc_constants.constants import FEMALE, MALE, NO, OTHER, YES
 from edc_utils import get_utcnow
 
 from intecomm_form_validators.screening import PatientLogFormValidator as Base
+from intecomm_form_validators.screening.patient_log_form_validator import (
+    NOT_SCREENED,
+    SubjectScreeningSnapshot,
+    get_subject_screening_snapshots,
+)
 
 from ..mock_models import PatientGroupMockModel, PatientLogMockModel
 from ..test_case_mixin import TestCaseMixin
@@ -98,17 +104,17 @@ class PatientLogTests(TestCaseMixin):
                 True,
             ),
             (
+                "site_id",
                 "site",
-                "site",
-                MockModel(mock_name="Site", id=110),
+                110,
                 MockModel(mock_name="Site", id=110),
                 "Site",
                 False,
             ),
             (
+                "site_id",
                 "site",
-                "site",
-                MockModel(mock_name="Site", id=110),
+                110,
                 MockModel(mock_name="Site", id=120),
                 "Site",
                 True,
@@ -149,11 +155,97 @@ class PatientLogTests(TestCaseMixin):
         ".get_subject_screening_model_cls"
     )
     def test_get_subject_screening(self, mock_subject_screening_model_cls):
+        subject_screening = MockModel(
+            mock_name="SubjectScreening",
+            screening_identifier="B",
+            gender=MALE,
+            initials="BB",
+            hospital_identifier="12345",
+            site_id=110,
+        )
+        get = mock_subject_screening_model_cls.return_value.objects.get
+        get.return_value = subject_screening
+        form_validator = Base(
+            cleaned_data={},
+            instance=MockModel(mock_name="PatientLog", name="BUBBA", screening_identifier="B"),
+            subject_screening=None,
+        )
+        self.assertIs(form_validator.subject_screening, subject_screening)
+        self.assertEqual(
+            form_validator.subject_screening_snapshot,
+            SubjectScreeningSnapshot("B", MALE, "BB", "12345", 110),
+        )
+        form_validator.subject_screening
+        get.assert_called_once_with(screening_identifier="B")
+
+    @patch(
+        "intecomm_form_validators.screening.patient_log_form_validator"
+        ".get_subject_screening_model_cls"
+    )
+    def test_subject_screening_miss_is_kept(self, mock_subject_screening_model_cls):
+        get = mock_subject_screening_model_cls.return_value.objects.get
+        get.side_effect = ObjectDoesNotExist
+        form_validator = Base(
+            cleaned_data={},
+            instance=MockModel(mock_name="PatientLog", name="BUBBA", screening_identifier="B"),
+        )
+        self.assertIsNone(form_validator.subject_screening)
+        self.assertIsNone(form_validator.subject_screening)
+        self.assertIsNone(form_validator.subject_screening_snapshot)
+        get.assert_called_once()
+
+    @patch(
+        "intecomm_form_validators.screening.patient_log_form_validator"
+        ".get_subject_screening_model_cls"
+    )
+    def test_subject_screening_not_screened(self, mock_subject_screening_model_cls):
         form_validator = Base(
             cleaned_data={},
             instance=MockModel(mock_name="PatientLog", name="BUBBA", screening_identifier="B"),
+            subject_screening=NOT_SCREENED,
+        )
+        self.assertIsNone(form_validator.subject_screening)
+        self.assertIsNone(form_validator.subject_screening_snapshot)
+        mock_subject_screening_model_cls.assert_not_called()
+
+    @patch(
+        "intecomm_form_validators.screening.patient_log_form_validator"
+        ".get_subject_screening_model_cls"
+    )
+    def test_subject_screening_pre_seeded(self, mock_subject_screening_model_cls):
+        objects = mock_subject_screening_model_cls.return_value.objects
+        values_list = objects.filter.return_value.values_list
+        values_list.return_value = [
+            ("A", MALE, "AA", "12345", 110),
+            ("B", FEMALE, "BB", "54321", 110),
+        ]
+        patient_logs = [
+            MockModel(mock_name="PatientLog", name=name, screening_identifier=identifier)
+            for name, identifier in [("ANNA", "A"), ("BUBBA", "B"), ("CHRIS", None)]
+        ]
+        snapshots = get_subject_screening_snapshots(
+            [obj.screening_identifier for obj in patient_logs]
+        )
+        objects.filter.assert_called_once_with(screening_identifier__in=["A", "B"])
+        form_validators = [
+            Base(
+                cleaned_data={},
+                instance=obj,
+                subject_screening_snapshot=snapshots.get(
+                    obj.screening_identifier, NOT_SCREENED
+                ),
+            )
+            for obj in patient_logs
+        ]
+        self.assertEqual(
+            [
+                getattr(obj.subject_screening_snapshot, "initials", None)
+                for obj in form_validators
+            ],
+            ["AA", "BB", None],
         )
-        self.assertIsNotNone(form_validator.subject_screening)
+        values_list.assert_called_once()
+        objects.get.assert_not_called()
 
     def test_age_in_years_lt_18_raises(self):
         for age in [17, 15, 1, 0]:
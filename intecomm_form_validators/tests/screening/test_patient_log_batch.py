@@ -0,0 +1,68 @@
+from unittest.mock import Mock, patch
+
+from edc_constants.constants import FEMALE, MALE, YES
+from edc_utils import get_utcnow
+
+from intecomm_form_validators.screening import PatientLogBatchValidator
+
+from ..mock_models import PatientLogMockModel
+from ..test_case_mixin import TestCaseMixin
+
+
+class PatientLogBatchValidatorTests(TestCaseMixin):
+    def setUp(self) -> None:
+        super().setUp()
+        get_subject_screening_model_cls_patcher = patch(
+            "intecomm_form_validators.screening.patient_log_form_validator"
+            ".get_subject_screening_model_cls"
+        )
+        self.addCleanup(get_subject_screening_model_cls_patcher.stop)
+        mock_subject_screening_model_cls = get_subject_screening_model_cls_patcher.start()
+        self.screening_objects = mock_subject_screening_model_cls.return_value.objects
+        self.screening_objects.filter.return_value.values_list.return_value = [
+            ("A", MALE, "AA", "12345", 110),
+        ]
+
+        self.model_cls = Mock(side_effect=PatientLogMockModel)
+        self.model_cls.objects.in_bulk.return_value = {
+            1: PatientLogMockModel(id=1, name="ANNA", screening_identifier="A"),
+            2: PatientLogMockModel(id=2, name="BUBBA", screening_identifier=None),
+        }
+        self.model_cls.objects.filter.return_value.values_list.return_value = [2]
+
+    def get_row(self, **kwargs) -> dict:
+        row = dict(
+            name="ANNA",
+            gender=MALE,
+            initials="AA",
+            hospital_identifier="12345",
+            report_datetime=get_utcnow(),
+            willing_to_screen=YES,
+        )
+        row.update(**kwargs)
+        return row
+
+    def test_validate(self):
+        rows = [
+            self.get_row(id=1),
+            self.get_row(id=1, gender=FEMALE),
+            self.get_row(id=2, name="BUBBA"),
+            self.get_row(name="CHRIS", age_in_years=17),
+            self.get_row(name="DAVE"),
+        ]
+        errors = list(PatientLogBatchValidator(model_cls=self.model_cls).validate(rows))
+        self.assertEqual(len(errors), 5)
+        self.assertEqual(errors[0], {})
+        self.assertIn("Gender may not change", str(errors[1]))
+        self.assertIn("randomized group", str(errors[2]))
+        self.assertIn("age_in_years", errors[3])
+        self.assertEqual(errors[4], {})
+        self.model_cls.objects.in_bulk.assert_called_once_with([1, 1, 2])
+        self.screening_objects.filter.assert_called_once_with(screening_identifier__in=["A"])
+
+    def test_validate_by_chunk(self):
+        rows = [self.get_row(id=1) for _ in range(5)]
+        batch_validator = PatientLogBatchValidator(model_cls=self.model_cls, chunk_size=2)
+        self.assertEqual(list(batch_validator.validate(iter(rows))), [{}] * 5)
+        self.assertEqual(self.model_cls.objects.in_bulk.call_count, 3)
+        self.assertEqual(self.screening_objects.filter.call_count, 3)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from unittest.mock import Mock, patch
+
+from django import forms
+from django_mock_queries.query import MockModel, MockSet
+from edc_constants.constants import NO, NOT_APPLICABLE, YES
+from edc_utils import get_utcnow
+
+from intecomm_form_validators.subject import ClinicalReviewBaselineFormValidator as Base
+
+from ..test_case_mixin import TestCaseMixin
+
+
+class ClinicalReviewBaselineTests(TestCaseMixin):
+    def setUp(self) -> None:
+        super().setUp()
+        raise_if_not_baseline_patcher = patch(
+            "edc_dx_review.form_validator_mixins."
+            "clinical_review_baseline_form_validator_mixin.raise_if_not_baseline"
+        )
+        self.addCleanup(raise_if_not_baseline_patcher.stop)
+        raise_if_not_baseline_patcher.start()
+
+        # screening has no htn_dx field
+        self.subject_screening_model_cls = Mock(
+            objects=MockSet(
+                MockModel(pk=1, subject_identifier="101-0001", hiv_dx=YES, dm_dx=NO),
+                MockModel(pk=2, subject_identifier="101-0002", hiv_dx=NO, dm_dx=NO),
+            )
+        )
+        self.subject_screening_model_cls._meta.get_fields.return_value = [
+            MockModel(name=name) for name in ["id", "subject_identifier", "hiv_dx", "dm_dx"]
+        ]
+        get_subject_screening_model_cls_patcher = patch(
+            "intecomm_form_validators.subject.clinical_review_baseline_form_validator."
+            "get_subject_screening_model_cls",
+            return_value=self.subject_screening_model_cls,
+        )
+        self.addCleanup(get_subject_screening_model_cls_patcher.stop)
+        self.get_subject_screening_model_cls = get_subject_screening_model_cls_patcher.start()
+
+    def get_cleaned_data(self, **kwargs) -> dict:
+        subject_visit = self.get_subject_visit()
+        subject_visit.subject_identifier = "101-0001"
+        cleaned_data = dict(
+            subject_visit=subject_visit,
+            report_datetime=get_utcnow(),
+            hiv_dx=YES,
+            hiv_dx_at_screening=YES,
+            dm_dx=NO,
+            dm_dx_at_screening=NO,
+            htn_dx=NO,
+            htn_dx_at_screening=NOT_APPLICABLE,
+            protocol_incident=NO,
+        )
+        cleaned_data.update(**kwargs)
+        return cleaned_data
+
+    @staticmethod
+    def get_form_validator_cls():
+        class ClinicalReviewBaselineFormValidator(Base):
+            def validate_crf_report_datetime(self) -> None:
+                pass
+
+        return ClinicalReviewBaselineFormValidator
+
+    def get_form_validator(self, cleaned_data: dict):
+        return self.get_form_validator_cls()(
+            cleaned_data=cleaned_data,
+            instance=MockModel(
+                mock_name="ClinicalReviewBaseline",
+                id=None,
+                related_visit_model_attr=lambda: "subject_visit",
+            ),
+            model=MockModel(mock_name="ClinicalReviewBaseline"),
+        )
+
+    def test_subject_screening_dxs(self):
+        form_validator = self.get_form_validator(self.get_cleaned_data())
+        self.assertEqual(
+            form_validator.subject_screening_dxs, dict(pk=1, hiv_dx=YES, dm_dx=NO)
+        )
+        self.assertEqual(form_validator.subject_screening_dx("hiv"), YES)
+        self.assertEqual(form_validator.subject_screening_dx("dm"), NO)
+        self.assertEqual(form_validator.subject_screening_dx("htn"), "")
+
+    def test_subject_screening_dxs_looked_up_once(self):
+        form_validator = self.get_form_validator(self.get_cleaned_data())
+        form_validator.validate()
+        form_validator.subject_screening_dx("hiv")
+        self.assertEqual(self.get_subject_screening_model_cls.call_count, 1)
+
+    def test_cleaned_data_ok(self):
+        form_validator = self.get_form_validator(self.get_cleaned_data())
+        try:
+            form_validator.validate()
+        except forms.ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+    def test_dx_at_screening_must_match_screening(self):
+        form_validator = self.get_form_validator(
+            self.get_cleaned_data(hiv_dx_at_screening=NO, protocol_incident=YES)
+        )
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.validate()
+        self.assertIn("hiv_dx_at_screening", cm.exception.error_dict)
+        self.assertIn(
+            "diagnosis was reported at screening",
+            str(cm.exception.error_dict.get("hiv_dx_at_screening")),
+        )
+
+    def test_protocol_incident_expected(self):
+        form_validator = self.get_form_validator(self.get_cleaned_data(hiv_dx=NO))
+        with self.assertRaises(forms.ValidationError) as cm:
+            form_validator.validate()
+        self.assertIn("protocol_incident", cm.exception.error_dict)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import PropertyMock, patch
+
+from django_mock_queries.query import MockModel
+from edc_constants.constants import NO, YES
+from edc_dx import Diagnoses
+from edc_form_validators import FormValidator
+
+from intecomm_form_validators.subject.mixins import (
+    CachedDiagnoses,
+    DiagnosesFormValidatorMixin,
+)
+from intecomm_form_validators.visit_context import visit_context_scope
+
+from ..test_case_mixin import TestCaseMixin
+
+report_datetime = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+class DiagnosesFormValidator(DiagnosesFormValidatorMixin, FormValidator):
+    subject_identifier = "101-101-0001-2"
+    report_datetime = report_datetime
+
+
+@patch(
+    "intecomm_form_validators.subject.mixins.DiagnosesFormValidatorMixin.make_diagnoses",
+    side_effect=lambda: object(),
+)
+class DiagnosesTests(TestCaseMixin):
+    @staticmethod
+    def get_form_validator(**attrs) -> DiagnosesFormValidator:
+        form_validator = DiagnosesFormValidator(
+            cleaned_data={}, instance=MockModel(), model=MockModel
+        )
+        for k, v in attrs.items():
+            setattr(form_validator, k, v)
+        return form_validator
+
+    def test_once_per_form_validator(self, mock_get_diagnoses):
+        form_validator = self.get_form_validator()
+        diagnoses = form_validator.get_diagnoses()
+        for _ in range(3):
+            self.assertIs(form_validator.get_diagnoses(), diagnoses)
+        self.assertEqual(mock_get_diagnoses.call_count, 1)
+
+        self.assertIsNot(self.get_form_validator().get_diagnoses(), diagnoses)
+        self.assertEqual(mock_get_diagnoses.call_count, 2)
+
+    def test_shared_within_scope(self, mock_get_diagnoses):
+        with visit_context_scope():
+            diagnoses = self.get_form_validator().get_diagnoses()
+            self.assertIs(self.get_form_validator().get_diagnoses(), diagnoses)
+            self.assertEqual(mock_get_diagnoses.call_count, 1)
+
+            self.assertIsNot(
+                self.get_form_validator(subject_identifier="101-101-0002-2").get_diagnoses(),
+                diagnoses,
+            )
+            self.assertIsNot(
+                self.get_form_validator(
+                    report_datetime=datetime(2023, 2, 1, tzinfo=timezone.utc)
+                ).get_diagnoses(),
+                diagnoses,
+            )
+            self.assertEqual(mock_get_diagnoses.call_count, 3)
+
+
+class CachedDiagnosesTests(TestCaseMixin):
+    @patch.object(Diagnoses, "clinical_reviews", new_callable=PropertyMock)
+    @patch.object(Diagnoses, "clinical_review_baseline", new_callable=PropertyMock)
+    def test_reviews_looked_up_once(self, mock_baseline, mock_reviews):
+        mock_baseline.return_value = MockModel(hiv_dx=YES, dm_dx=NO, htn_dx=NO)
+        mock_reviews.return_value = iter([MockModel(hiv_dx=NO, dm_dx=YES, htn_dx=NO)])
+        diagnoses = CachedDiagnoses(
+            subject_identifier="101-101-0001-2", report_datetime=report_datetime
+        )
+        for _ in range(2):
+            self.assertEqual(diagnoses.get_dx("hiv"), YES)
+            self.assertEqual(diagnoses.get_dx("dm"), YES)
+            self.assertIsNone(diagnoses.get_dx("htn"))
+        self.assertEqual(mock_baseline.call_count, 1)
+        self.assertEqual(mock_reviews.call_count, 1)
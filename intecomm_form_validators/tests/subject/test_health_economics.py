@@ -0,0 +1,83 @@
+from django.test import TestCase, override_settings
+from edc_constants.constants import FREE_OF_CHARGE, INSURANCE, OTHER, OWN_CASH
+
+from intecomm_form_validators.subject.health_economics_form_validator import (
+    DRUG_PAY_SOURCES_WITH_COST,
+    M2M_COST_SPECIFY,
+    HealthEconomicsFormValidator,
+    _drug_pay_sources_with_cost,
+    clear_drug_pay_sources_cache,
+    get_drug_pay_sources_with_cost,
+)
+
+from ..models import Conditions, DrugPaySources
+
+
+class DrugPaySourcesTests(TestCase):
+    def setUp(self):
+        clear_drug_pay_sources_cache(DrugPaySources)
+        self.addCleanup(clear_drug_pay_sources_cache, DrugPaySources)
+
+    def test_excludes_free_of_charge(self):
+        for name in [OWN_CASH, INSURANCE, FREE_OF_CHARGE, OTHER]:
+            DrugPaySources.objects.create(name=name)
+        self.assertEqual(
+            get_drug_pay_sources_with_cost(DrugPaySources),
+            frozenset([OWN_CASH, INSURANCE, OTHER]),
+        )
+
+    def test_queried_once(self):
+        DrugPaySources.objects.create(name=OWN_CASH)
+        with self.assertNumQueries(1):
+            get_drug_pay_sources_with_cost(DrugPaySources)
+            get_drug_pay_sources_with_cost(DrugPaySources)
+
+    def test_refreshed_on_list_model_change(self):
+        obj = DrugPaySources.objects.create(name=OWN_CASH)
+        self.assertEqual(get_drug_pay_sources_with_cost(DrugPaySources), {OWN_CASH})
+        DrugPaySources.objects.create(name=INSURANCE)
+        self.assertEqual(get_drug_pay_sources_with_cost(DrugPaySources), {OWN_CASH, INSURANCE})
+        obj.delete()
+        self.assertEqual(get_drug_pay_sources_with_cost(DrugPaySources), {INSURANCE})
+
+    def test_not_refreshed_on_other_model_change(self):
+        label = Conditions._meta.label_lower
+        _drug_pay_sources_with_cost[label] = (None, frozenset([OWN_CASH]))
+        self.addCleanup(_drug_pay_sources_with_cost.pop, label, None)
+        Conditions.objects.create(name=OWN_CASH)
+        self.assertIn(label, _drug_pay_sources_with_cost)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+        INTECOMM_DRUG_PAY_SOURCES_CACHE_ALIAS="default",
+    )
+    def test_refreshed_in_other_processes(self):
+        DrugPaySources.objects.create(name=OWN_CASH)
+        self.assertEqual(get_drug_pay_sources_with_cost(DrugPaySources), {OWN_CASH})
+        other_process_cache = dict(_drug_pay_sources_with_cost)
+        DrugPaySources.objects.create(name=INSURANCE)
+        # another process did not receive the signal
+        _drug_pay_sources_with_cost.update(other_process_cache)
+        self.assertEqual(get_drug_pay_sources_with_cost(DrugPaySources), {OWN_CASH, INSURANCE})
+
+    def test_empty_list_model(self):
+        self.assertEqual(
+            get_drug_pay_sources_with_cost(DrugPaySources), DRUG_PAY_SOURCES_WITH_COST
+        )
+
+    def test_cost_rules(self):
+        rules = [
+            compiled_rule.rule
+            for node in HealthEconomicsFormValidator.compiled_rule_tables["month"]
+            for compiled_rule in node.rules
+            if compiled_rule.rule.kind == M2M_COST_SPECIFY
+        ]
+        self.assertEqual(
+            [rule.dependent for rule in rules],
+            [
+                "rx_dm_cost_month",
+                "rx_htn_cost_month",
+                "rx_hiv_cost_month",
+                "rx_other_cost_month",
+            ],
+        )
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from dateutil.relativedelta import relativedelta
-from edc_constants.constants import COMPLETE, NO, NOT_APPLICABLE, YES
+from django_mock_queries.query import MockModel, MockSet
+from edc_constants.constants import COMPLETE, NO, NOT_APPLICABLE, PENDING, YES
 from edc_dx_review.constants import THIS_CLINIC
 from edc_utils import get_utcnow
+from edc_visit_schedule.constants import MONTH0
+
+from intecomm_form_validators.subject.hiv_review_form_validator import (
+    ViralLoadDrawnDate,
+    get_baseline_datetime,
+    get_viral_load_drawn_dates,
+)
+from intecomm_form_validators.visit_context import visit_context_scope
 
 from ..test_case_mixin import TestCaseMixin
 
@@ -82,3 +91,123 @@ class HivReviewTests(TestCaseMixin):
     #     with self.assertRaises(forms.ValidationError) as cm:
     #         form_validator.validate()
     #     self.assertIn("rx_init", form_validator._errors)
+
+
+class BaselineDatetimeTests(TestCaseMixin):
+    def test_baseline_datetime_shared_within_scope(self):
+        baseline_datetime = get_utcnow() - relativedelta(months=3)
+        related_visit_model_cls = Mock()
+        related_visit_model_cls.objects.get.return_value = Mock(
+            report_datetime=baseline_datetime
+        )
+        with visit_context_scope():
+            for _ in range(3):
+                self.assertEqual(
+                    get_baseline_datetime(related_visit_model_cls, "101-0001"),
+                    baseline_datetime,
+                )
+            related_visit_model_cls.objects.get.assert_called_once_with(
+                subject_identifier="101-0001", visit_code=MONTH0, visit_code_sequence=0
+            )
+            get_baseline_datetime(related_visit_model_cls, "101-0002")
+            self.assertEqual(related_visit_model_cls.objects.get.call_count, 2)
+
+    def test_baseline_datetime_not_kept_beyond_scope(self):
+        """Assert an edited baseline visit is seen by the next
+        request.
+        """
+        baseline_datetime = get_utcnow() - relativedelta(months=3)
+        related_visit_model_cls = Mock()
+        related_visit_model_cls.objects.get.return_value = Mock(
+            report_datetime=baseline_datetime
+        )
+        with visit_context_scope():
+            get_baseline_datetime(related_visit_model_cls, "101-0001")
+        related_visit_model_cls.objects.get.return_value = Mock(
+            report_datetime=baseline_datetime - relativedelta(days=1)
+        )
+        with visit_context_scope():
+            self.assertEqual(
+                get_baseline_datetime(related_visit_model_cls, "101-0001"),
+                baseline_datetime - relativedelta(days=1),
+            )
+        get_baseline_datetime(related_visit_model_cls, "101-0001")
+        self.assertEqual(related_visit_model_cls.objects.get.call_count, 3)
+
+    def test_viral_load_drawn_dates(self):
+        drawn_date = get_utcnow().date() - relativedelta(months=1)
+        hiv_reviews = []
+        for index, subject_identifier in enumerate(["101-0001", "101-0002"]):
+            appointment = MockModel(id=index, visit_code="1030", visit_code_sequence=0)
+            subject_visit = MockModel(
+                subject_identifier=subject_identifier,
+                appointment=appointment,
+                appointment_id=appointment.id,
+            )
+            hiv_reviews.extend(
+                [
+                    MockModel(
+                        id=f"{index}a",
+                        subject_visit=subject_visit,
+                        drawn_date=drawn_date,
+                        has_vl=PENDING,
+                    ),
+                    MockModel(
+                        id=f"{index}b", subject_visit=subject_visit, drawn_date=None, has_vl=NO
+                    ),
+                ]
+            )
+        model_cls = Mock(objects=MockSet(*hiv_reviews))
+        drawn_dates = get_viral_load_drawn_dates(model_cls, ["101-0001", "101-0002"])
+        self.assertEqual(
+            drawn_dates,
+            {
+                ("101-0001", drawn_date): ViralLoadDrawnDate(
+                    "0a", "101-0001", 0, "1030", 0, PENDING
+                ),
+                ("101-0002", drawn_date): ViralLoadDrawnDate(
+                    "1a", "101-0002", 1, "1030", 0, PENDING
+                ),
+            },
+        )
+        self.assertEqual(list(get_viral_load_drawn_dates(model_cls, ["101-0003"])), [])
+
+    def test_viral_load_drawn_dates_excludes_instance(self):
+        drawn_date = get_utcnow().date() - relativedelta(months=1)
+        subject_visits = []
+        for index, visit_code in enumerate(["1030", "1060"]):
+            appointment = MockModel(id=index, visit_code=visit_code, visit_code_sequence=0)
+            subject_visits.append(
+                MockModel(
+                    subject_identifier="101-0001",
+                    appointment=appointment,
+                    appointment_id=appointment.id,
+                )
+            )
+        model_cls = Mock(
+            objects=MockSet(
+                *[
+                    MockModel(
+                        id=f"{index}a",
+                        subject_visit=subject_visit,
+                        drawn_date=drawn_date,
+                        has_vl=PENDING,
+                    )
+                    for index, subject_visit in enumerate(subject_visits)
+                ]
+            )
+        )
+        self.assertEqual(
+            get_viral_load_drawn_dates(model_cls, ["101-0001"], exclude_ids=["0a"]),
+            {
+                ("101-0001", drawn_date): ViralLoadDrawnDate(
+                    "1a", "101-0001", 1, "1060", 0, PENDING
+                ),
+            },
+        )
+        self.assertEqual(
+            get_viral_load_drawn_dates(model_cls, ["101-0001"], exclude_ids=[None])[
+                ("101-0001", drawn_date)
+            ].id,
+            "0a",
+        )
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+from django import forms
+from django.core.signals import request_finished, request_started
+
+from intecomm_form_validators.visit_context import (
+    BASELINE,
+    CLINICAL_REVIEW,
+    get_visit_context,
+    visit_context_scope,
+)
+
+from ..mock_models import AppointmentMockModel, SubjectVisitMockModel
+from ..test_case_mixin import TestCaseMixin
+
+
+class VisitContextTests(TestCaseMixin):
+    def get_subject_visit(self, pk: int = 1) -> SubjectVisitMockModel:
+        return SubjectVisitMockModel(AppointmentMockModel(), pk=pk)
+
+    def test_not_shared_outside_of_scope(self):
+        subject_visit = self.get_subject_visit()
+        self.assertIsNot(get_visit_context(subject_visit), get_visit_context(subject_visit))
+
+    def test_shared_within_scope(self):
+        subject_visit = self.get_subject_visit()
+        func = Mock(return_value=True)
+        with visit_context_scope():
+            self.assertIs(get_visit_context(subject_visit), get_visit_context(subject_visit))
+            self.assertIsNot(
+                get_visit_context(subject_visit), get_visit_context(self.get_subject_visit(2))
+            )
+            for _ in range(3):
+                self.assertTrue(get_visit_context(subject_visit).get_or_set(BASELINE, func))
+        func.assert_called_once_with(subject_visit)
+
+    def test_shared_for_request(self):
+        subject_visit = self.get_subject_visit()
+        request_started.send(sender=self.__class__)
+        context = get_visit_context(subject_visit)
+        self.assertIs(get_visit_context(subject_visit), context)
+        request_finished.send(sender=self.__class__)
+        self.assertIsNot(get_visit_context(subject_visit), context)
+
+    def test_lookup_that_raises_is_not_stored(self):
+        func = Mock(side_effect=[forms.ValidationError("Complete clinical review"), True])
+        with visit_context_scope():
+            context = get_visit_context(self.get_subject_visit())
+            self.assertRaises(forms.ValidationError, context.get_or_set, CLINICAL_REVIEW, func)
+            self.assertTrue(context.get_or_set(CLINICAL_REVIEW, func))
@@ -416,6 +416,31 @@ class VitalsFormValidationTests(TestCaseMixin):
                 except ValidationError as e:
                     self.fail(f"ValidationError unexpectedly raised. Got {e}")
 
+    def test_bp_two_required_raised_before_bp_two_not_applicable(self):
+        cleaned_data = self.get_cleaned_data()
+        cleaned_data.update(
+            {
+                "bp_one_taken": NO,
+                "bp_one_not_taken_reason": "Machine broken",
+                "sys_blood_pressure_one": None,
+                "dia_blood_pressure_one": None,
+                "bp_two_taken": YES,
+                "sys_blood_pressure_two": None,
+                "dia_blood_pressure_two": None,
+                "severe_htn": NOT_APPLICABLE,
+            }
+        )
+        form_validator = VitalsFormValidator(cleaned_data=cleaned_data, model=VitalsMockModel)
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate()
+        self.assertEqual(list(cm.exception.error_dict), ["sys_blood_pressure_two"])
+
+        cleaned_data.update(sys_blood_pressure_two=119, dia_blood_pressure_two=79)
+        form_validator = VitalsFormValidator(cleaned_data=cleaned_data, model=VitalsMockModel)
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate()
+        self.assertEqual(list(cm.exception.error_dict), ["bp_two_taken"])
+
     def test_severe_htn_applicable_if_bp_taken(self):
         for severe_htn in [YES, NO]:
             with self.subTest(severe_htn=severe_htn):
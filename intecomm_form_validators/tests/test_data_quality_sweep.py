@@ -0,0 +1,124 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.module_loading import import_string
+from edc_constants.constants import DM
+from edc_form_validators import INVALID_ERROR, FormValidator
+
+from intecomm_form_validators.data_quality_sweep import (
+    SWEEP_MODELS,
+    Shard,
+    SweepResumeError,
+    get_sweep_summary,
+    sweep,
+    sweep_shard,
+)
+
+from .models import Conditions, PatientLog
+from .test_case_mixin import TestCaseMixin
+
+
+class ConditionsFormValidator(FormValidator):
+    def clean(self):
+        if not self.cleaned_data.get("conditions"):
+            self.raise_validation_error({"conditions": "Required"}, INVALID_ERROR)
+
+
+class DataQualitySweepTests(TestCaseMixin):
+    def setUp(self) -> None:
+        super().setUp()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+    def write_results(self, shard: Shard, results: list[dict]) -> None:
+        path = Path(self.output_dir) / f"{shard.name}.jsonl"
+        path.write_text("".join(json.dumps(r) + "\n" for r in results))
+        path.with_suffix(".done").touch()
+
+    def test_summary_by_site(self):
+        result = dict(pk="1", code="invalid", field="name", message="bad", site_id=101)
+        self.write_results(Shard("intecomm_subject.vitals", 0), [result, result])
+        self.write_results(
+            Shard("intecomm_subject.vitals", 1), [dict(result, site_id=102, code="required")]
+        )
+        self.write_results(Shard("intecomm_prn.endofstudy", 0), [result])
+        self.assertEqual(
+            get_sweep_summary(self.output_dir),
+            {
+                "101": {
+                    "intecomm_prn.endofstudy.invalid": 1,
+                    "intecomm_subject.vitals.invalid": 2,
+                },
+                "102": {"intecomm_subject.vitals.required": 1},
+            },
+        )
+
+    @patch("intecomm_form_validators.data_quality_sweep.sweep_shard")
+    @patch("intecomm_form_validators.data_quality_sweep.get_shards")
+    def test_resumes_from_done_shards(self, mock_get_shards, mock_sweep_shard):
+        shards = [Shard("intecomm_subject.vitals", index) for index in range(3)]
+        mock_get_shards.return_value = shards
+        mock_sweep_shard.side_effect = lambda shard, *args: shard
+        self.write_results(shards[1], [])
+        self.assertEqual(
+            list(sweep(self.output_dir, labels=["intecomm_subject.vitals"], shards=3)),
+            [shards[0], shards[2]],
+        )
+
+    @patch("intecomm_form_validators.data_quality_sweep.sweep_shard")
+    @patch("intecomm_form_validators.data_quality_sweep.get_shards")
+    def test_resume_uses_saved_shards(self, mock_get_shards, mock_sweep_shard):
+        label = "intecomm_subject.vitals"
+        shards = [Shard(label, 0, None, "B"), Shard(label, 1, "B", None)]
+        mock_get_shards.return_value = shards
+        mock_sweep_shard.side_effect = lambda shard, *args: shard
+        self.write_results(shards[0], [])
+        self.assertEqual(list(sweep(self.output_dir, labels=[label], shards=2)), [shards[1]])
+        # subject identifiers added since would move the boundaries
+        mock_get_shards.return_value = [Shard(label, 0, None, "A"), Shard(label, 1, "A", None)]
+        self.assertEqual(list(sweep(self.output_dir, labels=[label], shards=2)), [shards[1]])
+        mock_get_shards.assert_called_once()
+
+    @patch("intecomm_form_validators.data_quality_sweep.sweep_shard")
+    @patch("intecomm_form_validators.data_quality_sweep.get_shards")
+    def test_resume_with_other_number_of_shards_raises(
+        self, mock_get_shards, mock_sweep_shard
+    ):
+        label = "intecomm_subject.vitals"
+        mock_get_shards.return_value = [Shard(label, 0)]
+        mock_sweep_shard.side_effect = lambda shard, *args: shard
+        list(sweep(self.output_dir, labels=[label], shards=1))
+        with self.assertRaises(SweepResumeError):
+            list(sweep(self.output_dir, labels=[label], shards=2))
+
+    def test_sweep_model_form_validators_import(self):
+        for label, (form_validator_path, _) in SWEEP_MODELS.items():
+            with self.subTest(label):
+                import_string(form_validator_path)
+
+    @override_settings(
+        INTECOMM_SWEEP_MODELS={
+            "intecomm_form_validators_app.patientlog": (
+                f"{__name__}.ConditionsFormValidator",
+                None,
+            )
+        }
+    )
+    def test_sweep_shard_prefetches_m2m(self):
+        dm = Conditions.objects.create(name=DM)
+        for i in range(5):
+            PatientLog.objects.create(name=f"PATIENT{i}").conditions.add(dm)
+        PatientLog.objects.create(name="PATIENT5")
+        shard = Shard("intecomm_form_validators_app.patientlog", 0)
+        with CaptureQueriesContext(connection) as context:
+            sweep_shard(shard, self.output_dir)
+        # the patient logs and their conditions
+        self.assertEqual(len(context.captured_queries), 2)
+        results = (Path(self.output_dir) / f"{shard.name}.jsonl").read_text().splitlines()
+        self.assertEqual([json.loads(r)["field"] for r in results], ["conditions"])
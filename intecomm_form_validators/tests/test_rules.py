@@ -0,0 +1,127 @@
+from django import forms
+from django_mock_queries.query import MockModel
+from edc_constants.constants import NO, NOT_APPLICABLE, YES
+from edc_form_validators import FormValidator
+
+from intecomm_form_validators.rules import (
+    APPLICABLE_IF,
+    M2M_OTHER_SPECIFY,
+    REQUIRED_IF,
+    Rule,
+    RulesFormValidatorMixin,
+    compile_rules,
+)
+
+from .test_case_mixin import TestCaseMixin
+
+
+class SmokingFormValidator(RulesFormValidatorMixin, FormValidator):
+    rules = (
+        Rule(REQUIRED_IF, (YES,), "smoker", "smoker_duration"),
+        Rule(APPLICABLE_IF, (YES,), "smoker", "smoker_quit"),
+    )
+    rule_tables = {"alcohol": (Rule(REQUIRED_IF, (YES,), "alcohol", "alcohol_amount"),)}
+
+    def clean(self):
+        self.apply_rules()
+        self.apply_rules("alcohol")
+
+
+class RulesTests(TestCaseMixin):
+    def validate(self, **cleaned_data):
+        SmokingFormValidator(
+            cleaned_data=cleaned_data, instance=MockModel(), model=MockModel
+        ).validate()
+
+    def test_compiled_once_at_class_creation(self):
+        self.assertEqual(len(SmokingFormValidator.compiled_rules), 1)
+        field, rules, inert = SmokingFormValidator.compiled_rules[0]
+        self.assertEqual(field, "smoker")
+        self.assertEqual(len(rules), 2)
+        self.assertEqual(len(inert), 2)
+        rule, func, responses, kwargs = rules[0]
+        self.assertEqual(rule, SmokingFormValidator.rules[0])
+        self.assertIs(func, FormValidator.required_if)
+        self.assertEqual(responses, (YES,))
+        self.assertEqual(kwargs, dict(field="smoker", field_required="smoker_duration"))
+        self.assertEqual(
+            SmokingFormValidator.compiled_rule_tables["alcohol"][0].rules[0].kwargs,
+            dict(field="alcohol", field_required="alcohol_amount"),
+        )
+
+    def test_declared_order_kept(self):
+        class QuitFormValidator(RulesFormValidatorMixin, FormValidator):
+            # the rule on `smoker_quit` is declared before the rule
+            # with `smoker_quit` as its dependent
+            rules = (
+                Rule(REQUIRED_IF, (YES,), "smoker_quit", "smoker_quit_ago"),
+                Rule(APPLICABLE_IF, (YES,), "smoker", "smoker_quit"),
+            )
+
+            def clean(self):
+                self.apply_rules()
+
+        self.assertEqual(
+            [node.field for node in QuitFormValidator.compiled_rules],
+            ["smoker_quit", "smoker"],
+        )
+        with self.assertRaises(forms.ValidationError) as cm:
+            QuitFormValidator(
+                cleaned_data=dict(smoker=NO, smoker_quit=YES, smoker_quit_ago=None),
+                instance=MockModel(),
+                model=MockModel,
+            ).validate()
+        self.assertEqual(list(cm.exception.error_dict), ["smoker_quit_ago"])
+
+    def test_skips_inert_rules(self):
+        def evaluated(**cleaned_data) -> int:
+            return SmokingFormValidator(
+                cleaned_data=cleaned_data, instance=MockModel(), model=MockModel
+            ).apply_rules()
+
+        # not on the form
+        self.assertEqual(evaluated(), 0)
+        # not a response and the dependent fields are empty or NOT_APPLICABLE
+        self.assertEqual(evaluated(smoker=NO, smoker_quit=NOT_APPLICABLE), 0)
+        self.assertEqual(evaluated(smoker=YES, smoker_duration=5, smoker_quit=NO), 2)
+        # a rule that may raise is not skipped
+        self.assertRaises(
+            forms.ValidationError,
+            evaluated,
+            smoker=NO,
+            smoker_quit=NOT_APPLICABLE,
+            smoker_duration=1,
+        )
+
+    def test_rules_with_other_options_are_not_skipped(self):
+        (node,) = compile_rules(
+            FormValidator,
+            (
+                Rule(M2M_OTHER_SPECIFY, (YES,), "rx", "rx_other"),
+                Rule(M2M_OTHER_SPECIFY, (YES,), "rx", "rx_cost", (("inverse", False),)),
+            ),
+        )
+        self.assertIsNone(node.inert)
+
+    def test_invalid_rule_kind(self):
+        self.assertRaises(
+            ValueError, compile_rules, FormValidator, (Rule("bad", (YES,), "smoker"),)
+        )
+
+    def test_rules_in_order(self):
+        with self.assertRaises(forms.ValidationError) as cm:
+            self.validate(smoker=YES, smoker_quit=NOT_APPLICABLE)
+        self.assertIn("smoker_duration", cm.exception.error_dict)
+
+        with self.assertRaises(forms.ValidationError) as cm:
+            self.validate(smoker=YES, smoker_duration=5, smoker_quit=NOT_APPLICABLE)
+        self.assertIn("smoker_quit", cm.exception.error_dict)
+
+        with self.assertRaises(forms.ValidationError) as cm:
+            self.validate(smoker=NO, smoker_quit=NOT_APPLICABLE, alcohol=YES)
+        self.assertIn("alcohol_amount", cm.exception.error_dict)
+
+        try:
+            self.validate(smoker=YES, smoker_duration=5, smoker_quit=NO, alcohol=NO)
+        except forms.ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
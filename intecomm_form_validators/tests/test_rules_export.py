@@ -0,0 +1,89 @@
+import json
+
+from edc_constants.constants import NOT_APPLICABLE, YES
+from edc_form_validators import FormValidator
+
+from intecomm_form_validators.rules import (
+    APPLICABLE_IF,
+    M2M_OTHER_SPECIFY,
+    REQUIRED_IF,
+    Rule,
+    RulesFormValidatorMixin,
+)
+from intecomm_form_validators.rules_export import (
+    export_rules,
+    export_rules_json,
+    get_client_rules,
+)
+from intecomm_form_validators.screening import PatientCallFormValidator
+from intecomm_form_validators.subject import (
+    OtherBaselineDataFormValidator,
+    SocialHarmsFormValidator,
+    VitalsFormValidator,
+)
+
+from .test_case_mixin import TestCaseMixin
+
+
+class SmokingFormValidator(RulesFormValidatorMixin, FormValidator):
+    rules = (
+        Rule(REQUIRED_IF, (YES,), "smoker", "smoker_years", (("inverse", False),)),
+        Rule(APPLICABLE_IF, (YES,), "smoker", "smoker_quit"),
+        Rule(M2M_OTHER_SPECIFY, (YES,), "tobacco", "tobacco_other"),
+    )
+    rule_tables = {
+        "quit": (
+            Rule(
+                REQUIRED_IF,
+                (YES,),
+                "smoker_quit",
+                "smoker_quit_ago",
+                (("field_required_evaluate_as_int", True),),
+            ),
+        )
+    }
+
+
+class RulesExportTests(TestCaseMixin):
+    def test_get_client_rules(self):
+        self.assertEqual(
+            get_client_rules(SmokingFormValidator),
+            [
+                dict(
+                    kind=APPLICABLE_IF,
+                    field="smoker",
+                    dependent="smoker_quit",
+                    responses=[YES],
+                    evaluate_as_int=False,
+                    missing_msg="This field is applicable.",
+                    unexpected_msg="This field is not applicable.",
+                ),
+                dict(
+                    kind=REQUIRED_IF,
+                    field="smoker_quit",
+                    dependent="smoker_quit_ago",
+                    responses=[YES],
+                    evaluate_as_int=True,
+                    missing_msg="This field is required.",
+                    unexpected_msg="This field is not required.",
+                ),
+            ],
+        )
+
+    def test_export_rules(self):
+        form_validator_classes = [
+            PatientCallFormValidator,
+            OtherBaselineDataFormValidator,
+            SocialHarmsFormValidator,
+            VitalsFormValidator,
+        ]
+        rule_set = json.loads(export_rules_json(*form_validator_classes))
+        self.assertEqual(rule_set, export_rules(*form_validator_classes))
+        self.assertEqual(rule_set["not_applicable"], NOT_APPLICABLE)
+        for form_validator_cls in form_validator_classes:
+            with self.subTest(form_validator_cls=form_validator_cls):
+                self.assertTrue(rule_set["validators"][form_validator_cls.__name__])
+        self.assertEqual(
+            [rule["dependent"] for rule in rule_set["validators"]["PatientCallFormValidator"]],
+            ["respondent", "survival_status"],
+        )
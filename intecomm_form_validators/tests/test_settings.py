@@ -21,7 +21,12 @@ project_settings = DefaultTestSettings(
         "django.contrib.messages",
         "django.contrib.staticfiles",
         "intecomm_form_validators.apps.AppConfig",
+        "intecomm_form_validators.tests.apps.AppConfig",
     ],
+    ADVERSE_EVENT_APP_LABEL="intecomm_form_validators_app",
+    EDC_DX_REVIEW_APP_LABEL="intecomm_form_validators_app",
+    SUBJECT_SCREENING_MODEL="intecomm_form_validators_app.subjectscreening",
+    SUBJECT_VISIT_MODEL="intecomm_form_validators_app.subjectvisit",
 ).settings
 
 for k, v in project_settings.items():
@@ -0,0 +1,207 @@
+import json
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from edc_constants.constants import DM, HIV, NO, YES
+from edc_form_validators import INVALID_ERROR, FormValidator
+
+from intecomm_form_validators.validation_runner import (
+    UNEXPECTED_ERROR,
+    ValidationResult,
+    discard_inherited_connections,
+    run_validation,
+    validate_pks,
+    write_jsonl,
+)
+
+from .models import Conditions, PatientLog
+from .test_case_mixin import TestCaseMixin
+
+
+class SmokingFormValidator(FormValidator):
+    def clean(self):
+        if self.cleaned_data.get("smoker") == "broken":
+            raise ValueError("broken")
+        self.required_if(YES, field="smoker", field_required="smoker_duration")
+        if (self.cleaned_data.get("smoker_duration") or 0) > 100:
+            self.raise_validation_error({"smoker_duration": "Too long"}, INVALID_ERROR)
+
+
+class Smoking:
+    def __init__(self, pk, smoker, smoker_duration):
+        self.pk = pk
+        self.id = pk
+        self.smoker = smoker
+        self.smoker_duration = smoker_duration
+
+
+def get_cleaned_data(instance) -> dict:
+    return dict(smoker=instance.smoker, smoker_duration=instance.smoker_duration)
+
+
+class PatientLogFormValidator(FormValidator):
+    def clean(self):
+        self.required_if(YES, field="willing_to_screen", field_required="screening_identifier")
+
+
+class ConditionsFormValidator(FormValidator):
+    def clean(self):
+        if not self.cleaned_data.get("conditions").exists():
+            self.raise_validation_error({"conditions": "Required"}, INVALID_ERROR)
+        if len(self.cleaned_data.get("conditions")) > 1:
+            self.raise_validation_error(
+                {"conditions": "One only", "name": "Check"}, "ONE_ONLY"
+            )
+
+
+class ManyErrorsFormValidator(FormValidator):
+    def clean(self):
+        errors = []
+        for field, code in [("smoker", "CODE_ONE"), ("smoker_duration", "CODE_TWO")]:
+            try:
+                self.raise_validation_error({field: "Invalid"}, code)
+            except ValidationError as e:
+                errors.append(e)
+        raise ValidationError(errors)
+
+
+class ValidationRunnerTests(TestCaseMixin):
+    def get_instances(self) -> list:
+        return [
+            Smoking(pk=1, smoker=YES, smoker_duration=5),
+            Smoking(pk=2, smoker=YES, smoker_duration=None),
+            Smoking(pk=3, smoker=NO, smoker_duration=None),
+            Smoking(pk=4, smoker=YES, smoker_duration=101),
+            Smoking(pk=5, smoker="broken", smoker_duration=None),
+        ]
+
+    def assert_results(self, results: list):
+        self.assertEqual(
+            [r[:3] for r in results],
+            [
+                (2, "required", "smoker_duration"),
+                (4, INVALID_ERROR, "smoker_duration"),
+                (5, UNEXPECTED_ERROR, "__all__"),
+            ],
+        )
+        self.assertEqual(results[1].message, "Too long")
+
+    def test_run_validation(self):
+        results = list(
+            run_validation(
+                SmokingFormValidator,
+                self.get_instances(),
+                chunk_size=2,
+                get_cleaned_data=get_cleaned_data,
+            )
+        )
+        self.assert_results(results)
+
+    def test_run_validation_in_process_pool(self):
+        results = list(
+            run_validation(
+                SmokingFormValidator,
+                self.get_instances(),
+                chunk_size=1,
+                processes=2,
+                get_cleaned_data=get_cleaned_data,
+            )
+        )
+        self.assert_results(results)
+
+    def test_run_validation_queryset_in_process_pool(self):
+        for i, (willing_to_screen, screening_identifier) in enumerate(
+            [(YES, "XYZ1"), (YES, None), (NO, None), (YES, None)]
+        ):
+            PatientLog.objects.create(
+                name=f"PATIENT{i}",
+                willing_to_screen=willing_to_screen,
+                screening_identifier=screening_identifier,
+            )
+        queryset = PatientLog.objects.order_by("-pk")
+        results = list(
+            run_validation(PatientLogFormValidator, queryset, chunk_size=1, processes=2)
+        )
+        self.assertEqual([r.pk for r in results], [queryset[0].pk, queryset[2].pk])
+        self.assertEqual({r.field for r in results}, {"screening_identifier"})
+        # the parent's connection is still usable
+        self.assertEqual(PatientLog.objects.count(), 4)
+
+    def test_code_of_each_field_of_one_error(self):
+        dm = Conditions.objects.create(name=DM)
+        hiv = Conditions.objects.create(name=HIV)
+        PatientLog.objects.create(name="PATIENT").conditions.add(dm, hiv)
+        results = list(run_validation(ConditionsFormValidator, PatientLog.objects.all()))
+        self.assertEqual(
+            [r[1:3] for r in results], [("ONE_ONLY", "conditions"), ("ONE_ONLY", "name")]
+        )
+
+    def test_code_none_if_not_known(self):
+        results = list(
+            run_validation(
+                ManyErrorsFormValidator,
+                self.get_instances()[:1],
+                get_cleaned_data=get_cleaned_data,
+            )
+        )
+        self.assertEqual([r.code for r in results], [None, None])
+
+    def test_run_validation_with_prefetch_related(self):
+        dm = Conditions.objects.create(name=DM)
+        for i in range(10):
+            PatientLog.objects.create(name=f"PATIENT{i}").conditions.add(dm)
+        queryset = PatientLog.objects.prefetch_related("conditions")
+        with CaptureQueriesContext(connection) as context:
+            results = list(run_validation(ConditionsFormValidator, queryset))
+        self.assertEqual(results, [])
+        # the patient logs and their conditions
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_validate_pks_with_prefetch_related(self):
+        dm = Conditions.objects.create(name=DM)
+        for i in range(10):
+            PatientLog.objects.create(name=f"PATIENT{i}").conditions.add(dm)
+        queryset = PatientLog.objects.prefetch_related("conditions")
+        pks = list(queryset.values_list("pk", flat=True))
+        with CaptureQueriesContext(connection) as context:
+            results = validate_pks(
+                ConditionsFormValidator,
+                PatientLog,
+                queryset.query,
+                pks,
+                prefetch_related_lookups=queryset._prefetch_related_lookups,
+            )
+        self.assertEqual(results, [])
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_discard_inherited_connections(self):
+        conn = Mock(vendor="postgresql", connection=object())
+        with patch(
+            "intecomm_form_validators.validation_runner.connections.all",
+            return_value=[conn, connection],
+        ):
+            discard_inherited_connections()
+        self.assertIsNone(conn.connection)
+        conn.close.assert_not_called()
+        # an in-memory SQLite database is kept
+        self.assertIsNotNone(connection.connection)
+
+    def test_write_jsonl(self):
+        f = StringIO()
+        count = write_jsonl(
+            [ValidationResult(1, INVALID_ERROR, "smoker_duration", "Too long")], f
+        )
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            json.loads(f.getvalue().splitlines()[0]),
+            dict(
+                pk="1",
+                code=INVALID_ERROR,
+                field="smoker_duration",
+                message="Too long",
+                site_id=None,
+            ),
+        )
@@ -0,0 +1,36 @@
+from dateutil.relativedelta import relativedelta
+from edc_visit_schedule.constants import MONTH0, MONTH3, MONTH12
+from edc_visit_schedule.schedule import Schedule
+from edc_visit_schedule.visit import Visit
+from edc_visit_schedule.visit_schedule import VisitSchedule
+
+app_label = "intecomm_form_validators_app"
+
+visit_schedule = VisitSchedule(
+    name="visit_schedule",
+    offstudy_model=f"{app_label}.endofstudy",
+    death_report_model=f"{app_label}.deathreport",
+    locator_model="edc_locator.subjectlocator",
+    visit_model=f"{app_label}.subjectvisit",
+)
+
+schedule = Schedule(
+    name="schedule",
+    onschedule_model=f"{app_label}.onschedule",
+    offschedule_model=f"{app_label}.offschedule",
+    appointment_model=f"{app_label}.appointment",
+    consent_definitions=[],
+)
+
+for code, timepoint, months in [(MONTH0, 0, 0), (MONTH3, 1, 3), (MONTH12, 2, 12)]:
+    schedule.add_visit(
+        Visit(
+            code=code,
+            timepoint=timepoint,
+            rbase=relativedelta(months=months),
+            rlower=relativedelta(days=0),
+            rupper=relativedelta(days=0 if not months else 30),
+        )
+    )
+
+visit_schedule.add_schedule(schedule)
@@ -2,42 +2,54 @@ from __future__ import annotations
 
 import re
 from decimal import Decimal
-from typing import Tuple
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, NamedTuple, Tuple
 
 from django.conf import settings
-from django.db.models import QuerySet
+from django.core.signals import setting_changed
+from django.db.models import Count, Q, QuerySet
+from django.dispatch import receiver
 from django.utils.html import format_html
 from edc_constants.constants import DM, HIV, HTN, YES
 from edc_protocol.research_protocol_config import ResearchProtocolConfig
 from edc_utils.round_up import round_up
 from edc_visit_schedule.constants import MONTH12
 
+from .constants import HIV_NCD, HIV_ONLY, NCD_ONLY
 
-class PatientNotStableError(Exception):
+SCREENING_IDENTIFIER_PATTERN = r"^[A-Z0-9]{8}$"
+
+
+class PatientGroupError(Exception):
+    pass
+
+
+class PatientNotStableError(PatientGroupError):
     pass
 
 
-class PatientNotScreenedError(Exception):
+class PatientNotScreenedError(PatientGroupError):
     pass
 
 
-class PatientNotConsentedError(Exception):
+class PatientNotConsentedError(PatientGroupError):
     pass
 
 
-class PatientGroupRatioError(Exception):
+class PatientGroupRatioError(PatientGroupError):
     pass
 
 
-class PatientGroupSizeError(Exception):
+class PatientGroupSizeError(PatientGroupError):
     pass
 
 
-class PatientUnwillingToScreenError(Exception):
+class PatientUnwillingToScreenError(PatientGroupError):
     pass
 
 
-class PatientGroupMakeupError(Exception):
+class PatientGroupMakeupError(PatientGroupError):
     pass
 
 
@@ -59,122 +71,487 @@ def get_group_size_for_ratio() -> int:
     return getattr(settings, "INTECOMM_MIN_GROUP_SIZE_FOR_RATIO", 9)
 
 
-def verify_patient_group_ratio_raise(
-    patients: iter, raise_on_outofrange: bool | None = None
-) -> Tuple[int, int, Decimal, bool]:
-    ncd = 0.0
-    hiv = 0.0
-    outofrange = False
-    raise_on_outofrange = True if raise_on_outofrange is None else raise_on_outofrange
-    for patient_log in patients:
-        if patient_log.conditions.all().count() == 1:
-            if (
-                patient_log.conditions.filter(name__in=[HTN, DM])
-                .exclude(name__in=[HIV])
-                .exists()
-            ):
-                ncd += 1.0
-            if (
-                patient_log.conditions.filter(name__in=[HIV])
-                .exclude(name__in=[HTN, DM])
-                .exists()
-            ):
-                hiv += 1.0
+@lru_cache(maxsize=None)
+def get_group_ratio_range() -> tuple[Fraction, Fraction]:
+    """Returns the lower and upper bounds, inclusive, of the NCD:HIV
+    ratio as exact fractions.
+    """
+    lower, upper = getattr(settings, "INTECOMM_GROUP_RATIO_RANGE", ("2.0", "2.8"))
+    return Fraction(str(lower)), Fraction(str(upper))
+
+
+@lru_cache(maxsize=None)
+def get_screening_identifier_regex() -> re.Pattern:
+    return re.compile(SCREENING_IDENTIFIER_PATTERN)
+
+
+@lru_cache(maxsize=None)
+def get_subject_identifier_regex() -> re.Pattern:
+    return re.compile(ResearchProtocolConfig().subject_identifier_pattern)
+
+
+@receiver(setting_changed, dispatch_uid="intecomm_form_validators.identifier_regex")
+def clear_identifier_regex_cache(setting=None, **kwargs) -> None:
+    """Recompile identifier patterns and reload the ratio range if
+    settings change (tests).
+    """
+    if setting and setting.startswith("EDC_PROTOCOL"):
+        get_subject_identifier_regex.cache_clear()
+    elif setting == "INTECOMM_GROUP_RATIO_RANGE":
+        get_group_ratio_range.cache_clear()
+
+
+def match_identifiers(regex: re.Pattern, identifiers: Iterable[str | None]) -> list[bool]:
+    """Returns a list of booleans, one per identifier, True if the
+    identifier matches the compiled regex.
+    """
+    match = regex.match
+    return [bool(identifier and match(identifier)) for identifier in identifiers]
+
+
+def get_report_all_group_errors() -> bool:
+    """Returns True if the patient group form should report every
+    failed COMPLETE check instead of stopping at the first.
+    """
+    return getattr(settings, "INTECOMM_PATIENT_GROUP_REPORT_ALL_ERRORS", False)
+
+
+def get_condition_profile(conditions: Iterable[str]) -> str | None:
+    """Returns HIV_ONLY, NCD_ONLY or HIV_NCD given a patient's
+    condition names, or None if none of HIV, DM, HTN.
+    """
+    conditions = set(conditions)
+    hiv = HIV in conditions
+    ncd = bool(conditions & {DM, HTN})
+    if hiv and ncd:
+        return HIV_NCD
+    elif hiv:
+        return HIV_ONLY
+    elif ncd:
+        return NCD_ONLY
+    return None
+
+
+def get_patients_with_conditions(patients: Any) -> list[tuple[Any, frozenset[str]]]:
+    """Returns a list of (patient_log, condition names) for each patient.
+
+    For a queryset, conditions are prefetched so the group costs one
+    query for patients and one for conditions regardless of size.
+    """
+    if hasattr(patients, "prefetch_related"):
+        patients = patients.prefetch_related("conditions")
+    return [
+        (patient_log, frozenset(obj.name for obj in patient_log.conditions.all()))
+        for patient_log in patients
+    ]
+
+
+class PatientSnapshot(NamedTuple):
+    patient_log: Any
+    conditions: frozenset[str]
+    stable: str | None
+    willing_to_screen: str | None
+    screening_identifier: str | None
+    subject_identifier: str | None
+
+
+class PatientGroupSnapshot:
+    """A materialized list of the patients in a group, with their
+    conditions, built once and passed to each of the group checks.
+
+    Costs one query for patients and one for conditions.
+    """
+
+    def __init__(self, patients: Any):
+        self.patients: list[PatientSnapshot] = [
+            PatientSnapshot(
+                patient_log=patient_log,
+                conditions=conditions,
+                stable=patient_log.stable,
+                willing_to_screen=patient_log.willing_to_screen,
+                screening_identifier=patient_log.screening_identifier,
+                subject_identifier=patient_log.subject_identifier,
+            )
+            for patient_log, conditions in get_patients_with_conditions(patients)
+        ]
+
+    def __iter__(self) -> Iterator[PatientSnapshot]:
+        return iter(self.patients)
+
+    def __len__(self) -> int:
+        return len(self.patients)
+
+    def count(self) -> int:
+        return len(self.patients)
+
+
+def get_patient_group_snapshot(patients: Any) -> PatientGroupSnapshot:
+    if isinstance(patients, (PatientGroupSnapshot,)):
+        return patients
+    return PatientGroupSnapshot(patients)
+
+
+def get_condition_profile_counts(
+    patients: QuerySet | PatientGroupSnapshot | Iterable,
+) -> dict[str, int]:
+    """Returns the number of HIV_ONLY, NCD_ONLY and HIV_NCD patients.
+
+    A queryset bound to a model is counted with a single aggregate
+    query over the conditions M2M; anything else (a snapshot, a list
+    or a MockSet in tests) is counted in Python.
+    """
+    if hasattr(patients, "get_queryset"):
+        patients = patients.all()
+    if isinstance(patients, QuerySet) and getattr(patients, "model", None) is not None:
+        return patients.annotate(
+            hiv_count=Count("conditions", filter=Q(conditions__name=HIV)),
+            ncd_count=Count("conditions", filter=Q(conditions__name__in=[DM, HTN])),
+        ).aggregate(
+            **{
+                HIV_ONLY: Count("pk", filter=Q(hiv_count__gt=0, ncd_count=0)),
+                NCD_ONLY: Count("pk", filter=Q(hiv_count=0, ncd_count__gt=0)),
+                HIV_NCD: Count("pk", filter=Q(hiv_count__gt=0, ncd_count__gt=0)),
+            }
+        )
+    counts = {HIV_ONLY: 0, NCD_ONLY: 0, HIV_NCD: 0}
+    for patient in get_patient_group_snapshot(patients):
+        if profile := get_condition_profile(patient.conditions):
+            counts[profile] += 1
+    return counts
+
+
+def is_ratio_outofrange(ncd: int, hiv: int) -> bool:
+    """Returns True if the NCD:HIV ratio is outside of the ratio range.
+
+    Compares integer counts against the bounds exactly, without
+    computing the ratio.
+    """
     if not ncd or not hiv:
-        ratio = 0.0
-    else:
-        ratio = ncd / hiv
-    if not (2.0 <= ratio <= 2.8):
-        outofrange = True
-        if raise_on_outofrange:
+        ncd, hiv = 0, 1
+    lower, upper = get_group_ratio_range()
+    return not (
+        lower.numerator * hiv <= ncd * lower.denominator
+        and ncd * upper.denominator <= upper.numerator * hiv
+    )
+
+
+def get_ratio(ncd: int, hiv: int) -> Decimal:
+    """Returns the NCD:HIV ratio rounded up to 2 places for display."""
+    if not ncd or not hiv:
+        return Decimal("0.00")
+    return round_up(Decimal(ncd) / Decimal(hiv), Decimal("1.00"))
+
+
+class GroupCompositionTracker:
+    """Counts patients by condition profile and maintains the NCD:HIV
+    ratio as patients are added to or removed from a group.
+
+    Each add/remove is O(1) so the ratio can be updated as group
+    membership is edited without a recount.
+
+    For example:
+        tracker = GroupCompositionTracker(patient_group.patients)
+        tracker.add([HIV])
+        tracker.remove([DM, HTN])
+        ncd, hiv, ratio, outofrange = tracker.ratio_result
+
+    The ratio is only computed if accessed; use `outofrange` or
+    `raise_if_outofrange` to just check the range.
+    """
+
+    def __init__(self, patients: QuerySet | PatientGroupSnapshot | None = None):
+        self.size = 0
+        self.counts = {HIV_ONLY: 0, NCD_ONLY: 0, HIV_NCD: 0}
+        # only patients with a single condition count toward the ratio
+        self.ncd = 0
+        self.hiv = 0
+        if patients is not None:
+            for patient in get_patient_group_snapshot(patients):
+                self.add(patient.conditions)
+
+    def add(self, conditions: Iterable[str]) -> None:
+        self.update(conditions, 1)
+
+    def remove(self, conditions: Iterable[str]) -> None:
+        self.update(conditions, -1)
+
+    def update(self, conditions: Iterable[str], delta: int) -> None:
+        conditions = frozenset(conditions)
+        self.size += delta
+        if profile := get_condition_profile(conditions):
+            self.counts[profile] += delta
+            if len(conditions) == 1 and profile == NCD_ONLY:
+                self.ncd += delta
+            elif len(conditions) == 1 and profile == HIV_ONLY:
+                self.hiv += delta
+
+    @property
+    def outofrange(self) -> bool:
+        return is_ratio_outofrange(self.ncd, self.hiv)
+
+    @property
+    def ratio(self) -> Decimal:
+        return get_ratio(self.ncd, self.hiv)
+
+    @property
+    def ratio_result(self) -> Tuple[int, int, Decimal, bool]:
+        """Returns (ncd, hiv, ratio, outofrange) as returned by
+        `verify_patient_group_ratio_raise`.
+        """
+        return self.ncd, self.hiv, self.ratio, self.outofrange
+
+    def raise_if_outofrange(self) -> None:
+        if self.outofrange:
             raise PatientGroupRatioError(
-                f"Ratio NDC:HIV not met. Expected at least 2:1. Got {int(ncd)}:{int(hiv)}. "
+                "Ratio NDC:HIV not met. Expected at least 2:1. " f"Got {self.ncd}:{self.hiv}. "
             )
-    ncd = int(ncd)
-    hiv = int(hiv)
-    return int(ncd), int(hiv), round_up(Decimal(str(ratio)), Decimal("1.00")), outofrange
+
+
+def verify_patient_group_ratio_raise(
+    patients: QuerySet | PatientGroupSnapshot, raise_on_outofrange: bool | None = None
+) -> Tuple[int, int, Decimal, bool]:
+    raise_on_outofrange = True if raise_on_outofrange is None else raise_on_outofrange
+    tracker = GroupCompositionTracker(patients)
+    if raise_on_outofrange:
+        tracker.raise_if_outofrange()
+    return tracker.ratio_result
+
+
+def raise_or_append(
+    error: PatientGroupError, errors: list[PatientGroupError], raise_on_error: bool
+) -> None:
+    if raise_on_error:
+        raise error
+    errors.append(error)
 
 
 def confirm_patient_group_size_or_raise(
-    patients: QuerySet | None = None,
+    patients: QuerySet | PatientGroupSnapshot | None = None,
     bypass_group_size_min: bool | None = None,
     group_count_min: int | None = None,
-) -> None:
-    """Confirm at least 14 if complete or override."""
+    raise_on_error: bool | None = None,
+) -> list[PatientGroupSizeError]:
+    """Confirm at least 14 if complete or override.
+
+    If `raise_on_error` is False, returns the errors instead.
+    """
+    errors = []
+    raise_on_error = True if raise_on_error is None else raise_on_error
     group_count_min = group_count_min or get_min_group_size()
     if not patients:
-        raise PatientGroupSizeError("Patient group has no patients.")
+        raise_or_append(
+            PatientGroupSizeError("Patient group has no patients."), errors, raise_on_error
+        )
     elif not bypass_group_size_min and patients.count() < group_count_min:
-        raise PatientGroupSizeError(
-            f"Patient group must have at least {group_count_min} patients. "
-            f"Got {patients.count()}."
+        raise_or_append(
+            PatientGroupSizeError(
+                f"Patient group must have at least {group_count_min} patients. "
+                f"Got {patients.count()}."
+            ),
+            errors,
+            raise_on_error,
         )
+    return errors
 
 
 def confirm_patient_group_minimum_of_each_condition_or_raise(
-    patients: QuerySet | None = None,
-) -> None:
+    patients: QuerySet | PatientGroupSnapshot | None = None,
+    raise_on_error: bool | None = None,
+) -> list[PatientGroupMakeupError]:
     """Confirm at least 2 of each condition
 
     A minimum of two people with each of HIV, diabetes and
     hypertension will be selected per group. The rest will be
     patients with a variable mixture of the three conditions
+
+    If `raise_on_error` is False, returns the errors instead.
     """
-    hiv_only = 0
-    for patient in patients.all():
-        hiv_only += patient.conditions.filter(name=HIV).exclude(name__in=[DM, HTN]).count()
-        if hiv_only >= 2:
-            break
+    errors = []
+    raise_on_error = True if raise_on_error is None else raise_on_error
+    counts = get_condition_profile_counts(patients)
+    hiv_only = counts[HIV_ONLY]
     if hiv_only < 2:
-        raise PatientGroupMakeupError(
-            f"Patient group must have at least 2 HIV only patients. Got {hiv_only}."
+        raise_or_append(
+            PatientGroupMakeupError(
+                f"Patient group must have at least 2 HIV only patients. Got {hiv_only}."
+            ),
+            errors,
+            raise_on_error,
         )
 
-    ncd_only = 0
-    for patient in patients.all():
-        ncd_only += patient.conditions.filter(name__in=[DM, HTN]).exclude(name=HIV).count()
-        if ncd_only >= 4:
-            break
+    ncd_only = counts[NCD_ONLY]
     if ncd_only < 4:
-        raise PatientGroupMakeupError(
-            f"Patient group must have at least 4 NCD only patients. Got {ncd_only}."
+        raise_or_append(
+            PatientGroupMakeupError(
+                f"Patient group must have at least 4 NCD only patients. Got {ncd_only}."
+            ),
+            errors,
+            raise_on_error,
         )
+    return errors
 
 
 def confirm_patient_group_ratio_or_raise(
-    patients: QuerySet | None = None,
+    patients: QuerySet | PatientGroupSnapshot | None = None,
     bypass_group_ratio: bool | None = None,
 ):
     if not bypass_group_ratio:
-        verify_patient_group_ratio_raise(patients)
+        GroupCompositionTracker(patients).raise_if_outofrange()
+
+
+def get_patient_log_link(patient_log) -> str:
+    """Returns an HTML link to the patient log changelist for use in
+    error messages.
+
+    Only call on the failure path, reversing the URL is not cheap.
+    """
+    return format_html(
+        '<a href="{}?q={}">{}</a>',
+        patient_log.get_changelist_url(),
+        str(patient_log.id),
+        str(patient_log),
+    )
 
 
 def confirm_patients_stable_and_screened_and_consented_or_raise(
-    patients: QuerySet | None = None,
-):
+    patients: QuerySet | PatientGroupSnapshot | None = None,
+    raise_on_error: bool | None = None,
+) -> list[PatientGroupError]:
+    """Confirm each patient is stable, willing, screened and consented.
+
+    If `raise_on_error` is False, checks every patient and returns the
+    errors instead of raising on the first.
+    """
+    errors = []
+    raise_on_error = True if raise_on_error is None else raise_on_error
     if not patients:
-        raise PatientGroupSizeError("Patient group has no patients.")
+        raise_or_append(
+            PatientGroupSizeError("Patient group has no patients."), errors, raise_on_error
+        )
     else:
-        for patient_log in patients.all():
-            link = format_html(
-                f'<a href="{patient_log.get_changelist_url()}?'
-                f'q={str(patient_log.id)}">{patient_log}</a>'
-            )
-            if patient_log.stable != YES:
+        patients = get_patient_group_snapshot(patients)
+        screened = match_identifiers(
+            get_screening_identifier_regex(),
+            [patient.screening_identifier for patient in patients],
+        )
+        consented = match_identifiers(
+            get_subject_identifier_regex(),
+            [patient.subject_identifier for patient in patients],
+        )
+        for patient, is_screened, is_consented in zip(patients, screened, consented):
+            if patient.stable != YES:
                 errmsg = format_html(
                     "Patient is not known to be stable and in-care. "
-                    f"See patient log for {link}."
+                    "See patient log for {}.",
+                    get_patient_log_link(patient.patient_log),
+                )
+                raise_or_append(PatientNotStableError(errmsg), errors, raise_on_error)
+            if patient.willing_to_screen != YES:
+                errmsg = format_html(
+                    "Patient reported as unwilling to screen. See {}.",
+                    get_patient_log_link(patient.patient_log),
+                )
+                raise_or_append(PatientUnwillingToScreenError(errmsg), errors, raise_on_error)
+            if not is_screened:
+                errmsg = format_html(
+                    "Patient has not screened for eligibility. See {}.",
+                    get_patient_log_link(patient.patient_log),
+                )
+                raise_or_append(PatientNotScreenedError(errmsg), errors, raise_on_error)
+            if not is_consented:
+                errmsg = format_html(
+                    "Patient has not consented. See {}.",
+                    get_patient_log_link(patient.patient_log),
+                )
+                raise_or_append(PatientNotConsentedError(errmsg), errors, raise_on_error)
+    return errors
+
+
+def get_patient_group_errors(
+    patients: QuerySet | PatientGroupSnapshot | None = None,
+    bypass_group_size_min: bool | None = None,
+    bypass_group_ratio: bool | None = None,
+    first_only: bool | None = None,
+) -> list[PatientGroupError]:
+    """Returns the errors for every failed COMPLETE check in the
+    order the checks are run.
+
+    The first error is the one the checks raise when run one by one.
+    If `first_only`, stops at that error.
+    """
+    errors: list[PatientGroupError] = []
+    raise_on_error = bool(first_only)
+    try:
+        errors.extend(
+            confirm_patients_stable_and_screened_and_consented_or_raise(
+                patients=patients, raise_on_error=raise_on_error
+            )
+        )
+        if patients:
+            patients = get_patient_group_snapshot(patients)
+            errors.extend(
+                confirm_patient_group_size_or_raise(
+                    patients=patients,
+                    bypass_group_size_min=bypass_group_size_min,
+                    raise_on_error=raise_on_error,
                 )
-                raise PatientNotStableError(errmsg)
-            if patient_log.willing_to_screen != YES:
-                errmsg = format_html(f"Patient reported as unwilling to screen. See {link}.")
-                raise PatientUnwillingToScreenError(errmsg)
-            if not re.match(r"^[A-Z0-9]{8}$", patient_log.screening_identifier):
-                errmsg = format_html(f"Patient has not screened for eligibility. See {link}.")
-                raise PatientNotScreenedError(errmsg)
-            if not re.match(
-                ResearchProtocolConfig().subject_identifier_pattern,
-                patient_log.subject_identifier,
-            ):
-                errmsg = format_html(f"Patient has not consented. See {link}.")
-                raise PatientNotConsentedError(errmsg)
+            )
+            if not bypass_group_ratio and patients.count() >= get_group_size_for_ratio():
+                try:
+                    GroupCompositionTracker(patients).raise_if_outofrange()
+                except PatientGroupRatioError as e:
+                    raise_or_append(e, errors, raise_on_error)
+            errors.extend(
+                confirm_patient_group_minimum_of_each_condition_or_raise(
+                    patients, raise_on_error=raise_on_error
+                )
+            )
+    except PatientGroupError as e:
+        return [e]
+    return errors
+
+
+class PatientGroupReadiness(NamedTuple):
+    group: Any
+    size: int
+    ncd: int
+    hiv: int
+    ratio: Decimal
+    errors: list[PatientGroupError]
+
+    @property
+    def ready(self) -> bool:
+        return not self.errors
+
+
+def get_patient_groups_readiness(groups: QuerySet) -> list[PatientGroupReadiness]:
+    """Returns a readiness report for each group, that is, whether
+    the group would pass the PatientGroupFormValidator COMPLETE checks.
+
+    For example:
+        get_patient_groups_readiness(PatientGroup.objects.filter(status=RECRUITING))
+
+    Patients and their conditions are prefetched for all groups so the
+    whole call costs three queries regardless of the number of groups.
+    """
+    reports = []
+    for group in groups.prefetch_related("patients", "patients__conditions"):
+        patients = PatientGroupSnapshot(list(group.patients.all()))
+        ncd, hiv, ratio, _ = verify_patient_group_ratio_raise(
+            patients, raise_on_outofrange=False
+        )
+        reports.append(
+            PatientGroupReadiness(
+                group=group,
+                size=patients.count(),
+                ncd=ncd,
+                hiv=hiv,
+                ratio=ratio,
+                errors=get_patient_group_errors(
+                    patients,
+                    bypass_group_size_min=getattr(group, "bypass_group_size_min", None),
+                    bypass_group_ratio=getattr(group, "bypass_group_ratio", None),
+                ),
+            )
+        )
+    return reports
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import IO, Any, Callable, Iterable, Iterator, NamedTuple, Type
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import connections
+from django.db.models import Model, QuerySet
+from django.db.models.sql import Query
+from edc_form_validators import FormValidator
+
+UNEXPECTED_ERROR = "UNEXPECTED_ERROR"
+
+
+class ValidationResult(NamedTuple):
+    pk: Any
+    code: str | None
+    field: str
+    message: str
+    site_id: int | None = None
+
+
+def get_cleaned_data(instance: Model) -> dict:
+    """Returns a cleaned_data dict for a saved model instance.
+
+    Foreign keys are model instances and m2m fields are querysets,
+    as in a ModelForm's cleaned_data. Each costs a query per instance
+    unless the instances come from a queryset with `select_related()`
+    for the foreign keys and `prefetch_related()` for the m2m fields.
+    """
+    opts = instance._meta
+    cleaned_data = {f.name: getattr(instance, f.name) for f in opts.concrete_fields}
+    for f in opts.many_to_many:
+        cleaned_data[f.name] = getattr(instance, f.name).all()
+    return cleaned_data
+
+
+def validate_instance(
+    form_validator_cls: Type[FormValidator],
+    instance: Model,
+    get_cleaned_data: Callable[[Model], dict] = get_cleaned_data,
+) -> list[ValidationResult]:
+    """Runs the form validator against a saved instance and returns a
+    ValidationResult for each error.
+
+    An exception other than ValidationError is returned as an
+    UNEXPECTED_ERROR so that one bad record does not stop a run.
+    """
+    form_validator = form_validator_cls(
+        cleaned_data=get_cleaned_data(instance), instance=instance, model=type(instance)
+    )
+    try:
+        form_validator.validate()
+    except ValidationError as e:
+        error_dict = (
+            e.error_dict if hasattr(e, "error_dict") else {NON_FIELD_ERRORS: e.error_list}
+        )
+        # field errors raised by `raise_validation_error` carry the code on
+        # the validator, not on the error. The code is only known if there
+        # is just one.
+        codes = {code for code in form_validator._error_codes if code}
+        code = codes.pop() if len(codes) == 1 else None
+        return [
+            ValidationResult(
+                instance.pk,
+                error.code or code,
+                field,
+                str(message),
+                getattr(instance, "site_id", None),
+            )
+            for field, errors in error_dict.items()
+            for error in errors
+            for message in error.messages
+        ]
+    except Exception as e:
+        return [
+            ValidationResult(
+                instance.pk,
+                UNEXPECTED_ERROR,
+                NON_FIELD_ERRORS,
+                repr(e),
+                getattr(instance, "site_id", None),
+            )
+        ]
+    return []
+
+
+def validate_instances(
+    form_validator_cls: Type[FormValidator],
+    instances: Iterable[Model],
+    get_cleaned_data: Callable[[Model], dict] = get_cleaned_data,
+) -> list[ValidationResult]:
+    results = []
+    for instance in instances:
+        results.extend(validate_instance(form_validator_cls, instance, get_cleaned_data))
+    return results
+
+
+def validate_pks(
+    form_validator_cls: Type[FormValidator],
+    model_cls: Type[Model],
+    query: Query,
+    pks: list,
+    get_cleaned_data: Callable[[Model], dict] = get_cleaned_data,
+    prefetch_related_lookups: tuple = (),
+) -> list[ValidationResult]:
+    """Validates the instances of the queryset's `query` with the
+    given pks, in the order of `pks`.
+
+    Takes the query and the queryset's prefetch lookups, not the
+    queryset, since pickling a queryset fetches all of its rows.
+    """
+    queryset = model_cls._default_manager.prefetch_related(*prefetch_related_lookups)
+    queryset.query = query
+    instances = queryset.in_bulk(pks)
+    return validate_instances(
+        form_validator_cls,
+        (instances[pk] for pk in pks if pk in instances),
+        get_cleaned_data,
+    )
+
+
+def discard_inherited_connections() -> None:
+    """Process pool initializer to drop the database connections
+    copied from the parent process.
+
+    The copies are not closed since closing one ends the parent's
+    session. The worker opens its own connection on first use. An
+    in-memory SQLite database cannot be reopened, so its copy is
+    kept.
+    """
+    for conn in connections.all(initialized_only=True):
+        if conn.vendor == "sqlite" and conn.is_in_memory_db():
+            continue
+        conn.connection = None
+
+
+def run_validation(
+    form_validator_cls: Type[FormValidator],
+    instances: Iterable[Model],
+    chunk_size: int | None = None,
+    processes: int | None = None,
+    get_cleaned_data: Callable[[Model], dict] = get_cleaned_data,
+) -> Iterator[ValidationResult]:
+    """Runs a form validator against existing instances and yields a
+    ValidationResult for each error.
+
+    `instances` may be a queryset or any iterable of instances. A
+    queryset is read with `iterator(chunk_size)` so memory use does
+    not grow with the number of instances. Pass a queryset with
+    `select_related()` for the foreign keys and `prefetch_related()`
+    for the m2m fields the form validator reads, otherwise
+    `get_cleaned_data` queries each of them for each instance.
+
+    If `processes` is set, chunks are validated in a process pool.
+    No more than two chunks per process are held at once. Results are
+    yielded in the order of `instances`. The form validator class and
+    `get_cleaned_data` must be importable (picklable) to use a pool.
+    For a queryset, the pks are read before the pool starts and each
+    worker queries its chunk by pk.
+
+    For example:
+        with open("vitals.jsonl", "w") as f:
+            write_jsonl(
+                run_validation(
+                    VitalsFormValidator,
+                    Vitals.objects.select_related("subject_visit", "site"),
+                ),
+                f,
+            )
+    """
+    chunk_size = chunk_size or 2000
+    validate = partial(
+        validate_instances, form_validator_cls, get_cleaned_data=get_cleaned_data
+    )
+    if processes and isinstance(instances, QuerySet):
+        validate = partial(
+            validate_pks,
+            form_validator_cls,
+            instances.model,
+            instances.query,
+            get_cleaned_data=get_cleaned_data,
+            prefetch_related_lookups=instances._prefetch_related_lookups,
+        )
+        instances = list(instances.values_list("pk", flat=True))
+    elif hasattr(instances, "iterator"):
+        instances = instances.iterator(chunk_size=chunk_size)
+    instances = iter(instances)
+    chunks = iter(lambda: list(islice(instances, chunk_size)), [])
+    if not processes:
+        for chunk in chunks:
+            yield from validate(chunk)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=discard_inherited_connections
+        ) as executor:
+            futures = deque()
+            for chunk in chunks:
+                futures.append(executor.submit(validate, chunk))
+                if len(futures) >= processes * 2:
+                    yield from futures.popleft().result()
+            while futures:
+                yield from futures.popleft().result()
+
+
+def write_jsonl(results: Iterable[ValidationResult], fp: IO[str]) -> int:
+    """Writes each ValidationResult to `fp` as a line of JSON and
+    returns the number of lines written.
+    """
+    count = 0
+    for result in results:
+        fp.write(json.dumps(dict(result._asdict(), pk=str(result.pk))) + "\n")
+        count += 1
+    return count
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from django.core.signals import request_finished, request_started
+from django.dispatch import receiver
+
+CLINICAL_REVIEW = "clinical_review"
+BASELINE = "baseline"
+END_OF_STUDY = "end_of_study"
+APPT_TYPE = "appt_type"
+DIAGNOSES = "diagnoses"
+BASELINE_DATETIME = "baseline_datetime"
+
+_visit_contexts: ContextVar[dict | None] = ContextVar("visit_contexts", default=None)
+
+
+class VisitContext:
+    """Holds lookups for a subject visit, e.g. clinical review,
+    baseline, end of study and appointment type, so that each is
+    only looked up once.
+
+    Values are set by the first validator to ask for them. A lookup
+    that raises is not stored.
+
+    For example:
+        clinical_review = self.visit_context.get_or_set(
+            CLINICAL_REVIEW, raise_if_clinical_review_does_not_exist
+        )
+    """
+
+    def __init__(self, subject_visit: Any = None):
+        self.subject_visit = subject_visit
+        self.values: dict[str, Any] = {}
+
+    def get_or_set(self, key: str, func: Callable[[Any], Any]) -> Any:
+        """Returns the value for `key` or calls `func(subject_visit)`
+        and stores the result.
+        """
+        if key not in self.values:
+            self.values[key] = func(self.subject_visit)
+        return self.values[key]
+
+    def clear(self) -> None:
+        self.values = {}
+
+
+def get_appt_type(subject_visit: Any) -> str:
+    return subject_visit.appointment.appt_type.name
+
+
+def get_visit_context(subject_visit: Any = None) -> VisitContext:
+    """Returns the VisitContext for this subject visit.
+
+    Within a request, or a `visit_context_scope`, the same instance is
+    returned for the subject visit to every validator. Otherwise, a
+    new instance is returned.
+    """
+    contexts = _visit_contexts.get()
+    pk = getattr(subject_visit, "pk", None)
+    if contexts is None or pk is None:
+        return VisitContext(subject_visit)
+    key = (type(subject_visit), pk)
+    if key not in contexts:
+        contexts[key] = VisitContext(subject_visit)
+    return contexts[key]
+
+
+def get_or_set_scoped(key: tuple, func: Callable[[], Any]) -> Any:
+    """Returns the value for `key` shared within the current request
+    or `visit_context_scope`, or calls `func()` and stores the result.
+
+    Outside a scope, calls `func()`.
+    """
+    contexts = _visit_contexts.get()
+    if contexts is None:
+        return func()
+    if key not in contexts:
+        contexts[key] = func()
+    return contexts[key]
+
+
+@contextmanager
+def visit_context_scope() -> Iterator[None]:
+    """Shares a VisitContext per subject visit for the duration of
+    the block, for example, when validating outside a request.
+    """
+    token = _visit_contexts.set({})
+    try:
+        yield
+    finally:
+        _visit_contexts.reset(token)
+
+
+@receiver(request_started, dispatch_uid="intecomm_form_validators.visit_context_start")
+def start_visit_context_scope(**kwargs) -> None:
+    _visit_contexts.set({})
+
+
+@receiver(request_finished, dispatch_uid="intecomm_form_validators.visit_context_finish")
+def end_visit_context_scope(**kwargs) -> None:
+    _visit_contexts.set(None)